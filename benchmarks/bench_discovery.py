@@ -0,0 +1,90 @@
+"""Benchmark cold discovery of gada packages.
+
+Synthetic packages with a ``gada.yml`` are generated in a temporary
+directory, then discovered with each mode of **gada.nodeutil.discover**:
+
+.. code-block:: bash
+
+    $ python benchmarks/bench_discovery.py --sizes 10 100 1000
+
+"""
+from __future__ import annotations
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from gada import nodeutil  # noqa: E402
+
+_GADA_YML = """runner: pymodule
+nodes:
+{nodes}
+"""
+
+_NODE = """  - name: node{i}
+    entrypoint: {package}.node{i}
+    menu:
+      type:
+      - all
+      path:
+      - Node {i}
+"""
+
+
+def generate(root: Path, count: int, *, nodes: int = 10) -> None:
+    """Generate synthetic packages.
+
+    :param root: directory where to create packages
+    :param count: number of packages
+    :param nodes: number of nodes per package
+    """
+    for i in range(count):
+        package = root / f"gadabench{i}"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "gada.yml").write_text(
+            _GADA_YML.format(
+                nodes="".join(
+                    _NODE.format(i=j, package=package.name) for j in range(nodes)
+                )
+            )
+        )
+        # Modules without gada.yml that discovery must skip
+        (root / f"plainbench{i}.py").write_text("")
+
+
+def bench(path: list[str], mode: str, workers: int | None, repeat: int) -> float:
+    """Return the best time of **repeat** discoveries."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        nodeutil.discover(path, mode=mode, workers=workers)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument(
+        "--modes", type=str, nargs="+", default=["serial", "thread", "process"]
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'packages':>10} " + " ".join(f"{_:>10}" for _ in args.modes))
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            generate(Path(tmp), size)
+            times = [bench([tmp], _, args.workers, args.repeat) for _ in args.modes]
+            print(f"{size:>10} " + " ".join(f"{_ * 1000:>8.1f}ms" for _ in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Check the import time of a cold ``gada --help`` stays within budget.
+
+The command is run with ``python -X importtime`` and the cumulative time of
+top-level imports is summed. The script exits with status 1 when the total
+exceeds the budget:
+
+.. code-block:: bash
+
+    $ python benchmarks/bench_importtime.py --budget 50
+
+The budget can also be set with the **GADA_IMPORT_BUDGET_MS** environment
+variable.
+"""
+from __future__ import annotations
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+_LINE_REGEX = re.compile(
+    r"^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|(?P<indent>\s+)"
+    r"(?P<name>\S+)\s*$"
+)
+
+DEFAULT_BUDGET_MS = 50.0
+
+
+def parse(stderr: str) -> list[tuple[str, int, int, int]]:
+    """Parse the output of ``-X importtime``.
+
+    :param stderr: output of the command
+    :return: list of tuples ``(name, depth, self_us, cumulative_us)``
+    """
+    imports = []
+    for line in stderr.splitlines():
+        match = _LINE_REGEX.match(line)
+        if match:
+            imports.append(
+                (
+                    match.group("name"),
+                    (len(match.group("indent")) - 1) // 2,
+                    int(match.group("self")),
+                    int(match.group("cumulative")),
+                )
+            )
+
+    return imports
+
+
+def measure(argv: list[str]) -> list[tuple[str, int, int, int]]:
+    """Run a command with ``-X importtime`` and parse its output.
+
+    :param argv: arguments passed to the Python interpreter
+    :return: parsed imports
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.join(os.path.dirname(__file__), "..")]
+        + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    return parse(proc.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=float(os.environ.get("GADA_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)),
+        help="maximum import time in milliseconds",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="keep the best run")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports shown")
+    args = parser.parse_args(argv)
+
+    best = None
+    for _ in range(args.repeat):
+        imports = measure(["-m", "gada", "--help"])
+        total = sum(_[3] for _ in imports if _[1] == 0)
+        if best is None or total < best[0]:
+            best = (total, imports)
+
+    total, imports = best
+    print(f"{'self':>10} {'cumulative':>10}  import")
+    for name, depth, self_us, cumulative_us in sorted(
+        imports, key=lambda _: _[3], reverse=True
+    )[: args.top]:
+        print(f"{self_us / 1000:>8.1f}ms {cumulative_us / 1000:>8.1f}ms  {name}")
+
+    print(f"total: {total / 1000:.1f}ms, budget: {args.budget:.1f}ms")
+    if total / 1000 > args.budget:
+        print("import time is over budget")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
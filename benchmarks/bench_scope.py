@@ -0,0 +1,97 @@
+"""Benchmark variable lookups in nested scopes.
+
+Lookups of a variable defined in the root scope are timed from the
+innermost of **depth** nested scopes, each defining **size** variables.
+Chained scopes from **gada.scope** are compared to the previous storage
+where each scope kept a dict and walked its parents:
+
+.. code-block:: bash
+
+    $ python benchmarks/bench_scope.py --depths 1 10 100 --sizes 10 1000
+
+"""
+from __future__ import annotations
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from gada.scope import Scope  # noqa: E402
+
+
+class DictScope:
+    """Previous storage: a dict per scope and a walk of the parents."""
+
+    def __init__(self, vars: dict, parent: DictScope | None = None) -> None:
+        self._vars = vars
+        self._parent = parent
+
+    def get(self, name: str):
+        if name in self._vars:
+            return self._vars[name]
+
+        return self._parent.get(name) if self._parent else None
+
+    def vars(self) -> dict:
+        d = self._parent.vars() if self._parent else {}
+        d.update(self._vars)
+        return d
+
+
+def build(cls, depth: int, size: int):
+    """Create nested scopes and return the innermost one."""
+    scope = None
+    for level in range(depth):
+        vars = {f"v{level}_{i}": i for i in range(size)}
+        if cls is Scope:
+            scope = Scope(vars) if scope is None else scope.child(vars)
+        else:
+            scope = DictScope(vars, scope)
+
+    return scope
+
+
+def bench(scope, lookups: int, snapshots: int) -> tuple[float, float]:
+    """Return the time of lookups and of snapshots of all variables."""
+    start = time.perf_counter()
+    for _ in range(lookups):
+        scope.get("v0_0")
+    lookup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(snapshots):
+        scope.snapshot() if isinstance(scope, Scope) else scope.vars()
+    snapshot = time.perf_counter() - start
+
+    return lookup, snapshot
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000])
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--snapshots", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'depth':>6} {'size':>6} {'dict get':>10} {'scope get':>10} "
+        f"{'dict vars':>10} {'scope vars':>10}"
+    )
+    for depth in args.depths:
+        for size in args.sizes:
+            times = [
+                bench(build(cls, depth, size), args.lookups, args.snapshots)
+                for cls in (DictScope, Scope)
+            ]
+            print(
+                f"{depth:>6} {size:>6} "
+                f"{times[0][0] * 1000:>8.1f}ms {times[1][0] * 1000:>8.1f}ms "
+                f"{times[0][1] * 1000:>8.1f}ms {times[1][1] * 1000:>8.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
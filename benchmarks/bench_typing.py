@@ -0,0 +1,114 @@
+"""Benchmark type checks of nested types.
+
+Checks per second of values of a few items are reported for
+**Type._match**, which dispatches through the type tree, and for the
+checker built by **typing.compile** for each validation policy, along
+with the number of **typing.typeof** calls per second. The columns are
+not comparable for lists: **Type._match** only checks their first item,
+while the **full** and **sampled** policies check all the items of small
+lists. Checks of a list of **size** items are then timed for each
+validation policy:
+
+.. code-block:: bash
+
+    $ python benchmarks/bench_typing.py --checks 100000 --size 1000000
+
+"""
+from __future__ import annotations
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from gada import typing  # noqa: E402
+
+
+def cases() -> list[tuple[str, typing.Type, object]]:
+    """Return nested types with a matching value."""
+    int_ = typing.IntType()
+    str_ = typing.StringType()
+    union = typing.UnionType([int_, str_, typing.FloatType()])
+    return [
+        ("int", int_, 1),
+        ("[int]", typing.ListType(int_), [1, 2, 3]),
+        ("[[int]]", typing.ListType(typing.ListType(int_)), [[1], [2]]),
+        ("(int, str)", typing.TupleType([int_, str_]), (1, "a")),
+        ("int | str | float", union, 1.0),
+        (
+            "*(int, [str])",
+            typing.VariableType(typing.TupleType([int_, typing.ListType(str_)])),
+            [(1, ["a"])],
+        ),
+        (
+            "([int | str | float], (int, *str))",
+            typing.TupleType(
+                [
+                    typing.ListType(union),
+                    typing.TupleType([int_, typing.VariableType(str_)]),
+                ]
+            ),
+            ([1.0], (1, ["a"])),
+        ),
+    ]
+
+
+def bench(check, value, checks: int, repeat: int = 5) -> float:
+    """Return the number of checks per second, best of **repeat** runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(checks):
+            check(value)
+        best = min(best, time.perf_counter() - start)
+    return checks / best
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=100_000)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    policies = typing.VALIDATION_POLICIES
+    print(
+        f"{'type':>36} {'match/s':>12} "
+        + " ".join(f"{_ + '/s':>12}" for _ in policies)
+        + f" {'typeof/s':>12}"
+    )
+    for name, type, value in cases():
+        assert type._match(value)
+        match = bench(type._match, value, args.checks)
+        compiled = {}
+        for policy in policies:
+            check = typing.compile(type, policy=policy)
+            assert check(value)
+            compiled[policy] = bench(check, value, args.checks)
+        typeof = bench(typing.typeof, value, args.checks)
+        print(
+            f"{name:>36} {match:>12,.0f} "
+            + " ".join(f"{compiled[_]:>12,.0f}" for _ in policies)
+            + f" {typeof:>12,.0f}"
+        )
+
+    print()
+    print(f"{'type':>36} {'policy':>12} {'time':>12}")
+    for name, type, value in (
+        ("[int]", typing.ListType(typing.IntType()), list(range(args.size))),
+        (
+            "[(int, str)]",
+            typing.ListType(typing.TupleType([typing.IntType(), typing.StringType()])),
+            [(1, "a")] * args.size,
+        ),
+    ):
+        for policy in typing.VALIDATION_POLICIES:
+            check = typing.compile(type, policy=policy)
+            start = time.perf_counter()
+            assert check(value)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>36} {policy:>12} {elapsed * 1000:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,3 +6,25 @@ from gada.main import *
 
 
 __all__ = ["help", "main", "__version__", "version_info"]
+
+# Submodules are imported on first access to keep "import gada" fast
+_SUBMODULES = (
+    "datadir",
+    "gadayml",
+    "node",
+    "nodeindex",
+    "nodeutil",
+    "program",
+    "runners",
+    "test_utils",
+    "typing",
+)
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        import importlib
+
+        return importlib.import_module(f"{__name__}.{name}")
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
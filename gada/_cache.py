@@ -9,13 +9,17 @@ __all__ = [
     "dump_module_config",
     "get_cached_node",
     "set_cached_node",
+    "get_node_registry",
+    "set_node_registry",
+    "get_cli_spec",
+    "set_cli_spec",
 ]
 from types import ModuleType
 from typing import TYPE_CHECKING
 import importlib
 from pkgutil import ModuleInfo
 from pathlib import Path
-import yaml
+from gada import _yaml
 
 if TYPE_CHECKING:
     from typing import Any, Union, Iterable
@@ -27,15 +31,20 @@ _LOAD_MODULE_CACHE = {}
 _MODULE_PATH_CACHE = {}
 _MODULE_CONFIG_CACHE = {}
 _MODULE_NODE_CACHE = {}
+_NODE_REGISTRY = None
+_CLI_SPEC_CACHE = {}
 
 
 def clear() -> None:
     """Clear the cache"""
     global _LOAD_MODULE_CACHE, _MODULE_PATH_CACHE, _MODULE_CONFIG_CACHE, _MODULE_NODE_CACHE
+    global _NODE_REGISTRY, _CLI_SPEC_CACHE
     _LOAD_MODULE_CACHE = {}
     _MODULE_PATH_CACHE = {}
     _MODULE_CONFIG_CACHE = {}
     _MODULE_NODE_CACHE = {}
+    _NODE_REGISTRY = None
+    _CLI_SPEC_CACHE = {}
 
 
 def load_module(module: ModuleLike, /) -> ModuleType:
@@ -98,8 +107,7 @@ def load_module_config(module: ModuleLike) -> dict:
     if conf is None:
         path = get_module_path(mod)
         try:
-            with open(path / _GADA_YML_FILENAME, "r") as f:
-                conf = yaml.safe_load(f.read())
+            conf = _yaml.load_file(path / _GADA_YML_FILENAME)
         except FileNotFoundError:
             conf = {}
 
@@ -120,8 +128,7 @@ def dump_module_config(module: ModuleLike, /, config: dict) -> None:
     path = get_module_path(mod)
 
     _MODULE_CONFIG_CACHE[mod] = None
-    with open(path / _GADA_YML_FILENAME, "w+") as f:
-        f.write(yaml.safe_dump(config))
+    _yaml.dump_file(path / _GADA_YML_FILENAME, config)
 
 
 def get_cached_node(module: ModuleType, name: str, /) -> Any:
@@ -134,3 +141,20 @@ def get_cached_node(module: ModuleType, name: str, /) -> Any:
 
 def set_cached_node(module: ModuleType, name: str, node: Any, /) -> None:
     _MODULE_NODE_CACHE.setdefault(module, {})[name] = node
+
+
+def get_node_registry() -> Any:
+    return _NODE_REGISTRY
+
+
+def set_node_registry(registry: Any, /) -> None:
+    global _NODE_REGISTRY
+    _NODE_REGISTRY = registry
+
+
+def get_cli_spec(name: str, /) -> Any:
+    return _CLI_SPEC_CACHE.get(name, None)
+
+
+def set_cli_spec(name: str, spec: Any, /) -> None:
+    _CLI_SPEC_CACHE[name] = spec
@@ -0,0 +1,34 @@
+"""Helpers for files written to the data directory."""
+from __future__ import annotations
+
+__all__ = ["write_atomic"]
+from typing import TYPE_CHECKING
+import os
+import threading
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def write_atomic(file: Path, data: bytes, /) -> None:
+    """Replace the content of a file so readers never see a partial file.
+
+    The data is written to a temporary file next to **file**, then moved
+    over it. The temporary file is named after the process and the thread,
+    so that concurrent writers of the same file don't share it.
+
+    :param file: destination file, its directory is created if missing
+    :param data: new content
+    """
+    os.makedirs(file.parent, exist_ok=True)
+    tmp = file.with_name(f"{file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, file)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,162 @@
+"""Compiled validators for the JSON schemas used by Gada.
+
+Each schema is loaded, checked and compiled into a validator only once.
+Validation results are cached by a hash of the validated configuration, so
+validating the same configuration again costs a hash instead of a full
+validation. Configurations parsed from a file are cached by the hash of
+the content of the file instead, which is already known.
+
+In production mode, enabled with the **GADA_PRODUCTION** environment
+variable or **set_production**, configurations are only validated when a
+new configuration object is seen, for example when a ``gada.yml`` file
+changed and was reloaded. Configurations modified in place are not
+validated again.
+
+At most **MAX_CACHED** results are kept per schema, the least recently
+used are dropped first.
+"""
+from __future__ import annotations
+
+__all__ = ["validator", "validate", "clear", "set_production", "is_production"]
+from typing import TYPE_CHECKING
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from gada import _yaml
+
+if TYPE_CHECKING:
+    from typing import Any, Optional, Union
+    from pathlib import Path
+
+
+PRODUCTION_ENV = "GADA_PRODUCTION"
+"""Environment variable enabling production mode"""
+
+MAX_CACHED = 1024
+"""Maximum number of valid configurations remembered per schema"""
+
+_PRODUCTION = os.environ.get(PRODUCTION_ENV, "") not in ("", "0")
+# schema -> compiled validator
+_VALIDATORS: dict[str, Any] = {}
+_LOCK = threading.Lock()
+# schema -> hashes of valid configurations, least recently used first
+_VALID_DIGESTS: dict[str, OrderedDict[str, bool]] = {}
+# schema -> id of valid configurations -> configuration, least recently
+# used first
+_VALID_OBJECTS: dict[str, OrderedDict[int, Any]] = {}
+
+
+def clear() -> None:
+    """Clear compiled validators and cached results"""
+    _VALIDATORS.clear()
+    _VALID_DIGESTS.clear()
+    _VALID_OBJECTS.clear()
+
+
+def set_production(enabled: bool, /) -> None:
+    """Enable or disable production mode.
+
+    :param enabled: if configurations are only validated once per object
+    """
+    global _PRODUCTION
+    _PRODUCTION = enabled
+
+
+def is_production() -> bool:
+    """Check if production mode is enabled.
+
+    :return: if configurations are only validated once per object
+    """
+    return _PRODUCTION
+
+
+def validator(schema: Union[str, Path], /) -> Any:
+    """Get the compiled validator for a schema file.
+
+    :param schema: path to the schema
+    :return: validator instance
+    """
+    key = str(schema)
+    instance = _VALIDATORS.get(key, None)
+    if instance is None:
+        from jsonschema.validators import validator_for
+
+        document = _yaml.load_file(schema)
+        cls = validator_for(document)
+        cls.check_schema(document)
+        instance = cls(document)
+        _VALIDATORS[key] = instance
+
+    return instance
+
+
+def _digest(config: Any, /) -> str:
+    return hashlib.sha1(
+        json.dumps(config, sort_keys=True, default=repr).encode()
+    ).hexdigest()
+
+
+def _hit(cache: dict[str, OrderedDict], key: str, k: Any, /) -> Any:
+    """Get a cached value and mark it as recently used."""
+    with _LOCK:
+        values = cache.get(key, None)
+        if values is None or k not in values:
+            return None
+
+        values.move_to_end(k)
+        return values[k]
+
+
+def _add(cache: dict[str, OrderedDict], key: str, k: Any, v: Any, /) -> None:
+    """Cache a value and drop the least recently used ones."""
+    with _LOCK:
+        values = cache.setdefault(key, OrderedDict())
+        values[k] = v
+        values.move_to_end(k)
+        while len(values) > MAX_CACHED:
+            values.popitem(last=False)
+
+
+def validate(
+    config: Any, schema: Union[str, Path], /, *, digest: Optional[str] = None
+) -> None:
+    r"""Validate a configuration against a schema file.
+
+    .. code-block:: python
+
+        >>> from pathlib import Path
+        >>> import gada
+        >>> from gada import _schema
+        >>>
+        >>> schema = Path(gada.__file__).parent / "gada.yml.schema"
+        >>> _schema.validate({"nodes": [{"name": "a"}]}, schema)
+        >>>
+
+    This will raise **jsonschema.ValidationError** if the configuration
+    is invalid.
+
+    :param config: configuration
+    :param schema: path to the schema
+    :param digest: hash of the content of the file **config** was just
+        parsed from, see **gada._yaml.load_file_with_digest**, so that
+        **config** is not hashed
+    """
+    key = str(schema)
+    if _PRODUCTION and _hit(_VALID_OBJECTS, key, id(config)) is config:
+        return
+
+    digest = f"file:{digest}" if digest is not None else _digest(config)
+    if _hit(_VALID_DIGESTS, key, digest) is None:
+        from jsonschema.exceptions import best_match
+
+        error = best_match(validator(schema).iter_errors(config))
+        if error is not None:
+            raise error
+
+        _add(_VALID_DIGESTS, key, digest, True)
+
+    if _PRODUCTION:
+        # Keep a reference so the id is not reused by another object
+        _add(_VALID_OBJECTS, key, id(config), config)
@@ -0,0 +1,162 @@
+"""Fast loading and dumping of YAML files.
+
+The libyaml bindings of PyYAML are used when available. Parsed documents
+are also cached in ``{datadir}/cache/yaml`` so that loading an unchanged
+file skips YAML parsing entirely.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "load",
+    "dump",
+    "load_file",
+    "load_file_with_digest",
+    "dump_file",
+    "cache_path",
+]
+from typing import TYPE_CHECKING
+import os
+import time
+import pickle
+import hashlib
+from pathlib import Path
+from gada import _fs
+from gada._log import logger
+
+if TYPE_CHECKING:
+    from typing import Any, IO, Optional, Union
+
+
+# Modifications made within this delay after the file was cached may not
+# change its mtime on filesystems with a coarse timestamp resolution
+_RACY_DELAY_NS = 2_000_000_000
+
+
+def load(content: Union[str, bytes, IO], /) -> Any:
+    """Parse a YAML document.
+
+    :param content: YAML content or filelike object
+    :return: parsed document
+    """
+    import yaml
+
+    return yaml.load(content, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def dump(data: Any, /) -> str:
+    """Serialize an object to YAML.
+
+    :param data: object to serialize
+    :return: YAML content
+    """
+    import yaml
+
+    return yaml.dump(data, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper))
+
+
+def cache_path() -> Path:
+    """Get absolute path to the directory where parsed documents are cached.
+
+    :return: ``{datadir}/cache/yaml``
+    """
+    from gada import datadir
+
+    return datadir.path() / "cache" / "yaml"
+
+
+def _entry_path(path: str, /, cache_dir: Optional[Path] = None) -> Path:
+    cache_dir = cache_dir if cache_dir is not None else cache_path()
+    return cache_dir / f"{hashlib.sha1(path.encode()).hexdigest()}.pickle"
+
+
+def _read_entry(file: Path, /) -> Optional[tuple]:
+    try:
+        with open(file, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _write_entry(file: Path, /, entry: tuple) -> None:
+    try:
+        _fs.write_atomic(file, pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError as e:
+        logger.debug(f"failed to cache parsed YAML to {file}: {e}")
+
+
+def load_file(path: Union[str, Path], /, *, cache_dir: Optional[Path] = None) -> Any:
+    """Load a YAML file using the cache of parsed documents.
+
+    The cache entry of a file holds its mtime, size and a hash of its content:
+
+    * if mtime and size didn't change, and the file was not modified just
+      before being cached, the cached document is returned without reading
+      the file,
+    * if the content hash didn't change, the cached document is returned
+      without parsing the file,
+    * otherwise the file is parsed and the cache entry is updated.
+
+    Errors related to the cache are ignored.
+
+    :param path: path to the YAML file
+    :param cache_dir: where to cache documents, default to **cache_path()**
+    :return: parsed document
+    """
+    return load_file_with_digest(path, cache_dir=cache_dir)[0]
+
+
+def load_file_with_digest(
+    path: Union[str, Path], /, *, cache_dir: Optional[Path] = None
+) -> tuple[Any, str]:
+    """Same as **load_file**, also returning the hash of the content of the file.
+
+    The hash identifies the parsed document without hashing it again.
+
+    :param path: path to the YAML file
+    :param cache_dir: where to cache documents, default to **cache_path()**
+    :return: tuple ``(document, digest)``
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    file = _entry_path(path, cache_dir)
+
+    # entry is a tuple (mtime, size, digest, data, cached_at)
+    entry = _read_entry(file)
+    if (
+        entry is not None
+        and entry[0] == st.st_mtime_ns
+        and entry[1] == st.st_size
+        and entry[4] - entry[0] > _RACY_DELAY_NS
+    ):
+        return entry[3], entry[2]
+
+    with open(path, "rb") as f:
+        content = f.read()
+
+    digest = hashlib.sha1(content).hexdigest()
+    if entry is not None and entry[2] == digest:
+        data = entry[3]
+    else:
+        data = load(content)
+
+    _write_entry(file, (st.st_mtime_ns, st.st_size, digest, data, time.time_ns()))
+    return data, digest
+
+
+def dump_file(
+    path: Union[str, Path], /, data: Any, *, cache_dir: Optional[Path] = None
+) -> None:
+    """Write an object to a YAML file.
+
+    :param path: path to the YAML file
+    :param data: object to serialize
+    :param cache_dir: where documents are cached, default to **cache_path()**
+    """
+    path = os.path.abspath(path)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(dump(data))
+
+    try:
+        os.remove(_entry_path(path, cache_dir))
+    except OSError:
+        pass
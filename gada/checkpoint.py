@@ -0,0 +1,81 @@
+"""Checkpoints of running programs.
+
+A checkpoint stores the state of a :class:`gada.program.Context` after its
+last completed step: the stack pointer, variables and outputs of node
+instances. A program interrupted by a failure can be resumed from its
+last checkpoint instead of running all of its steps again.
+
+Checkpoints are pickled and written atomically so that a crash while
+writing a checkpoint leaves the previous one intact.
+"""
+from __future__ import annotations
+
+__all__ = ["path", "dump", "load", "remove"]
+from typing import TYPE_CHECKING
+import os
+import pickle
+from pathlib import Path
+from gada import _fs
+
+if TYPE_CHECKING:
+    from typing import Any, Union
+
+
+_CHECKPOINT_VERSION = 1
+
+
+def path(name: str, /) -> Path:
+    """Get absolute path to the checkpoint of a program.
+
+    :param name: unique name of the program
+    :return: ``{datadir}/checkpoints/{hash}.pickle``
+    """
+    from gada import datadir, memo
+
+    return datadir.path() / "checkpoints" / f"{memo.stable_hash(name)}.pickle"
+
+
+def dump(state: dict[str, Any], file: Union[str, Path], /) -> None:
+    """Write a checkpoint.
+
+    :param state: state of a context
+    :param file: destination file
+    """
+    file = Path(file)
+    try:
+        data = pickle.dumps(
+            {"version": _CHECKPOINT_VERSION, **state}, protocol=pickle.HIGHEST_PROTOCOL
+        )
+    except Exception as e:
+        raise Exception(f"state can't be checkpointed to {file}: {e}") from e
+
+    _fs.write_atomic(file, data)
+
+
+def load(file: Union[str, Path], /) -> dict[str, Any]:
+    """Read a checkpoint.
+
+    This will raise an exception if the checkpoint is invalid or was
+    written by another version of Gada.
+
+    :param file: checkpoint file
+    :return: state of a context
+    """
+    with open(file, "rb") as f:
+        state = pickle.load(f)
+
+    if not isinstance(state, dict) or state.get("version") != _CHECKPOINT_VERSION:
+        raise Exception(f"invalid checkpoint {file}")
+
+    return state
+
+
+def remove(file: Union[str, Path], /) -> None:
+    """Remove a checkpoint if it exists.
+
+    :param file: checkpoint file
+    """
+    try:
+        os.remove(file)
+    except FileNotFoundError:
+        pass
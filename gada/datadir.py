@@ -5,7 +5,7 @@ __all__ = ["path", "load_config", "write_config"]
 import os
 import sys
 import pathlib
-import yaml
+from gada import _yaml
 
 
 def path() -> pathlib.Path:
@@ -41,8 +41,7 @@ def load_config() -> dict:
     try:
         data_dir = path()
 
-        with open(os.path.join(data_dir, "config.yml"), "r", encoding="utf-8") as f:
-            return yaml.safe_load(f.read())
+        return _yaml.load_file(os.path.join(data_dir, "config.yml"))
     except Exception as e:
         return {}
 
@@ -55,5 +54,4 @@ def write_config(config: dict = None):
     data_dir = path()
     os.makedirs(data_dir, exist_ok=True)
 
-    with open(os.path.join(data_dir, "config.yml"), "w", encoding="utf-8") as f:
-        f.write(yaml.safe_dump(config))
+    _yaml.dump_file(os.path.join(data_dir, "config.yml"), config)
@@ -1,12 +1,10 @@
 from __future__ import annotations
 
-__all__ = ["dump", "load"]
+__all__ = ["dump", "load", "load_path"]
 from typing import TYPE_CHECKING
 from pathlib import Path
-import yaml
-import jsonschema
 
-from gada import _cache
+from gada import _cache, _schema, _yaml
 
 if TYPE_CHECKING:
     from typing import Iterable, TypedDict, Any
@@ -54,10 +52,12 @@ if TYPE_CHECKING:
         """List of nodes."""
 
 
+_SCHEMA_PATH = Path(__file__).parent / "gada.yml.schema"
+
+
 def load_schema() -> dict[str, Any]:
     """Load the JSON schema for gada.yml files."""
-    with open(Path(__file__).parent / "gada.yml.schema") as f:
-        return yaml.safe_load(f)
+    return _yaml.load_file(_SCHEMA_PATH)
 
 
 def dump(config: GadaConfig) -> dict[str, Any]:
@@ -79,7 +79,7 @@ def dump(config: GadaConfig) -> dict[str, Any]:
     :param module: module or path
     :param config: configuration to dump
     """
-    return yaml.safe_dump(_namespace_to_dict(config))
+    return _yaml.dump(_namespace_to_dict(config))
 
 
 def load(module: ModuleLike, /) -> GadaConfig:
@@ -91,6 +91,18 @@ def load(module: ModuleLike, /) -> GadaConfig:
     :return: configuration
     """
     config = _cache.load_module_config(module)
-    jsonschema.validate(config, load_schema())
+    _schema.validate(config, _SCHEMA_PATH)
+
+    return config
+
+
+def load_path(path: Path, /) -> GadaConfig:
+    r"""Load ``gada.yml`` from its path without importing the module.
+
+    :param path: path to ``gada.yml``
+    :return: configuration
+    """
+    config, digest = _yaml.load_file_with_digest(path)
+    _schema.validate(config, _SCHEMA_PATH, digest=digest)
 
     return config
@@ -0,0 +1,194 @@
+"""Incremental execution of programs.
+
+When running a program incrementally, a fingerprint of each step is stored
+along with its outputs. The fingerprint covers the node identity, version
+and configuration, the resolved inputs of the step and the files the node
+declares depending on:
+
+.. code-block:: yaml
+
+    nodes:
+    - name: report
+      runner: pymodule
+      entrypoint: mypackage.report
+      version: "3"
+      depends:
+      - data/sales.csv
+
+Relative paths are resolved against the directory of the package of the
+node. Steps of a program can also declare **depends**, relative to the
+directory of the program file.
+
+On the next run, a step with the same fingerprint reuses its stored
+outputs instead of running. As inputs are resolved from the outputs of
+previous steps, a change only re-runs the steps it reaches.
+
+Steps are assumed to have no side effects other than their outputs.
+"""
+from __future__ import annotations
+
+__all__ = ["IncrementalState", "state_path", "fingerprint"]
+from typing import TYPE_CHECKING
+import os
+import pickle
+import threading
+from pathlib import Path
+from gada import _fs, memo
+from gada._log import logger
+
+if TYPE_CHECKING:
+    from typing import Any, Iterable, Optional, Union
+
+    from gada.plan import PlanStep
+
+
+def state_path(name: str, /) -> Path:
+    """Get absolute path to the stored state of a program.
+
+    :param name: unique name of the program
+    :return: ``{datadir}/incremental/{hash}.pickle``
+    """
+    from gada import datadir
+
+    return datadir.path() / "incremental" / f"{memo.stable_hash(name)}.pickle"
+
+
+def _resolve(paths: Iterable[str], directory: Optional[Path], /) -> list[str]:
+    """Get absolute paths of files relative to a directory."""
+    if directory is None:
+        return [os.path.abspath(_) for _ in paths]
+
+    return [os.path.join(directory, _) for _ in paths]
+
+
+def _depends(step: PlanStep, /) -> list[str]:
+    """Get files declared by the node or its call.
+
+    Files of the node are relative to its package and files of the call
+    to its program, or to the current directory if they are unknown.
+    """
+    package_info = getattr(step.node, "package_info", None)
+    file = step.call.file
+    return _resolve(
+        step.node.config.get("depends", []),
+        package_info.gada_yml_path.parent if package_info is not None else None,
+    ) + _resolve(
+        step.call.depends,
+        Path(file).absolute().parent if file is not None else None,
+    )
+
+
+def _file_signature(path: str, /) -> Optional[tuple[int, int]]:
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+def fingerprint(step: PlanStep, inputs: dict, /) -> str:
+    """Get the fingerprint of a step run with some inputs.
+
+    Files are compared by modification time and size.
+
+    :param step: compiled step
+    :param inputs: resolved inputs
+    :return: fingerprint
+    """
+    files = sorted((_, _file_signature(_)) for _ in _depends(step))
+    return memo.stable_hash(
+        (memo.key(step.node, inputs), step.call.id, files)
+    )
+
+
+class IncrementalState(object):
+    r"""Fingerprints and outputs of the steps of a program.
+
+    .. code-block:: python
+
+        >>> from gada.incremental import IncrementalState, state_path
+        >>>
+        >>> state = IncrementalState(state_path("nightly"))
+        >>> # ... run steps ...
+        >>> state.save()
+        >>> state.stats
+        {'reused': 0, 'executed': 2}
+        >>>
+
+    Only steps seen since the state was loaded are kept when saving.
+
+    :param path: file where the state is stored
+    """
+
+    __slots__ = ("_path", "_records", "_seen", "_lock", "_reused", "_executed")
+
+    def __init__(self, path: Union[str, Path], /) -> None:
+        self._path: Path = Path(path)
+        # fingerprint -> outputs
+        self._records: dict[str, Any] = self._load()
+        self._seen: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._reused: int = 0
+        self._executed: int = 0
+
+    @property
+    def stats(self) -> dict:
+        """Number of reused and executed steps"""
+        with self._lock:
+            return {"reused": self._reused, "executed": self._executed}
+
+    def get(self, fingerprint: str, /) -> tuple[bool, Any]:
+        """Get the stored outputs of a step.
+
+        :param fingerprint: fingerprint of the step
+        :return: if outputs were found and the outputs
+        """
+        with self._lock:
+            if fingerprint not in self._records:
+                return False, None
+
+            outputs = self._records[fingerprint]
+            self._seen[fingerprint] = outputs
+            self._reused += 1
+            return True, outputs
+
+    def set(self, fingerprint: str, outputs: Any, /, *, executed: bool = True) -> None:
+        """Store the outputs of a step.
+
+        :param fingerprint: fingerprint of the step
+        :param outputs: outputs
+        :param executed: if the step ran to produce the outputs, otherwise
+            it is counted as reused
+        """
+        with self._lock:
+            self._records[fingerprint] = outputs
+            self._seen[fingerprint] = outputs
+            if executed:
+                self._executed += 1
+            else:
+                self._reused += 1
+
+    def save(self) -> None:
+        """Write the state of steps seen since it was loaded."""
+        with self._lock:
+            records = dict(self._seen)
+
+        try:
+            data = pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"outputs can't be stored to {self._path}: {e}")
+            return
+
+        try:
+            _fs.write_atomic(self._path, data)
+        except OSError as e:
+            logger.warning(f"failed to store outputs to {self._path}: {e}")
+
+    def _load(self) -> dict[str, Any]:
+        try:
+            with open(self._path, "rb") as f:
+                records = pickle.load(f)
+        except Exception:
+            return {}
+
+        return records if isinstance(records, dict) else {}
@@ -1,13 +1,10 @@
 from __future__ import annotations
 
 __all__ = ["run", "main"]
-from typing import TYPE_CHECKING
 import sys
-import argparse
-from gada import nodeutil, runners
 
-if TYPE_CHECKING:
-    from typing import Any
+# Imports are kept local to functions so that "import gada" and
+# "gada --help" don't pay for loading nodes, YAML or JSON schemas
 
 
 def split_unknown_args(argv: list[str]) -> tuple[list[str], list[str]]:
@@ -24,7 +21,13 @@ def split_unknown_args(argv: list[str]) -> tuple[list[str], list[str]]:
     return argv, []
 
 
-def run(target: str, argv: list[str]) -> dict:
+def run(
+    target: str,
+    argv: list[str],
+    *,
+    checkpoint_every: int | None = None,
+    resume: bool = False,
+) -> dict:
     """Run a Gada node or program.
 
     .. code-block:: python
@@ -35,32 +38,83 @@ def run(target: str, argv: list[str]) -> dict:
         {'out': 2}
         >>>
 
+    Programs are given by the path to their file and take inputs as
+    ``name=value`` arguments. They are checkpointed every
+    **checkpoint_every** steps and continue from their last checkpoint
+    with **resume**.
+
     :param target: name of a node or path to a program
     :param argv: inputs passed to the node or program
+    :param checkpoint_every: number of steps between checkpoints of a
+        program, programs are not checkpointed by default
+    :param resume: continue a program from its last checkpoint
     :return: node or program outputs
     """
+    import os
+
+    if os.path.isfile(target):
+        from gada import program
+
+        inputs = dict(_.split("=", 1) for _ in argv)
+        outputs = program.Program.load(target).run(
+            inputs, checkpoint_every=checkpoint_every, resume=resume
+        )
+        return outputs if outputs is not None else {}
+
+    from gada import nodeutil, runners
+
     node = nodeutil.find_node(target)
     if not node:
         raise Exception(f"node {target} not found")
 
-    parser = nodeutil.create_parser(node)
-    args = parser.parse_args(args=argv)
+    inputs = nodeutil.parse_args(node, argv)
 
     runner = runners.load(node.config.get("runner", "pymodule"))
-    runner.run(node, inputs=vars(args))
+    runner.run(node, inputs=inputs)
     return {}
 
 
 def list_packages() -> None:
+    from gada import nodeutil
+
     for package in nodeutil.iter_packages():
         print(package.name)
 
 
 def list_node() -> None:
+    from gada import nodeutil
+
     for node in nodeutil.iter_nodes():
         print(node.config["name"])
 
 
+def index_rebuild(
+    *,
+    mode: str | None = None,
+    workers: int | None = None,
+    strategy: str | None = None,
+) -> None:
+    from gada import nodeindex
+
+    index = nodeindex.rebuild(mode=mode, workers=workers, strategy=strategy)
+    print(
+        f"index rebuilt with {len(index['packages'])} packages "
+        f"and {len(index['nodes'])} nodes"
+    )
+
+
+def index_status() -> None:
+    from gada import nodeindex
+
+    status = nodeindex.status()
+    print(f"path: {status['path']}")
+    print(f"exists: {status['exists']}")
+    print(f"fresh: {status['fresh']}")
+    print(f"strategy: {status['strategy']}")
+    print(f"packages: {status['packages']}")
+    print(f"nodes: {status['nodes']}")
+
+
 def menu_callback(filenames, params: str) -> None:
     print(filenames)
     print(params)
@@ -76,11 +130,14 @@ def main(
 ):
     """Gada main.
 
-    :param argv: command line arguments
+    :param argv: command line arguments, including the program name like
+        **sys.argv**
     :param stdin: input stream
     :param stdout: output stream
     :param stderr: error stream
     """
+    import argparse
+
     parser = argparse.ArgumentParser(prog="gada", description="Help")
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbosity level")
     subparsers = parser.add_subparsers(help="sub-command help", required=True)
@@ -88,7 +145,12 @@ def main(
     def parse_run(args):
         node_argv, gada_argv = split_unknown_args(args.argv)
 
-        run(args.target, node_argv)
+        run(
+            args.target,
+            node_argv,
+            checkpoint_every=args.checkpoint_every,
+            resume=args.resume,
+        )
 
     def parse_list_package(args):
         list_packages()
@@ -96,18 +158,38 @@ def main(
     def parse_list_node(args):
         list_node()
 
+    def parse_index_rebuild(args):
+        index_rebuild(mode=args.mode, workers=args.workers, strategy=args.strategy)
+
+    def parse_index_status(args):
+        index_status()
+
     def parse_install(args):
         pass
 
     run_parser = subparsers.add_parser("run", help="run a gada node")
-    run_parser.add_argument("target", type=str, help="gada node to run")
+    run_parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        help="checkpoint a program every that many steps",
+    )
+    run_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue a program from its last checkpoint",
+    )
+    run_parser.add_argument(
+        "target", type=str, help="gada node or path to a program to run"
+    )
     run_parser.add_argument(
         "argv", type=str, nargs=argparse.REMAINDER, help="additional CLI arguments"
     )
     run_parser.set_defaults(func=parse_run)
 
     list_parser = subparsers.add_parser("list", help="list installed gada nodes")
-    list_subparsers = list_parser.add_subparsers(help="sub-command help")
+    list_subparsers = list_parser.add_subparsers(
+        help="sub-command help", dest="command", required=True
+    )
 
     list_package_parser = list_subparsers.add_parser(
         "package", help="list installed gada packages"
@@ -119,11 +201,41 @@ def main(
     )
     list_node_parser.set_defaults(func=parse_list_node)
 
+    index_parser = subparsers.add_parser("index", help="manage the node index")
+    index_subparsers = index_parser.add_subparsers(
+        help="sub-command help", dest="command", required=True
+    )
+
+    index_rebuild_parser = index_subparsers.add_parser(
+        "rebuild", help="rebuild the node index"
+    )
+    index_rebuild_parser.add_argument(
+        "--mode",
+        type=str,
+        choices=["serial", "thread", "process"],
+        help="how to load gada.yml files",
+    )
+    index_rebuild_parser.add_argument(
+        "--workers", type=int, help="maximum number of workers"
+    )
+    index_rebuild_parser.add_argument(
+        "--strategy",
+        type=str,
+        choices=["filesystem", "entry_points", "auto"],
+        help="how to find gada packages",
+    )
+    index_rebuild_parser.set_defaults(func=parse_index_rebuild)
+
+    index_status_parser = index_subparsers.add_parser(
+        "status", help="show the state of the node index"
+    )
+    index_status_parser.set_defaults(func=parse_index_status)
+
     install_parser = subparsers.add_parser("install", help="install a gada node")
     install_parser.add_argument("target", type=str, help="gada node to install")
     install_parser.set_defaults(func=parse_install)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv[1:] if argv is not None else None)
     args.func(args)
     # run(target=args.target, argv=node_argv, stdin=stdin, stdout=stdout, stderr=stderr)
 
@@ -0,0 +1,326 @@
+"""Memoization of the results of deterministic nodes.
+
+Nodes declared as deterministic in ``gada.yml`` always return the same
+outputs for the same inputs:
+
+.. code-block:: yaml
+
+    nodes:
+    - name: transform
+      runner: pymodule
+      entrypoint: mypackage.transform
+      deterministic: true
+      version: "2"
+
+Their outputs can be stored in a **MemoCache** keyed by the identity and
+version of the node and a stable hash of its inputs. Changing the version
+of a node invalidates its stored outputs.
+"""
+from __future__ import annotations
+
+__all__ = ["MemoCache", "cache_path", "stable_hash", "is_deterministic", "key"]
+from typing import TYPE_CHECKING
+import os
+import copy
+import time
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from gada import _fs
+from gada._log import logger
+
+if TYPE_CHECKING:
+    from typing import Any, Optional, Union
+
+
+def cache_path() -> Path:
+    """Get absolute path to the directory where outputs are stored.
+
+    :return: ``{datadir}/memo``
+    """
+    from gada import datadir
+
+    return datadir.path() / "memo"
+
+
+def _update(h: Any, value: Any, /) -> None:
+    """Feed a canonical encoding of a value to a hash.
+
+    Dicts are hashed regardless of the order of their keys. Values
+    without a canonical encoding are pickled.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, bytes):
+        h.update(f"bytes:{len(value)}:".encode())
+        h.update(value)
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}:{len(value)}[".encode())
+        for _ in value:
+            _update(h, _)
+        h.update(b"]")
+    elif isinstance(value, dict):
+        items = sorted(
+            ((stable_hash(k), v) for k, v in value.items()), key=lambda _: _[0]
+        )
+        h.update(f"dict:{len(items)}{{".encode())
+        for k, v in items:
+            h.update(k.encode())
+            _update(h, v)
+        h.update(b"}")
+    else:
+        data = pickle.dumps(value, protocol=4)
+        h.update(f"pickle:{len(data)}:".encode())
+        h.update(data)
+
+
+def stable_hash(value: Any, /) -> str:
+    r"""Hash a value independently of the process.
+
+    .. code-block:: python
+
+        >>> from gada.memo import stable_hash
+        >>>
+        >>> stable_hash({"a": 1, "b": 2}) == stable_hash({"b": 2, "a": 1})
+        True
+        >>>
+
+    :param value: value to hash
+    :return: hexadecimal digest
+    """
+    h = hashlib.sha256()
+    _update(h, value)
+    return h.hexdigest()
+
+
+def is_deterministic(node: Any, /) -> bool:
+    """Check if the outputs of a node only depend on its inputs.
+
+    :param node: node definition
+    :return: if **deterministic** is set in its configuration
+    """
+    return bool(node.config.get("deterministic", False))
+
+
+def _qualname(node: Any, /) -> str:
+    """Get the qualified name of a node, ``package/name`` when its package
+    is known."""
+    if getattr(node, "package_info", None) is not None:
+        from gada import nodeutil
+
+        return nodeutil.qualname(node)
+
+    return node.config["name"]
+
+
+def key(node: Any, inputs: dict, /) -> str:
+    """Get the key of a node run with some inputs.
+
+    Nodes are identified by their qualified name, so nodes with the same
+    name from different packages have different keys.
+
+    :param node: node definition
+    :param inputs: resolved inputs
+    :return: key of the outputs
+    """
+    return stable_hash(
+        (
+            _qualname(node),
+            node.config.get("version", None),
+            node.config,
+            inputs,
+        )
+    )
+
+
+class MemoCache(object):
+    r"""Cache of outputs from deterministic nodes.
+
+    .. code-block:: python
+
+        >>> from gada.memo import MemoCache
+        >>>
+        >>> memo = MemoCache(maxsize=128)
+        >>> memo.set("key", {"out": 1})
+        >>> memo.get("key")
+        (True, {'out': 1})
+        >>> memo.stats
+        {'hits': 1, 'misses': 0, 'size': 1}
+        >>>
+
+    Outputs are copied when stored and when returned, so that modifying
+    them doesn't change the cache.
+
+    Recently used outputs are kept in memory. Outputs are also stored
+    on disk when **path** is set, for example to :func:`cache_path`, so
+    they are shared between processes.
+
+    :param maxsize: maximum number of outputs kept in memory
+    :param path: directory where outputs are stored
+    :param max_bytes: maximum size of stored outputs, oldest are removed first
+    :param ttl: seconds after which outputs expire
+    """
+
+    __slots__ = (
+        "_maxsize",
+        "_path",
+        "_max_bytes",
+        "_ttl",
+        "_entries",
+        "_lock",
+        "_hits",
+        "_misses",
+        "_disk_bytes",
+    )
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        *,
+        path: Optional[Union[str, Path]] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        self._maxsize: int = maxsize
+        self._path: Optional[Path] = Path(path) if path is not None else None
+        self._max_bytes: Optional[int] = max_bytes
+        self._ttl: Optional[float] = ttl
+        # key -> (expiration time, outputs)
+        self._entries: OrderedDict[str, tuple[Optional[float], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: int = 0
+        self._misses: int = 0
+        # size of stored outputs, computed on first write
+        self._disk_bytes: Optional[int] = None
+
+    @property
+    def stats(self) -> dict:
+        """Number of hits, misses and outputs kept in memory"""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._entries),
+            }
+
+    def get(self, key: str, /) -> tuple[bool, Any]:
+        """Get stored outputs.
+
+        :param key: key of the outputs
+        :return: if outputs were found and a copy of the outputs
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None and entry[0] is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return True, copy.deepcopy(entry[1])
+
+        entry = self._read(key, now) if self._path is not None else None
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return False, None
+
+            self._hits += 1
+            self._remember(key, entry)
+        return True, copy.deepcopy(entry[1])
+
+    def set(self, key: str, value: Any, /) -> None:
+        """Store outputs.
+
+        :param key: key of the outputs
+        :param value: outputs
+        """
+        expires = time.time() + self._ttl if self._ttl is not None else None
+        entry = (expires, copy.deepcopy(value))
+        with self._lock:
+            self._remember(key, entry)
+
+        if self._path is not None:
+            self._write(key, entry)
+
+    def clear(self) -> None:
+        """Remove outputs kept in memory and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def _remember(self, key: str, entry: tuple, /) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def _file(self, key: str, /) -> Path:
+        return self._path / key[:2] / f"{key}.pickle"
+
+    def _read(self, key: str, now: float, /) -> Optional[tuple]:
+        file = self._file(key)
+        try:
+            with open(file, "rb") as f:
+                entry = pickle.load(f)
+        except Exception:
+            return None
+
+        if entry[0] is not None and entry[0] <= now:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+            return None
+
+        return entry
+
+    def _write(self, key: str, entry: tuple, /) -> None:
+        file = self._file(key)
+        try:
+            data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"outputs for {key} can't be stored: {e}")
+            return
+
+        try:
+            _fs.write_atomic(file, data)
+        except OSError as e:
+            logger.debug(f"failed to store outputs to {file}: {e}")
+            return
+
+        if self._max_bytes is not None:
+            self._evict(len(data))
+
+    def _evict(self, written: int, /) -> None:
+        """Remove the oldest stored outputs when over **max_bytes**."""
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += written
+                if self._disk_bytes <= self._max_bytes:
+                    return
+
+            files = []
+            for file in self._path.glob("*/*.pickle"):
+                try:
+                    st = file.stat()
+                except OSError:
+                    continue
+                files.append((st.st_mtime_ns, st.st_size, file))
+
+            total = sum(_[1] for _ in files)
+            for _, size, file in sorted(files, key=lambda _: _[0]):
+                if total <= self._max_bytes:
+                    break
+
+                try:
+                    os.remove(file)
+                    total -= size
+                except OSError:
+                    pass
+
+            self._disk_bytes = total
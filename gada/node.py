@@ -0,0 +1,266 @@
+"""Package containing the definitions of nodes run by programs."""
+from __future__ import annotations
+
+__all__ = ["NodeNotFoundError", "NodePath", "Param", "Node", "NodeCall"]
+from typing import TYPE_CHECKING
+from gada import typing
+from gada.nodeutil import NodeInfo, NodeCall, NodeNotFoundError
+
+if TYPE_CHECKING:
+    from typing import Any, Optional, Union
+
+    from gada.nodeutil import PackageInfo
+
+
+# types by name in configurations
+_TYPES = {
+    "any": typing.AnyType,
+    "bool": typing.BoolType,
+    "int": typing.IntType,
+    "float": typing.FloatType,
+    "str": typing.StringType,
+    "string": typing.StringType,
+}
+
+
+def _load_type(value: Optional[Union[str, typing.Type]], /) -> typing.Type:
+    """Get the type of a parameter from its configuration."""
+    if value is None:
+        return typing.AnyType()
+
+    if isinstance(value, typing.Type):
+        return value
+
+    cls = _TYPES.get(value, None)
+    if cls is None:
+        raise Exception(f"unknown type {value}")
+
+    return cls()
+
+
+class NodePath(object):
+    r"""Path to a node installed in **PYTHONPATH**.
+
+    .. code-block:: python
+
+        >>> from gada.node import NodePath
+        >>>
+        >>> p = NodePath("gada/rebuild")
+        >>> p.module, p.name
+        (['gada'], 'rebuild')
+        >>> p.load().name
+        'rebuild'
+        >>>
+
+    :param path: name or qualified name ``package/name`` of the node
+    """
+
+    __slots__ = ("_path",)
+
+    def __init__(self, path: str, /) -> None:
+        self._path: str = path
+
+    def __repr__(self) -> str:
+        return f"NodePath({self._path!r})"
+
+    def __str__(self) -> str:
+        return self._path
+
+    @property
+    def module(self) -> list[str]:
+        """Path to the package of the node"""
+        return self._path.split("/")[:-1]
+
+    @property
+    def name(self) -> str:
+        """Name of the node"""
+        return self._path.split("/")[-1]
+
+    def exists(self) -> bool:
+        """Check if the node is installed."""
+        from gada import nodeutil
+
+        return nodeutil.find_node(self._path) is not None
+
+    def load(self) -> Node:
+        """Load the node.
+
+        This will raise **NodeNotFoundError** if the node is not installed.
+
+        :return: loaded node
+        """
+        from gada import nodeutil
+
+        info = nodeutil.find_node(self._path)
+        if info is None:
+            raise NodeNotFoundError(self._path)
+
+        return Node.from_info(info)
+
+
+class Param(object):
+    r"""Input or output of a node or program.
+
+    :param name: name of the parameter
+    :param type: type of the parameter
+    :param value: default value
+    :param help: description of the parameter
+    """
+
+    __slots__ = ("_name", "_type", "_value", "_help")
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        type: Optional[typing.Type] = None,
+        value: Any = None,
+        help: Optional[str] = None,
+    ) -> None:
+        self._name: str = name
+        self._type: typing.Type = type if type is not None else typing.AnyType()
+        self._value: Any = value
+        self._help: Optional[str] = help
+
+    def __repr__(self) -> str:
+        return f"Param(name={self._name!r}, type={self._type!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, Param)
+            and self._name == other._name
+            and self._type == other._type
+            and self._value == other._value
+        )
+
+    @property
+    def name(self) -> str:
+        """Name of the parameter"""
+        return self._name
+
+    @property
+    def type(self) -> typing.Type:
+        """Type of the parameter"""
+        return self._type
+
+    @property
+    def value(self) -> Any:
+        """Default value"""
+        return self._value
+
+    @property
+    def help(self) -> Optional[str]:
+        """Description of the parameter"""
+        return self._help
+
+    @staticmethod
+    def from_config(config: dict, /) -> Param:
+        r"""Load a parameter from a JSON configuration.
+
+        .. code-block:: python
+
+            >>> from gada.node import Param
+            >>>
+            >>> Param.from_config({"name": "a", "type": "int"})
+            Param(name='a', type=IntType())
+            >>>
+
+        :param config: configuration
+        :return: loaded **Param**
+        """
+        name = config.get("name", None)
+        if not name:
+            raise Exception("missing name attribute for parameter")
+
+        return Param(
+            name,
+            type=_load_type(config.get("type", None)),
+            value=config.get("value", None),
+            help=config.get("help", None),
+        )
+
+
+class Node(NodeInfo):
+    r"""Definition of a node run by programs.
+
+    The configuration of the node is kept as is in **config**, so that
+    runners read their own options from it.
+
+    :param config: configuration of the node
+    :param package_info: package defining the node
+    :param runner: runner of the node, defaults to the one from **config**,
+        nodes without runner are pure and don't run anything
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        /,
+        *,
+        package_info: Optional[PackageInfo] = None,
+        runner: Optional[str] = None,
+    ) -> None:
+        super().__init__(package_info, config)
+        self.runner: Optional[str] = (
+            runner if runner is not None else config.get("runner", None)
+        )
+        self.inputs: list[Param] = [
+            Param.from_config(_) for _ in config.get("inputs", [])
+        ]
+        self.outputs: list[Param] = [
+            Param.from_config(_) for _ in config.get("outputs", [])
+        ]
+
+    def __repr__(self) -> str:
+        return f"Node(name={self.name!r}, runner={self.runner!r})"
+
+    @property
+    def name(self) -> str:
+        """Name of the node"""
+        return self.config["name"]
+
+    @property
+    def is_pure(self) -> bool:
+        """If the node has no runner"""
+        return self.runner is None
+
+    @staticmethod
+    def from_config(config: dict, /) -> Node:
+        r"""Load a node from a JSON configuration.
+
+        .. code-block:: python
+
+            >>> from gada.node import Node
+            >>>
+            >>> Node.from_config({
+            ...   "name": "min",
+            ...   "runner": "pymodule",
+            ...   "inputs": [{"name": "a", "type": "int"}],
+            ...   "outputs": [{"name": "out", "type": "int"}]
+            ... })
+            ...
+            Node(name='min', runner='pymodule')
+            >>>
+
+        :param config: configuration
+        :return: loaded **Node**
+        """
+        if not config.get("name", None):
+            raise Exception("missing name attribute for node")
+
+        return Node(config)
+
+    @staticmethod
+    def from_info(info: NodeInfo, /) -> Node:
+        """Load a node found in an installed package.
+
+        Nodes without runner use **pymodule** like ``gada run``.
+
+        :param info: node found by :mod:`gada.nodeutil`
+        :return: loaded **Node**
+        """
+        return Node(
+            info.config,
+            package_info=info.package_info,
+            runner=info.config.get("runner", "pymodule"),
+        )
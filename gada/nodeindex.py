@@ -0,0 +1,316 @@
+"""Persistent index of installed Gada nodes.
+
+Finding nodes requires scanning every module from **PYTHONPATH** for a
+``gada.yml`` file and parsing each of them. The result of this scan is
+stored in ``{datadir}/index.json`` and reused for as long as it is fresh.
+
+The index is considered stale when:
+
+* **sys.path** or the discovery strategy changed,
+* the mtime, size or inode of a **sys.path** entry changed,
+* the mtime, size or inode of a package directory changed,
+* the mtime, size or inode of an indexed ``gada.yml`` changed.
+
+Adding or removing a package in a directory from **sys.path** changes the
+mtime of that directory, and adding a ``gada.yml`` to a package changes
+the mtime of the package directory, so new packages are detected.
+
+The empty **sys.path** entry, standing for the current directory, is not
+indexed. Otherwise the index would be rebuilt whenever the current
+directory changes.
+"""
+from __future__ import annotations
+
+__all__ = ["path", "build", "load", "dump", "is_fresh", "get", "rebuild", "status"]
+from typing import TYPE_CHECKING
+import os
+import sys
+import json
+from pathlib import Path
+from gada import _fs, datadir
+from gada._log import logger
+
+if TYPE_CHECKING:
+    from typing import Any, Optional, TypedDict
+
+    from gada.gadayml import NodeConfig
+
+    class IndexPackage(TypedDict):
+        """Package stored in the index."""
+
+        name: str
+        """Name of the package."""
+        path: str
+        """Directory containing the package."""
+        gada_yml_path: str
+        """Path to ``gada.yml``."""
+        stat: Optional[list[int]]
+        """mtime, size and inode of ``gada.yml``."""
+
+    class IndexNode(TypedDict):
+        """Node stored in the index."""
+
+        name: str
+        """Name of the node."""
+        package: str
+        """Name of the package."""
+        config: NodeConfig
+        """Configuration of the node."""
+        cli: dict
+        """Compiled command-line interface of the node."""
+
+    class Index(TypedDict):
+        """Content of ``index.json``."""
+
+        version: int
+        """Version of the index format."""
+        strategy: str
+        """Strategy used for finding packages."""
+        sys_path: list[tuple[str, Optional[list[int]]]]
+        """Entries of **sys.path** with their mtime, size and inode."""
+        dirs: list[tuple[str, list[int]]]
+        """Directories of possible packages with their mtime, size and inode."""
+        packages: list[IndexPackage]
+        """Indexed packages."""
+        nodes: list[IndexNode]
+        """Indexed nodes."""
+
+
+_INDEX_FILENAME = "index.json"
+_INDEX_VERSION = 4
+
+
+def path() -> Path:
+    """Get absolute path to ``{datadir}/index.json``.
+
+    :return: path to the index
+    """
+    return datadir.path() / _INDEX_FILENAME
+
+
+def _stat(filename: str | Path, /) -> Optional[list[int]]:
+    """Get the mtime, size and inode of a file or **None** if missing."""
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def _entries(sys_path: Optional[list[str]] = None, /) -> list[str]:
+    """Get the entries of **sys.path** covered by the index."""
+    return [_ for _ in (sys.path if sys_path is None else sys_path) if _]
+
+
+def build(
+    sys_path: Optional[list[str]] = None,
+    *,
+    mode: Optional[str] = None,
+    workers: Optional[int] = None,
+    strategy: Optional[str] = None,
+) -> Index:
+    r"""Scan **sys.path** and build a fresh index.
+
+    .. code-block:: python
+
+        >>> from gada import nodeindex
+        >>>
+        >>> index = nodeindex.build()
+        >>> [_["name"] for _ in index["nodes"]]
+        ['list_packages', 'list_nodes', 'rebuild']
+        >>>
+
+    :param sys_path: list of paths to look for modules in, default to **sys.path**
+    :param mode: discovery mode, see **gada.nodeutil.discover**
+    :param workers: maximum number of discovery workers
+    :param strategy: how to find packages, see **gada.nodeutil.iter_packages**
+    :return: built index
+    """
+    from gada import nodeutil
+
+    entries = _entries(sys_path)
+    strategy = strategy if strategy is not None else nodeutil.default_strategy()
+
+    # a gada.yml added to any of these directories must be detected
+    dirs: dict[str, list[int]] = {}
+    for _, _, gada_yml_path in nodeutil._iter_candidates(entries, strategy=strategy):
+        directory = os.path.dirname(gada_yml_path)
+        stat = _stat(directory)
+        if stat is not None:
+            dirs[directory] = stat
+
+    packages: list[IndexPackage] = []
+    nodes: list[IndexNode] = []
+    for package, config in nodeutil.discover(
+        entries, mode=mode, workers=workers, strategy=strategy
+    ):
+        packages.append(
+            {
+                "name": package.name,
+                "path": str(package.path),
+                "gada_yml_path": str(package.gada_yml_path),
+                "stat": _stat(package.gada_yml_path),
+            }
+        )
+        for node in config["nodes"]:
+            nodes.append(
+                {
+                    "name": node["name"],
+                    "package": package.name,
+                    "config": node,
+                    "cli": nodeutil.CliSpec(
+                        node["name"], node.get("input", None)
+                    ).to_config(),
+                }
+            )
+
+    return {
+        "version": _INDEX_VERSION,
+        "strategy": strategy,
+        "sys_path": [(_, _stat(_)) for _ in entries],
+        "dirs": list(dirs.items()),
+        "packages": packages,
+        "nodes": nodes,
+    }
+
+
+def load(file: Optional[Path] = None) -> Optional[Index]:
+    """Load the index from disk.
+
+    **None** is returned if the index doesn't exist or can't be read.
+
+    :param file: path to the index, default to ``{datadir}/index.json``
+    :return: loaded index or **None**
+    """
+    try:
+        with open(file if file is not None else path(), "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(index, dict) or index.get("version") != _INDEX_VERSION:
+        return None
+
+    return index
+
+
+def dump(index: Index, file: Optional[Path] = None) -> None:
+    """Write the index to disk.
+
+    :param index: index to write
+    :param file: path to the index, default to ``{datadir}/index.json``
+    """
+    file = Path(file if file is not None else path())
+    _fs.write_atomic(file, json.dumps(index).encode("utf-8"))
+
+
+def is_fresh(
+    index: Optional[Index],
+    sys_path: Optional[list[str]] = None,
+    *,
+    strategy: Optional[str] = None,
+) -> bool:
+    """Check if an index still reflects installed packages.
+
+    :param index: loaded index
+    :param sys_path: list of paths to look for modules in, default to **sys.path**
+    :param strategy: expected strategy, default to the one used by the index
+    :return: if the index is fresh
+    """
+    if not index:
+        return False
+
+    if strategy is not None and index["strategy"] != strategy:
+        return False
+
+    if [_[0] for _ in index["sys_path"]] != _entries(sys_path):
+        return False
+
+    for entry, stat in index["sys_path"]:
+        if _stat(entry) != stat:
+            return False
+
+    for directory, stat in index["dirs"]:
+        if _stat(directory) != stat:
+            return False
+
+    for package in index["packages"]:
+        if _stat(package["gada_yml_path"]) != package["stat"]:
+            return False
+
+    return True
+
+
+def rebuild(
+    file: Optional[Path] = None,
+    *,
+    mode: Optional[str] = None,
+    workers: Optional[int] = None,
+    strategy: Optional[str] = None,
+) -> Index:
+    """Rebuild the index and write it to disk.
+
+    :param file: path to the index, default to ``{datadir}/index.json``
+    :param mode: discovery mode, see **gada.nodeutil.discover**
+    :param workers: maximum number of discovery workers
+    :param strategy: how to find packages, see **gada.nodeutil.iter_packages**
+    :return: rebuilt index
+    """
+    index = build(mode=mode, workers=workers, strategy=strategy)
+    dump(index, file)
+    return index
+
+
+def get(*, strategy: Optional[str] = None) -> Index:
+    """Get a fresh index of installed nodes.
+
+    The index is loaded from disk if fresh, otherwise it is rebuilt. Failing
+    to write the rebuilt index is not an error.
+
+    :param strategy: how to find packages, see **gada.nodeutil.iter_packages**
+    :return: fresh index
+    """
+    from gada import nodeutil
+
+    strategy = strategy if strategy is not None else nodeutil.default_strategy()
+    index = load()
+    if is_fresh(index, strategy=strategy):
+        return index
+
+    logger.debug("node index is stale, rebuilding...")
+    index = build(strategy=strategy)
+    try:
+        dump(index)
+    except OSError as e:
+        logger.debug(f"failed to write node index: {e}")
+
+    return index
+
+
+def status(
+    file: Optional[Path] = None, *, strategy: Optional[str] = None
+) -> dict[str, Any]:
+    """Get information about the index stored on disk.
+
+    The index is fresh if **get** would use it without rebuilding it.
+
+    :param file: path to the index, default to ``{datadir}/index.json``
+    :param strategy: how to find packages, see **gada.nodeutil.iter_packages**
+    :return: dict with keys **path**, **exists**, **fresh**, **strategy**,
+        **packages**, **nodes**
+    """
+    from gada import nodeutil
+
+    file = Path(file if file is not None else path())
+    strategy = strategy if strategy is not None else nodeutil.default_strategy()
+    index = load(file)
+
+    return {
+        "path": file,
+        "exists": index is not None,
+        "fresh": is_fresh(index, strategy=strategy),
+        "strategy": index["strategy"] if index else None,
+        "packages": len(index["packages"]) if index else 0,
+        "nodes": len(index["nodes"]) if index else 0,
+    }
@@ -3,33 +3,48 @@ from __future__ import annotations
 
 __all__ = [
     "NodeNotFoundError",
-    "Param",
-    "Node",
+    "NodeRegistry",
     "NodeCall",
-    "NodePath",
-    "nodes",
     "iter_packages",
     "iter_nodes",
+    "discover",
+    "qualname",
+    "registry",
+    "find_node",
     "create_parser",
+    "CliSpec",
+    "get_cli_spec",
+    "parse_args",
 ]
 from typing import TYPE_CHECKING
+import os
+import sys
 import pkgutil
-import argparse
 from dataclasses import dataclass
-from types import ModuleType
 from pathlib import Path
-from gada import typing, _cache, gadayml
+from gada import _cache, gadayml
 from gada._log import logger
 
 if TYPE_CHECKING:
-    from typing import Iterable
+    import argparse
+    from typing import Any, Iterable, Iterator
     from pkgutil import ModuleInfo
 
-    from gada.gadayml import GadaConfig, NodeConfig
+    from gada.gadayml import GadaConfig, InputConfig, NodeConfig
+    from gada.nodeindex import Index
 
 
 _GADA_LANG_MODULE = "gada._lang"
 
+ENTRY_POINTS_GROUP = "gada.packages"
+"""Entry-point group where distributions advertise their gada packages"""
+
+DEFAULT_STRATEGY = "filesystem"
+"""Default strategy for finding gada packages"""
+
+STRATEGY_ENV = "GADA_DISCOVERY_STRATEGY"
+"""Environment variable overriding the default strategy"""
+
 
 class PackageInfo:
     def __init__(self, path: Path, name: str, gada_yml_path: Path) -> None:
@@ -39,9 +54,15 @@ class PackageInfo:
 
 
 class NodeInfo:
-    def __init__(self, package_info: PackageInfo, config: NodeConfig) -> None:
+    def __init__(
+        self,
+        package_info: PackageInfo,
+        config: NodeConfig,
+        cli_spec: CliSpec | None = None,
+    ) -> None:
         self.package_info = package_info
         self.config = config
+        self.cli_spec = cli_spec
 
 
 class NodeNotFoundError(Exception):
@@ -49,7 +70,246 @@ class NodeNotFoundError(Exception):
         super().__init__(f"node {node} not found")
 
 
-def iter_packages(path: list[str] | None = None) -> Iterable[PackageInfo]:
+def _iter_filesystem_candidates(
+    path: list[str] | None = None,
+) -> Iterable[tuple[str, str, str]]:
+    """Yield all top-level modules of **PYTHONPATH** as discovery candidates.
+
+    :param path: should be either None or a list of paths to look for modules in
+    """
+    for mod in pkgutil.iter_modules(path):
+        if not hasattr(mod.module_finder, "path"):
+            continue
+
+        yield (
+            mod.module_finder.path,
+            mod.name,
+            os.path.join(mod.module_finder.path, mod.name, "gada.yml"),
+        )
+
+
+def _iter_entry_points_candidates(
+    path: list[str] | None = None,
+    *,
+    modules_path: list[str] | None = None,
+) -> Iterable[tuple[str, str, str]]:
+    """Yield packages advertised in the **gada.packages** entry-point group.
+
+    Packages are located without being imported.
+
+    :param path: should be either None or a list of paths to look for modules in
+    :param modules_path: where to locate advertised packages, defaults to
+        **path**
+    """
+    from importlib.machinery import PathFinder
+    from importlib.metadata import distributions
+
+    seen = set()
+    for dist in distributions(path=path if path is not None else sys.path):
+        for ep in dist.entry_points:
+            name = ep.value.partition(":")[0].strip()
+            if ep.group != ENTRY_POINTS_GROUP or name in seen:
+                continue
+
+            seen.add(name)
+            spec = None
+            search_path = modules_path if modules_path is not None else path
+            parts = name.split(".")
+            for i in range(len(parts)):
+                spec = PathFinder.find_spec(".".join(parts[: i + 1]), search_path)
+                if spec is None or not spec.submodule_search_locations:
+                    spec = None
+                    break
+
+                search_path = list(spec.submodule_search_locations)
+
+            if spec is None:
+                logger.warning(f"package {name} advertised by {dist.name} not found")
+                continue
+
+            package_dir = search_path[0]
+            yield (
+                os.path.dirname(package_dir),
+                name,
+                os.path.join(package_dir, "gada.yml"),
+            )
+
+
+def _is_site_dir(entry: str, /) -> bool:
+    """Check if a **sys.path** entry is a directory of installed distributions.
+
+    Other entries, such as roots of projects installed with ``pip install -e``,
+    are development trees even if they contain metadata.
+    """
+    return os.path.basename(os.path.normpath(entry or ".")) in (
+        "site-packages",
+        "dist-packages",
+    )
+
+
+def _iter_candidates(
+    path: list[str] | None = None, *, strategy: str | None = None
+) -> Iterable[tuple[str, str, str]]:
+    """Yield tuples ``(directory, name, gada_yml_path)`` of possible packages.
+
+    :param path: should be either None or a list of paths to look for modules in
+    :param strategy: ``filesystem``, ``entry_points`` or ``auto``
+    """
+    strategy = strategy if strategy is not None else default_strategy()
+    if strategy == "filesystem":
+        yield from _iter_filesystem_candidates(path)
+    elif strategy == "entry_points":
+        yield from _iter_entry_points_candidates(path)
+    elif strategy == "auto":
+        # Entries are visited in sys.path order so that the first package
+        # found with a name shadows the next ones, as when importing it
+        entries = list(sys.path if path is None else path)
+        seen = set()
+        for entry in entries:
+            if _is_site_dir(entry):
+                # Installed distributions advertise themselves with entry
+                # points, only development trees need to be scanned
+                candidates = _iter_entry_points_candidates(
+                    [entry], modules_path=entries
+                )
+            else:
+                candidates = _iter_filesystem_candidates([entry])
+
+            for candidate in candidates:
+                if candidate[1] not in seen:
+                    seen.add(candidate[1])
+                    yield candidate
+    else:
+        raise Exception(f"unknown discovery strategy {strategy}")
+
+
+def default_strategy() -> str:
+    """Get the strategy used for finding gada packages when none is given.
+
+    It can be overriden with the **GADA_DISCOVERY_STRATEGY** environment
+    variable.
+
+    :return: ``filesystem``, ``entry_points`` or ``auto``
+    """
+    return os.environ.get(STRATEGY_ENV, DEFAULT_STRATEGY)
+
+
+def _scan_packages(
+    path: list[str] | None = None, *, strategy: str | None = None
+) -> Iterable[PackageInfo]:
+    """Scan **PYTHONPATH** for packages having a top-level gada.yml file.
+
+    :param path: should be either None or a list of paths to look for modules in
+    :param strategy: ``filesystem``, ``entry_points`` or ``auto``
+    """
+    for finder_path, name, gada_yml_path in _iter_candidates(path, strategy=strategy):
+        if os.path.exists(gada_yml_path):
+            yield PackageInfo(
+                path=finder_path, name=name, gada_yml_path=Path(gada_yml_path)
+            )
+
+
+def _load_candidate(
+    candidate: tuple[str, str, str], /
+) -> tuple[PackageInfo, GadaConfig] | None:
+    """Load and validate ``gada.yml`` of a module if it exists.
+
+    This is run by workers during parallel discovery and must be picklable.
+
+    :param candidate: tuple ``(directory, name, gada_yml_path)``
+    :return: tuple ``(package, config)`` or **None**
+    """
+    finder_path, name, gada_yml_path = candidate
+    try:
+        config = gadayml.load_path(gada_yml_path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+    package = PackageInfo(
+        path=finder_path, name=name, gada_yml_path=Path(gada_yml_path)
+    )
+    return package, config
+
+
+def discover(
+    path: list[str] | None = None,
+    *,
+    mode: str | None = None,
+    workers: int | None = None,
+    strategy: str | None = None,
+) -> list[tuple[PackageInfo, GadaConfig]]:
+    r"""Find packages having a top-level gada.yml file and load their configuration.
+
+    .. code-block:: python
+
+        >>> from gada import nodeutil
+        >>>
+        >>> [(p.name, len(c["nodes"])) for p, c in nodeutil.discover(mode="thread")]
+        [('gada', 3)]
+        >>>
+
+    Reading, parsing and validating ``gada.yml`` files can be spread across
+    multiple workers with **mode**:
+
+    * ``serial``: load packages one after another (default)
+    * ``thread``: load packages in a thread pool
+    * ``process``: load packages in a process pool, for very large installs
+
+    Results are always returned in **sys.path** order.
+
+    :param path: should be either None or a list of paths to look for modules in
+    :param mode: ``serial``, ``thread`` or ``process``
+    :param workers: maximum number of workers
+    :param strategy: how to find packages, see **iter_packages**
+    :return: list of tuples ``(package, config)``
+    """
+    mode = mode if mode is not None else "serial"
+    candidates = list(_iter_candidates(path, strategy=strategy))
+
+    if mode == "serial" or len(candidates) <= 1:
+        results = map(_load_candidate, candidates)
+        return [_ for _ in results if _ is not None]
+
+    if mode == "thread":
+        from concurrent.futures import ThreadPoolExecutor as Executor
+
+        workers = workers if workers is not None else min(32, (os.cpu_count() or 1) + 4)
+    elif mode == "process":
+        from concurrent.futures import ProcessPoolExecutor as Executor
+
+        workers = workers if workers is not None else os.cpu_count() or 1
+    else:
+        raise Exception(f"unknown discovery mode {mode}")
+
+    with Executor(max_workers=workers) as executor:
+        # Large chunks amortize the cost of sending tasks to processes
+        chunksize = max(1, len(candidates) // (workers * 4))
+        results = executor.map(_load_candidate, candidates, chunksize=chunksize)
+        return [_ for _ in results if _ is not None]
+
+
+def _iter_index_packages(index: Index) -> Iterable[PackageInfo]:
+    for package in index["packages"]:
+        yield PackageInfo(
+            path=package["path"],
+            name=package["name"],
+            gada_yml_path=Path(package["gada_yml_path"]),
+        )
+
+
+def _iter_index_nodes(index: Index) -> Iterable[NodeInfo]:
+    packages = {_.name: _ for _ in _iter_index_packages(index)}
+    for node in index["nodes"]:
+        yield NodeInfo(
+            package_info=packages[node["package"]],
+            config=node["config"],
+            cli_spec=CliSpec.from_config(node["cli"]),
+        )
+
+
+def iter_packages(
+    path: list[str] | None = None, *, strategy: str | None = None
+) -> Iterable[PackageInfo]:
     """Yield Python packages having a top-level gada.yml file.
 
     .. code-block:: python
@@ -62,20 +322,42 @@ def iter_packages(path: list[str] | None = None) -> Iterable[PackageInfo]:
         gada
         >>>
 
+    Packages are found with one of the following **strategy**:
+
+    * ``filesystem``: probe every top-level module for a ``gada.yml`` file
+    * ``entry_points``: read packages advertised by installed distributions
+      in the **gada.packages** entry-point group
+    * ``auto``: use entry points for ``site-packages`` directories and probe
+      modules of other **sys.path** entries, such as development trees, in
+      **sys.path** order so that the first package with a name wins
+
+    A distribution advertises its gada package with:
+
+    .. code-block:: python
+
+        setup(
+            ...,
+            entry_points={"gada.packages": ["mypackage = mypackage"]},
+        )
+
+    Packages are read from the node index when **path** is None.
+
     :param path: should be either None or a list of paths to look for modules in
+    :param strategy: ``filesystem``, ``entry_points`` or ``auto``, default to
+        **default_strategy()**
     """
-    for mod in pkgutil.iter_modules(path):
-        if not hasattr(mod.module_finder, "path"):
-            continue
+    if path is None:
+        from gada import nodeindex
 
-        gada_yml_path = Path(mod.module_finder.path) / mod.name / "gada.yml"
-        if gada_yml_path.exists():
-            yield PackageInfo(
-                path=mod.module_finder.path, name=mod.name, gada_yml_path=gada_yml_path
-            )
+        yield from _iter_index_packages(nodeindex.get(strategy=strategy))
+        return
+
+    yield from _scan_packages(path, strategy=strategy)
 
 
-def iter_nodes(path: list[str] | None = None) -> Iterable[NodeInfo]:
+def iter_nodes(
+    path: list[str] | None = None, *, strategy: str | None = None
+) -> Iterable[NodeInfo]:
     r"""Yield installed Gada nodes.
 
     .. code-block:: python
@@ -88,24 +370,127 @@ def iter_nodes(path: list[str] | None = None) -> Iterable[NodeInfo]:
         rebuild
         >>>
 
+    Nodes are read from the node index when **path** is None.
+
     :param path: should be either None or a list of paths to look for modules in
+    :param strategy: how to find packages, see **iter_packages**
     """
-    for package in iter_packages(path):
+    if path is None:
+        from gada import nodeindex
+
+        yield from _iter_index_nodes(nodeindex.get(strategy=strategy))
+        return
+
+    for package in _scan_packages(path, strategy=strategy):
         config = gadayml.load(package.name)
         for node in config["nodes"]:
             yield NodeInfo(package_info=package, config=node)
 
 
+class NodeRegistry:
+    r"""In-memory registry of nodes indexed by name.
+
+    .. code-block:: python
+
+        >>> from gada import nodeutil
+        >>>
+        >>> registry = nodeutil.NodeRegistry(nodeutil.iter_nodes())
+        >>> registry.get("rebuild").package_info.name
+        'gada'
+        >>> registry.get("gada/rebuild").package_info.name
+        'gada'
+        >>>
+
+    Nodes can be found by their name or by their qualified name
+    ``package/name`` like in **NodePath**. When multiple packages define
+    a node with the same name, the first one found in **sys.path** order
+    wins and the others are reported in :py:attr:`duplicates`.
+
+    :param nodes: nodes to register
+    """
+
+    __slots__ = ("_by_name", "_by_path", "_duplicates")
+
+    def __init__(self, nodes: Iterable[NodeInfo], /) -> None:
+        self._by_name: dict[str, NodeInfo] = {}
+        self._by_path: dict[str, NodeInfo] = {}
+        self._duplicates: dict[str, list[NodeInfo]] = {}
+
+        for node in nodes:
+            name = node.config["name"]
+            # the first package in sys.path order wins like with NodePath
+            self._by_path.setdefault(qualname(node), node)
+
+            other = self._by_name.get(name, None)
+            if other is None:
+                self._by_name[name] = node
+                continue
+
+            self._duplicates.setdefault(name, [other]).append(node)
+            logger.warning(
+                f"node {name} is defined in multiple packages: "
+                f"{', '.join(_.package_info.name for _ in self._duplicates[name])}"
+            )
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def __iter__(self) -> Iterator[NodeInfo]:
+        return iter(self._by_path.values())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name or name in self._by_path
+
+    @property
+    def duplicates(self) -> dict[str, list[NodeInfo]]:
+        """Nodes defined in multiple packages indexed by name"""
+        return dict(self._duplicates)
+
+    def get(self, name: str, /) -> NodeInfo | None:
+        """Get a node by name or qualified name.
+
+        :param name: name or ``package/name`` of the node
+        :return: the node or **None**
+        """
+        node = self._by_name.get(name, None)
+        if node is None:
+            node = self._by_path.get(name, None)
+
+        return node
+
+
+def qualname(node: NodeInfo, /) -> str:
+    """Get the qualified name ``package/name`` of a node.
+
+    :param node: node
+    :return: qualified name
+    """
+    return f"{node.package_info.name.replace('.', '/')}/{node.config['name']}"
+
+
+def registry() -> NodeRegistry:
+    """Get the registry of installed nodes.
+
+    The registry is built once per process, call **gada._cache.clear** to
+    force a rebuild.
+
+    :return: registry
+    """
+    reg = _cache.get_node_registry()
+    if reg is None:
+        reg = NodeRegistry(iter_nodes())
+        _cache.set_node_registry(reg)
+
+    return reg
+
+
 def find_node(name: str) -> NodeInfo | None:
     """Find a node by name.
 
-    :param name: name of the node
+    :param name: name or ``package/name`` of the node
+    :return: the node or **None**
     """
-    for node in iter_nodes():
-        if node.config["name"] == name:
-            return node
-
-    return node
+    return registry().get(name)
 
 
 def create_parser(node: NodeInfo | str) -> argparse.ArgumentParser:
@@ -115,8 +500,10 @@ def create_parser(node: NodeInfo | str) -> argparse.ArgumentParser:
 
         node = info
 
+    import argparse
+
     parser = argparse.ArgumentParser(node.config["name"])
-    if inputs := node.config["input"]:
+    if inputs := node.config.get("input", None):
         for input in inputs:
             kwargs = {}
             if "action" in input:
@@ -130,6 +517,189 @@ def create_parser(node: NodeInfo | str) -> argparse.ArgumentParser:
     return parser
 
 
+_INFINITY = float("inf")
+
+
+def _nargs_range(nargs: str | int | None, /) -> tuple[int, float] | None:
+    """Get the min and max number of values for a positional argument.
+
+    :param nargs: **nargs** of the argument
+    :return: tuple ``(min, max)`` or **None** if not supported by **CliSpec**
+    """
+    if nargs is None:
+        return 1, 1
+    if nargs == "?":
+        return 0, 1
+    if nargs == "*":
+        return 0, _INFINITY
+    if nargs == "+":
+        return 1, _INFINITY
+    if isinstance(nargs, int) and not isinstance(nargs, bool) and nargs > 0:
+        return nargs, nargs
+
+    return None
+
+
+class CliSpec:
+    r"""Compiled command-line interface of a node.
+
+    .. code-block:: python
+
+        >>> from gada.nodeutil import CliSpec
+        >>>
+        >>> spec = CliSpec("cat", [{"name": "a"}, {"name": "b", "nargs": "*"}])
+        >>> spec.parse(["x", "y", "z"])
+        {'a': 'x', 'b': ['y', 'z']}
+        >>>
+
+    Command lines made of positional arguments are parsed without argparse.
+    Options, ``-h``, unsupported forms and invalid command lines fall back
+    to the parser from **create_parser** that prints help and errors.
+
+    :param name: name of the node
+    :param inputs: **input** list from the node configuration
+    """
+
+    __slots__ = ("_name", "_inputs", "_positionals")
+
+    def __init__(self, name: str, inputs: list[InputConfig] | None, /) -> None:
+        self._name: str = name
+        self._inputs: list[InputConfig] = list(inputs) if inputs else []
+        # tuples (name, nargs, min, max) or None if argparse is required
+        self._positionals: tuple[tuple[str, Any, int, float], ...] | None = ()
+
+        positionals = []
+        for input in self._inputs:
+            bounds = _nargs_range(input.get("nargs", None))
+            if bounds is None or "action" in input or input["name"].startswith("-"):
+                self._positionals = None
+                break
+
+            positionals.append((input["name"], input.get("nargs", None), *bounds))
+        else:
+            self._positionals = tuple(positionals)
+
+    @property
+    def name(self) -> str:
+        """Name of the node"""
+        return self._name
+
+    @property
+    def is_simple(self) -> bool:
+        """If the command line can be parsed without argparse"""
+        return self._positionals is not None
+
+    def to_config(self) -> dict:
+        """Serialize the spec to JSON-compatible data.
+
+        :return: configuration
+        """
+        return {"name": self._name, "input": self._inputs}
+
+    @staticmethod
+    def from_config(config: dict, /) -> CliSpec:
+        """Load a spec serialized with **to_config**.
+
+        :param config: configuration
+        :return: loaded spec
+        """
+        return CliSpec(config["name"], config["input"])
+
+    @staticmethod
+    def from_node(node: NodeInfo, /) -> CliSpec:
+        """Compile the spec of a node.
+
+        :param node: node
+        :return: compiled spec
+        """
+        return CliSpec(node.config["name"], node.config.get("input", None))
+
+    def parse(self, argv: list[str], /) -> dict[str, Any] | None:
+        """Parse positional arguments.
+
+        :param argv: command-line arguments
+        :return: parsed arguments or **None** if argparse is required
+        """
+        if self._positionals is None:
+            return None
+
+        for arg in argv:
+            if arg[:1] == "-":
+                return None
+
+        # Like argparse, each argument takes as many values as possible
+        # while leaving enough values for the following arguments
+        args: dict[str, Any] = {}
+        pos = 0
+        remaining = len(argv)
+        required = sum(_[2] for _ in self._positionals)
+        for name, nargs, min_count, max_count in self._positionals:
+            required -= min_count
+            count = int(min(max_count, remaining - required))
+            if count < min_count:
+                return None
+
+            if nargs is None:
+                args[name] = argv[pos]
+            elif nargs == "?":
+                args[name] = argv[pos] if count else None
+            else:
+                args[name] = argv[pos : pos + count]
+
+            pos += count
+            remaining -= count
+
+        if remaining:
+            return None
+
+        return args
+
+
+def get_cli_spec(node: NodeInfo, /) -> CliSpec:
+    """Get the compiled command-line interface of a node.
+
+    Specs are read from the node index when available, otherwise compiled
+    once and cached in memory.
+
+    :param node: node
+    :return: compiled spec
+    """
+    if node.cli_spec is not None:
+        return node.cli_spec
+
+    key = qualname(node)
+    spec = _cache.get_cli_spec(key)
+    if spec is None:
+        spec = CliSpec.from_node(node)
+        _cache.set_cli_spec(key, spec)
+
+    node.cli_spec = spec
+    return spec
+
+
+def parse_args(node: NodeInfo | str, argv: list[str], /) -> dict[str, Any]:
+    """Parse command-line arguments for a node.
+
+    This will exit if arguments are invalid or help is requested, like
+    **argparse.ArgumentParser.parse_args**.
+
+    :param node: node or its name
+    :param argv: command-line arguments
+    :return: parsed arguments
+    """
+    if isinstance(node, str):
+        if (info := find_node(node)) is None:
+            raise Exception("node not found")
+
+        node = info
+
+    args = get_cli_spec(node).parse(argv)
+    if args is None:
+        args = vars(create_parser(node).parse_args(args=argv))
+
+    return args
+
+
 def load(node: NodeInfo | str) -> None:
     if isinstance(node, str):
         if (info := find_node(node)) is None:
@@ -151,6 +721,8 @@ class NodeCall(object):
     :param file: absolute path to the source code
     :param lineno: line number in the source code
     :param inputs: inputs for the call
+    :param depends: files read by the call, relative to the directory of
+        **file**
     """
 
     name: str
@@ -158,6 +730,7 @@ class NodeCall(object):
     file: Path
     lineno: int
     inputs: list[Param]
+    depends: list[str]
 
     def __init__(
         self,
@@ -167,12 +740,14 @@ class NodeCall(object):
         file: Optional[Path] = None,
         lineno: Optional[int] = None,
         inputs: Optional[list[Param]] = None,
+        depends: Optional[list[str]] = None,
     ) -> None:
         object.__setattr__(self, "name", name)
         object.__setattr__(self, "id", id)
         object.__setattr__(self, "file", file)
         object.__setattr__(self, "lineno", lineno if lineno is not None else 0)
         object.__setattr__(self, "inputs", inputs if inputs is not None else [])
+        object.__setattr__(self, "depends", list(depends) if depends else [])
 
     @staticmethod
     def from_config(config: dict, /) -> NodeCall:
@@ -206,4 +781,5 @@ class NodeCall(object):
             file=config.get("file", None),
             lineno=config.get("lineno", None),
             inputs={k: v for k, v in config.get("inputs", {}).items()},
+            depends=config.get("depends", None),
         )
@@ -0,0 +1,405 @@
+"""Package containing everything for compiling Gada programs.
+
+Running a step requires loading its node and runner, parsing its inputs
+and building tables of its parameters. An **ExecutionPlan** does this once
+for all the steps of a program so that running the program again, or
+looping over its steps, doesn't pay for it again.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "VAR_REGEX",
+    "Binding",
+    "PlanStep",
+    "ExecutionPlan",
+    "default_load_node",
+    "parse_binding",
+    "compile_step",
+    "compile",
+    "Release",
+    "liveness",
+    "readers",
+]
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Optional, Any
+from gada.nodeutil import NodeCall, NodeNotFoundError
+from gada import runners, typing
+from gada.stream import Stream
+from gada._log import logger
+
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator, Mapping
+
+    from gada.node import Param, Node
+    from gada.program import Context
+
+
+NodeLoader = Callable[[str], "Node"]
+RunnerLoader = Callable[[str], Any]
+
+
+VAR_REGEX = re.compile(r"^\s*\{\s*\{\s*(?P<id>\w+)(\.(?P<name>\w+))?\s*\}\s*\}\s*$")
+
+
+def default_load_node(name: str, /) -> Node:
+    """Default loader for nodes.
+
+    :param name: name of the node
+    :return: loaded node
+    """
+    from gada.node import NodePath
+
+    return NodePath(name).load()
+
+
+@dataclass(frozen=True)
+class Binding(object):
+    r"""Pre-parsed input of a step.
+
+    .. code-block:: python
+
+        >>> from gada.plan import parse_binding
+        >>>
+        >>> parse_binding("a", 1)
+        Binding(name='a', kind='literal', value=1, id=None, output=None)
+        >>> parse_binding("a", "{{ b }}")
+        Binding(name='a', kind='variable', value=None, id='b', output=None)
+        >>> parse_binding("a", "{{ b.out }}")
+        Binding(name='a', kind='output', value=None, id='b', output='out')
+        >>>
+
+    :param name: name of the input
+    :param kind: **literal**, **variable** or **output**
+    :param value: value of a literal
+    :param id: name of a variable or unique id of a node
+    :param output: name of the node output
+    """
+
+    LITERAL = "literal"
+    VARIABLE = "variable"
+    OUTPUT = "output"
+
+    name: str
+    kind: str
+    value: Any = None
+    id: Optional[str] = None
+    output: Optional[str] = None
+
+    def resolve(self, ctx: Context, /) -> Any:
+        """Get the value of the input in a context.
+
+        :param ctx: running context
+        :return: value of the input
+        """
+        if self.kind == Binding.LITERAL:
+            return self.value
+
+        if self.kind == Binding.VARIABLE:
+            value = ctx.var(self.id)
+        else:
+            value = ctx.node(self.id).outputs.get(self.output, None)
+
+        # each step reading a stream gets its own reader
+        return value.reader() if isinstance(value, Stream) else value
+
+
+def parse_binding(name: str, value: Any, /) -> Binding:
+    """Parse the input of a step.
+
+    :param name: name of the input
+    :param value: value from the program
+    :return: parsed input
+    """
+    # the value can be a primitive type
+    if not isinstance(value, str):
+        return Binding(name, Binding.LITERAL, value=value)
+
+    # check if the value is a variable
+    match = VAR_REGEX.match(value)
+    if not match:
+        return Binding(name, Binding.LITERAL, value=value)
+
+    if match.group("name") is None:
+        # direct variable
+        return Binding(name, Binding.VARIABLE, id=match.group("id"))
+
+    # node output
+    return Binding(
+        name, Binding.OUTPUT, id=match.group("id"), output=match.group("name")
+    )
+
+
+@dataclass(frozen=True)
+class PlanStep(object):
+    """Step of a program with its node and runner resolved.
+
+    :param call: call of the node from the program
+    :param node: node definition
+    :param runner: runner of the node or **None** for pure nodes
+    :param bindings: pre-parsed inputs
+    :param inputs: input parameters of the node by name
+    :param outputs: output parameters of the node by name
+    :param input_checks: compiled type checkers of inputs by validation
+        policy and name
+    :param output_checks: compiled type checkers of outputs by validation
+        policy and name
+    :param input_converters: converters between lists and arrays of the
+        inputs that need them, see :func:`gada.typing.converter`
+    :param output_converters: same for outputs
+    """
+
+    call: NodeCall
+    node: Node
+    runner: Any
+    bindings: tuple[Binding, ...]
+    inputs: Mapping[str, Param]
+    outputs: Mapping[str, Param]
+    input_checks: Mapping[str, Mapping[str, typing.Checker]]
+    output_checks: Mapping[str, Mapping[str, typing.Checker]]
+    input_converters: Mapping[str, Callable[[Any], Any]]
+    output_converters: Mapping[str, Callable[[Any], Any]]
+
+
+@dataclass(frozen=True)
+class ExecutionPlan(object):
+    """Immutable plan for running the steps of a program.
+
+    :param steps: compiled steps
+    """
+
+    steps: tuple[PlanStep, ...]
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __getitem__(self, index: int) -> PlanStep:
+        return self.steps[index]
+
+    def __iter__(self) -> Iterator[PlanStep]:
+        return iter(self.steps)
+
+    @property
+    def calls(self) -> list[NodeCall]:
+        """Calls of the nodes from the program"""
+        return [_.call for _ in self.steps]
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Hash of the qualified names of the nodes and the bindings of
+        their inputs, plans running other nodes or wired differently have
+        different fingerprints"""
+        from gada import memo
+
+        return memo.stable_hash(
+            [
+                (
+                    memo._qualname(_.node),
+                    _.call.id,
+                    [(b.name, b.kind, b.value, b.id, b.output) for b in _.bindings],
+                )
+                for _ in self.steps
+            ]
+        )
+
+
+def _compile_checks(params: Iterable[Param], /) -> Mapping:
+    """Compile the type checkers of parameters for each validation policy."""
+    return MappingProxyType(
+        {
+            policy: MappingProxyType(
+                {_.name: typing.compile(_.type, policy=policy) for _ in params}
+            )
+            for policy in typing.VALIDATION_POLICIES
+        }
+    )
+
+
+def _compile_converters(params: Iterable[Param], /) -> Mapping:
+    """Get the converters of parameters that need them."""
+    converters = {_.name: typing.converter(_.type) for _ in params}
+    return MappingProxyType({k: v for k, v in converters.items() if v is not None})
+
+
+def compile_step(
+    call: NodeCall,
+    /,
+    *,
+    load_node: Optional[NodeLoader] = None,
+    load_runner: Optional[RunnerLoader] = None,
+) -> PlanStep:
+    """Resolve the node and runner of a single step.
+
+    :param call: call of the node from the program
+    :param load_node: how to load nodes
+    :param load_runner: how to load runners
+    :return: compiled step
+    """
+    load_node = load_node if load_node is not None else default_load_node
+    load_runner = load_runner if load_runner is not None else runners.load
+
+    try:
+        node = load_node(call.name)
+        logger.debug(f"node {node.name} loaded...")
+    except NodeNotFoundError as e:
+        raise Exception(f"node {call.name} not found at line {call.lineno}") from e
+
+    runner = None
+    if not node.is_pure:
+        try:
+            runner = load_runner(node.runner)
+        except Exception as e:
+            raise Exception(
+                f"runner {node.runner} not found for node {node.name}"
+            ) from e
+
+        logger.debug(f"runner {node.runner} loaded...")
+
+    return PlanStep(
+        call=call,
+        node=node,
+        runner=runner,
+        bindings=tuple(parse_binding(k, v) for k, v in call.inputs.items()),
+        inputs=MappingProxyType({_.name: _ for _ in node.inputs}),
+        outputs=MappingProxyType({_.name: _ for _ in node.outputs}),
+        input_checks=_compile_checks(node.inputs),
+        output_checks=_compile_checks(node.outputs),
+        input_converters=_compile_converters(node.inputs),
+        output_converters=_compile_converters(node.outputs),
+    )
+
+
+def compile(
+    calls: list[NodeCall],
+    /,
+    *,
+    load_node: Optional[NodeLoader] = None,
+    load_runner: Optional[RunnerLoader] = None,
+) -> ExecutionPlan:
+    """Resolve the nodes and runners of all the steps of a program.
+
+    :param calls: calls of nodes from the program
+    :param load_node: how to load nodes
+    :param load_runner: how to load runners
+    :return: execution plan
+    """
+    return ExecutionPlan(
+        steps=tuple(
+            compile_step(_, load_node=load_node, load_runner=load_runner) for _ in calls
+        )
+    )
+
+
+@dataclass(frozen=True)
+class Release(object):
+    """Results that are no longer needed once a step has run.
+
+    :param vars: names of variables
+    :param nodes: unique ids of node instances
+    """
+
+    vars: frozenset[str] = frozenset()
+    nodes: frozenset[str] = frozenset()
+
+
+def liveness(
+    plan: ExecutionPlan, /, *, keep: Iterable[str] = ()
+) -> tuple[Release, ...]:
+    r"""Find when variables and node instances are read for the last time.
+
+    .. code-block:: python
+
+        >> from gada import plan, program
+        >> from gada.nodeutil import NodeCall
+        >>
+        >> # "a" outputs "x", "b" reads "{{ a.x }}" and is the program output
+        >> p = program.Program(
+        ..     [
+        ..         NodeCall.from_config({"name": "A", "id": "a"}),
+        ..         NodeCall.from_config(
+        ..             {"name": "B", "id": "b", "inputs": {"in": "{{ a.x }}"}}
+        ..         ),
+        ..     ]
+        .. ).compile()
+        >> releases = plan.liveness(p, keep=["b"])
+        >> releases[0].nodes, releases[1].nodes
+        (frozenset(), frozenset({'a'}))
+        >>
+
+    A variable or node instance is released after the last step reading
+    or writing it, if no later step reads it.
+
+    :param plan: compiled program
+    :param keep: unique ids of node instances to keep until the end
+    :return: for each step, what can be released after it runs
+    """
+    last_var: dict[str, int] = {}
+    last_node: dict[str, int] = {}
+    touched = []
+    for i, step in enumerate(plan):
+        vars = {_.id for _ in step.bindings if _.kind == Binding.VARIABLE}
+        nodes = {_.id for _ in step.bindings if _.kind == Binding.OUTPUT}
+        for name in vars:
+            last_var[name] = i
+        for id in nodes:
+            last_node[id] = i
+
+        if not step.node.is_pure:
+            vars.update(step.outputs)
+        if step.call.id is not None:
+            nodes.add(step.call.id)
+        touched.append((vars, nodes))
+
+    keep = set(keep)
+    return tuple(
+        Release(
+            vars=frozenset(_ for _ in vars if last_var.get(_, -1) <= i),
+            nodes=frozenset(
+                _ for _ in nodes if _ not in keep and last_node.get(_, -1) <= i
+            ),
+        )
+        for i, (vars, nodes) in enumerate(touched)
+    )
+
+
+def readers(plan: ExecutionPlan, /) -> tuple[Mapping[str, int], ...]:
+    r"""Count the next steps reading each output of each step.
+
+    .. code-block:: python
+
+        >> # with the program from the liveness example
+        >> plan.readers(p)
+        (mappingproxy({'x': 1}), mappingproxy({'out': 0}))
+        >>
+
+    A step reads an output while neither the variable nor the node
+    instance holding it is overwritten by another step.
+
+    :param plan: compiled program
+    :return: for each step, number of readers of each of its outputs
+    """
+    counts = [dict.fromkeys(_.outputs, 0) for _ in plan]
+    # last step writing a variable or a node instance
+    var_writers: dict[str, int] = {}
+    node_writers: dict[str, int] = {}
+    for i, step in enumerate(plan):
+        for binding in step.bindings:
+            if binding.kind == Binding.VARIABLE:
+                writer, name = var_writers.get(binding.id), binding.id
+            elif binding.kind == Binding.OUTPUT:
+                writer, name = node_writers.get(binding.id), binding.output
+            else:
+                continue
+
+            if writer is not None and name in counts[writer]:
+                counts[writer][name] += 1
+
+        if not step.node.is_pure:
+            for name in step.outputs:
+                var_writers[name] = i
+        if step.call.id is not None:
+            node_writers[step.call.id] = i
+
+    return tuple(MappingProxyType(_) for _ in counts)
@@ -2,23 +2,30 @@
 from __future__ import annotations
 
 __all__ = ["NodeInstance", "Context", "Program", "from_node", "load"]
-import yaml
-import re
 from dataclasses import dataclass
-from typing import Callable, Optional, Any, Union
+from typing import Optional, Any, Union, Iterable, Iterator, Mapping, Sequence
 from pathlib import Path
-from gada.node import Param, Node, NodeCall, NodePath, NodeNotFoundError
-from gada import runners, typing
+from gada.node import Param, Node, NodeCall, NodePath
+from gada import runners, typing, memo, incremental, checkpoint, _yaml
+from gada.memo import MemoCache
+from gada.incremental import IncrementalState, state_path
+from gada.scope import Scope
+from gada.stream import Stream
+from gada.plan import (
+    NodeLoader,
+    RunnerLoader,
+    ExecutionPlan,
+    PlanStep,
+    Release,
+    liveness,
+    readers,
+    default_load_node,
+    compile_step,
+)
+from gada.plan import compile as compile_plan
 from gada._log import logger
 
 
-NodeLoader = Callable[[str], Node]
-RunnerLoader = Callable[[str], Any]
-
-
-VAR_REGEX = re.compile(r"^\s*\{\s*\{\s*(?P<id>\w+)(\.(?P<name>\w+))?\s*\}\s*\}\s*$")
-
-
 @dataclass
 class NodeInstance(object):
     """Instance of a node that has run.
@@ -61,15 +68,40 @@ class Context(object):
     :param vars: initial global variables
     :param load_node: how to load nodes
     :param load_runner: how to load runners
+    :param plan: compiled steps, nodes and runners are loaded on the fly if
+        not provided
+    :param executor: where runners supporting it run nodes, for example
+        **process** for :mod:`gada.runners.pymodule`
+    :param memo: cache for outputs of deterministic nodes
+    :param incremental: fingerprints and outputs of a previous run, steps
+        with the same fingerprint are not run again
+    :param checkpoint_path: file where the state is checkpointed while running
+    :param checkpoint_every: number of steps between checkpoints
+    :param release: for each step, variables and node instances released
+        after it runs, see :func:`gada.plan.liveness`
+    :param readers: for each step, number of next steps reading each of its
+        outputs, see :func:`gada.plan.readers`, computed on first use if not
+        provided
+    :param validation: how inputs and outputs of nodes are checked, see
+        :func:`gada.typing.validation_policy`
     """
     __slots__ = (
         "_steps",
         "_parent",
         "_sp",
-        "_vars",
+        "_scope",
         "_node_instances",
         "_load_node",
         "_load_runner",
+        "_plan",
+        "_executor",
+        "_memo",
+        "_incremental",
+        "_checkpoint_path",
+        "_checkpoint_every",
+        "_release",
+        "_readers",
+        "_validation",
     )
 
     def __init__(
@@ -81,22 +113,45 @@ class Context(object):
         vars: Optional[dict] = None,
         load_node: Optional[NodeLoader] = None,
         load_runner: Optional[RunnerLoader] = None,
+        plan: Optional[ExecutionPlan] = None,
+        executor: Optional[str] = None,
+        memo: Optional[MemoCache] = None,
+        incremental: Optional[IncrementalState] = None,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        checkpoint_every: int = 1,
+        release: Optional[Sequence[Release]] = None,
+        readers: Optional[Sequence[Mapping[str, int]]] = None,
+        validation: Optional[str] = None,
     ) -> None:
         self._steps: list[NodeCall] = steps if steps is not None else []
         self._parent: Context = parent
         # stack pointer
         self._sp: int = 0
-        # local variables not tied to any node
-        self._vars: dict = vars if vars is not None else {}
+        # local variables not tied to any node, chained to the parent
+        self._scope: Scope = (
+            parent._scope.child(vars) if parent is not None else Scope(vars)
+        )
         # instance of run nodes with results
         self._node_instances: dict[str, NodeInstance] = {}
         # loaders
         self._load_node: NodeLoader = (
-            load_node if load_node is not None else lambda name: NodePath(name).load()
+            load_node if load_node is not None else default_load_node
         )
         self._load_runner: RunnerLoader = (
             load_runner if load_runner is not None else runners.load
         )
+        # steps with resolved nodes and runners
+        self._plan: Optional[ExecutionPlan] = plan
+        self._executor: Optional[str] = executor
+        self._memo: Optional[MemoCache] = memo
+        self._incremental: Optional[IncrementalState] = incremental
+        self._checkpoint_path: Optional[Union[str, Path]] = checkpoint_path
+        self._checkpoint_every: int = max(checkpoint_every, 1)
+        # results to release after each step
+        self._release: Optional[Sequence[Release]] = release
+        # number of readers of each output of each step
+        self._readers: Optional[Sequence[Mapping[str, int]]] = readers
+        self._validation: str = typing.validation_policy(validation)
 
     @property
     def parent(self) -> Optional["Context"]:
@@ -120,13 +175,11 @@ class Context(object):
 
     def locals(self) -> dict:
         """Return the variables stored in this context"""
-        return dict(self._vars)
+        return self._scope.locals()
 
     def vars(self) -> dict:
         """Return the variables stored in this context and the parent"""
-        d = self._parent.vars() if self._parent else {}
-        d.update(self._vars)
-        return d
+        return dict(self._scope)
 
     def local(self, name: str, /) -> Optional[Any]:
         """Return a variable from this context by name.
@@ -134,7 +187,7 @@ class Context(object):
         :param name: name of a variable
         :return: it's value or **None**
         """
-        return self._vars.get(name, None)
+        return self._scope.local(name)
 
     def var(self, name: str, /) -> Optional[Any]:
         """Return a variable from this context or the parent by name.
@@ -142,18 +195,50 @@ class Context(object):
         :param name: name of a variable
         :return: it's value or **None**
         """
-        if name in self._vars:
-            return self._vars[name]
+        return self._scope.get(name)
+
+    def child(self, steps: list[NodeCall], /, **kwargs) -> Context:
+        """Create a context for running steps in a nested scope.
+
+        The child context sees the variables of this context, while its
+        own variables are not visible from this context.
+
+        :param steps: list of nodes
+        :param kwargs: other arguments for the context
+        :return: child context
+        """
+        kwargs.setdefault("load_node", self._load_node)
+        kwargs.setdefault("load_runner", self._load_runner)
+        kwargs.setdefault("executor", self._executor)
+        kwargs.setdefault("memo", self._memo)
+        kwargs.setdefault("validation", self._validation)
+        return Context(steps, parent=self, **kwargs)
+
+    @property
+    def plan(self) -> ExecutionPlan:
+        """Compiled steps, compiled on first access if none were provided"""
+        if self._plan is None:
+            self._plan = compile_plan(
+                self._steps,
+                load_node=self._load_node,
+                load_runner=self._load_runner,
+            )
 
-        return self._parent.var(name) if self._parent else None
+        return self._plan
 
     def node(self, id: str, /) -> Optional[NodeInstance]:
         """Get the instance of a node that has run by it's unique id.
 
+        Nodes that have run in the parent are also visible.
+
         :param id: unique node id
         :return: it's instance or **None**
         """
-        return self._node_instances.get(id, None)
+        instance = self._node_instances.get(id, None)
+        if instance is None and self._parent is not None:
+            return self._parent.node(id)
+
+        return instance
 
     def step(self) -> "Context":
         """Run the next node and stop.
@@ -169,87 +254,381 @@ class Context(object):
         step = self._steps[self._sp]
         logger.debug(f"run node {step.name} at line {step.lineno}...")
 
-        try:
-            node = self._load_node(step.name)
-            logger.debug(f"node {node.name} loaded...")
-        except NodeNotFoundError as e:
-            raise Exception(f"node {step.name} not found at line {step.lineno}") from e
-
-        cxt = self._run(node, step)
+        cxt = self._run(self._resolve(self._sp), self._sp)
+        self._free(self._sp)
         self._sp = self._sp + 1
+        self._autosave()
         return cxt
 
-    def _run(self, node: Node, step: NodeCall, /) -> "Context":
-        if node.is_pure:
-            self._store(node, step, {})
+    async def astep(self) -> "Context":
+        """Run the next node from an event loop and stop.
+
+        Runners implementing **arun** run in the event loop, other runners
+        run in the default executor of the loop.
+
+        :return: **self** or a new context
+        """
+        if self.is_done:
             return self
 
-        try:
-            runner = self._load_runner(node.runner)
-        except Exception as e:
-            raise Exception(
-                f"runner {node.runner} not found for node {node.name}"
-            ) from e
+        step = self._resolve(self._sp)
+        logger.debug(f"run node {step.call.name} at line {step.call.lineno}...")
 
-        logger.debug(f"runner {node.runner} loaded...")
+        self._store(step.node, step.call, await self._aexecute(step, self._sp))
+        self._free(self._sp)
+        self._sp = self._sp + 1
+        self._autosave()
+        return self
+
+    def checkpoint(self, path: Union[str, Path], /) -> None:
+        r"""Save the state of the context after its last completed step.
 
+        .. code-block:: python
+
+            >>> from gada.program import Context
+            >>>
+            >>> ctx = ctx.step()
+            >>> ctx.checkpoint("program.ckpt")
+            >>> ctx = Context.resume("program.ckpt")
+            >>>
+
+        Streams and other values only valid while the program runs can't
+        be checkpointed.
+
+        :param path: destination file
+        """
+        from gada.shm import SharedHandle
+
+        index = {id(call): i for i, call in enumerate(self._steps)}
+        vars = self._scope.locals()
+        nodes = {
+            k: (index[id(v.step)], v.outputs) for k, v in self._node_instances.items()
+        }
+
+        values = [(f"variable {k}", v) for k, v in vars.items()]
+        values.extend(
+            (f"output {k}.{name}", v)
+            for k, (_, outputs) in nodes.items()
+            for name, v in outputs.items()
+        )
+        for what, value in values:
+            if isinstance(value, (Stream, Iterator, memoryview, SharedHandle)):
+                raise Exception(
+                    f"{what} can't be checkpointed, "
+                    f"{type(value).__name__} values are only valid while running"
+                )
+
+        checkpoint.dump(
+            {
+                "sp": self._sp,
+                "vars": vars,
+                "steps": self._steps,
+                "nodes": nodes,
+                "plan": self._plan.fingerprint if self._plan is not None else None,
+            },
+            path,
+        )
+
+    @staticmethod
+    def resume(
+        path: Union[str, Path],
+        /,
+        *,
+        plan: Optional[ExecutionPlan] = None,
+        **kwargs,
+    ) -> Context:
+        """Create a context from a checkpoint.
+
+        The context continues after the last step completed before the
+        checkpoint. When **plan** is given, the checkpoint must be from a
+        context running the same nodes with the same inputs.
+
+        :param path: checkpoint file
+        :param plan: compiled steps of the checkpointed program
+        :param kwargs: other arguments for the context
+        :return: the resumed context
+        """
+        state = checkpoint.load(path)
+        steps = state["steps"]
+        if plan is not None:
+            fingerprint = state.get("plan", None)
+            if [_.name for _ in plan.calls] != [_.name for _ in steps] or (
+                fingerprint is not None and fingerprint != plan.fingerprint
+            ):
+                raise Exception(f"checkpoint {path} is not from this program")
+
+            steps = plan.calls
+
+        ctx = Context(steps, vars=state["vars"], plan=plan, **kwargs)
+        ctx._sp = state["sp"]
+        for k, (i, outputs) in state["nodes"].items():
+            ctx._node_instances[k] = NodeInstance(
+                ctx._resolve(i).node, steps[i], outputs
+            )
+
+        return ctx
+
+    def _free(self, index: int, /) -> None:
+        """Release results that are no longer needed after a step.
+
+        :param index: index of the step that has run
+        """
+        if self._release is None:
+            return
+
+        release = self._release[index]
+        for name in release.vars:
+            self._scope.discard(name)
+        for id in release.nodes:
+            self._node_instances.pop(id, None)
+
+    def _autosave(self) -> None:
+        """Checkpoint the context if enough steps have run."""
+        if self._checkpoint_path is not None and (
+            self._sp % self._checkpoint_every == 0 or self.is_done
+        ):
+            self.checkpoint(self._checkpoint_path)
+
+    def _resolve(self, index: int, /) -> PlanStep:
+        """Get a step with its node and runner resolved.
+
+        :param index: index of the step
+        :return: compiled step
+        """
+        if self._plan is not None:
+            return self._plan[index]
+
+        return compile_step(
+            self._steps[index],
+            load_node=self._load_node,
+            load_runner=self._load_runner,
+        )
+
+    def _run(self, step: PlanStep, index: int, /) -> "Context":
+        self._store(step.node, step.call, self._execute(step, index))
+        return self
+
+    def _execute(self, step: PlanStep, index: int, /) -> dict:
+        """Run a step without storing its outputs.
+
+        :param step: compiled step
+        :param index: index of the step
+        :return: outputs of the node
+        """
+        if step.node.is_pure:
+            return {}
+
+        inputs = self._prepare_inputs(step)
+        keys = self._stored_keys(step, inputs)
+        found, outputs = self._lookup(keys)
+        if found:
+            return outputs
+
+        outputs = step.runner.run(
+            node=step.node, inputs=inputs, **self._runner_options(step)
+        )
+        return self._accept_outputs(step, outputs, index=index, keys=keys)
+
+    async def _aexecute(self, step: PlanStep, index: int, /) -> dict:
+        """Run a step from an event loop without storing its outputs.
+
+        :param step: compiled step
+        :param index: index of the step
+        :return: outputs of the node
+        """
+        if step.node.is_pure:
+            return {}
+
+        inputs = self._prepare_inputs(step)
+        keys = self._stored_keys(step, inputs)
+        found, outputs = self._lookup(keys)
+        if found:
+            return outputs
+
+        outputs = await runners.arun(
+            step.runner, node=step.node, inputs=inputs, **self._runner_options(step)
+        )
+        return self._accept_outputs(step, outputs, index=index, keys=keys)
+
+    def _runner_options(self, step: PlanStep, /) -> dict:
+        """Get additional arguments supported by the runner of a step.
+
+        :param step: compiled step
+        :return: keyword arguments for the runner
+        """
+        if self._executor is not None and self._executor in getattr(
+            step.runner, "EXECUTORS", ()
+        ):
+            return {"executor": self._executor}
+
+        return {}
+
+    def _prepare_inputs(self, step: PlanStep, /) -> dict:
         inputs = self._gather_inputs(step)
         logger.debug(f"node inputs: {inputs}")
-        self._check_node_inputs(node, inputs=inputs)
-        outputs = runner.run(node=node, inputs=inputs)
-        logger.debug(f"node outputs: {outputs}")
-        self._check_node_outputs(node, outputs=outputs)
-        self._store(node, step, outputs)
-        return self
+        return self._check_node_inputs(step, inputs=inputs)
 
-    def _gather_inputs(self, step: NodeCall, /) -> dict:
-        def find_var(value):
-            # the value can be a primitive type
-            if not isinstance(value, str):
-                return value
+    def _accept_outputs(
+        self,
+        step: PlanStep,
+        /,
+        outputs: dict,
+        *,
+        index: int,
+        keys: tuple = (None, None),
+    ) -> dict:
+        logger.debug(f"node outputs: {outputs}")
+        outputs = self._check_node_outputs(step, outputs=outputs, index=index)
+        if not any(isinstance(_, Stream) for _ in outputs.values()):
+            self._remember(keys, outputs)
+        return outputs
+
+    def _stored_keys(
+        self, step: PlanStep, /, inputs: dict
+    ) -> tuple[Optional[str], Optional[str]]:
+        """Get the keys of stored outputs for a step.
+
+        :param step: compiled step
+        :param inputs: resolved inputs
+        :return: memoization key and incremental fingerprint, **None** if
+            outputs are not stored
+        """
+        if self._memo is None and self._incremental is None:
+            return None, None
 
-            # check if the value is a variable
-            match = VAR_REGEX.match(value)
-            if not match:
-                return value
+        # streams can't be hashed without consuming them
+        if any(
+            isinstance(_.type, typing.StreamType) for _ in step.outputs.values()
+        ) or any(isinstance(_, Iterator) for _ in inputs.values()):
+            return None, None
 
-            id = match.group("id")
-            name = match.group("name")
-            if name is None:
-                # direct variable
-                return self.var(id)
+        key = None
+        if self._memo is not None and memo.is_deterministic(step.node):
+            key = memo.key(step.node, inputs)
 
-            # node output
-            return self.node(id).outputs.get(name, None)
+        fingerprint = None
+        if self._incremental is not None:
+            fingerprint = incremental.fingerprint(step, inputs)
 
-        return {k: find_var(v) for k, v in step.inputs.items()}
+        return key, fingerprint
 
-    def _check_node_inputs(self, node: Node, /, inputs: dict) -> None:
-        params = {_.name: _ for _ in node.inputs}
+    def _lookup(self, keys: tuple, /) -> tuple[bool, Any]:
+        """Get stored outputs of a step.
 
+        :param keys: keys from **_stored_keys**
+        :return: if outputs were found and the outputs
+        """
+        key, fingerprint = keys
+        if fingerprint is not None:
+            found, outputs = self._incremental.get(fingerprint)
+            if found:
+                return True, outputs
+
+        if key is not None:
+            found, outputs = self._memo.get(key)
+            if found:
+                if fingerprint is not None:
+                    # outputs come from another run, the step didn't run
+                    self._incremental.set(fingerprint, outputs, executed=False)
+                return True, outputs
+
+        return False, None
+
+    def _remember(self, keys: tuple, /, outputs: dict) -> None:
+        """Store outputs of a step.
+
+        :param keys: keys from **_stored_keys**
+        :param outputs: outputs of the step
+        """
+        key, fingerprint = keys
+        if key is not None:
+            self._memo.set(key, outputs)
+        if fingerprint is not None:
+            self._incremental.set(fingerprint, outputs)
+
+    def _gather_inputs(self, step: PlanStep, /) -> dict:
+        return {_.name: _.resolve(self) for _ in step.bindings}
+
+    def _check_node_inputs(self, step: PlanStep, /, inputs: dict) -> dict:
+        node = step.node
+        checks = step.input_checks[self._validation]
+        converters = step.input_converters
+        if converters:
+            # only for parameters declared as lists or arrays
+            inputs = {
+                k: converters[k](v) if k in converters else v for k, v in inputs.items()
+            }
+
+        checked = inputs
         for k, v in inputs.items():
-            param = params.get(k, None)
-            if param is None:
+            check = checks.get(k, None)
+            if check is None:
                 raise Exception(f"unknown input {node.name}.{k}")
 
-            if not typing.isinstance(v, param.type):
+            param = step.inputs[k]
+            if not check(v):
                 raise Exception(
                     f"invalid input for {node.name}.{k}: expected {param.type}, got {type(v)}"
                 )
 
-    def _check_node_outputs(self, node: Node, /, outputs: dict) -> None:
-        params = {_.name: _ for _ in node.outputs}
+            if isinstance(param.type, typing.StreamType):
+                # items are checked while the node reads them
+                checked = dict(checked) if checked is inputs else checked
+                checked[k] = param.type.check_items(
+                    v, name=f"{node.name}.{k}", policy=self._validation
+                )
 
+        return checked
+
+    def _check_node_outputs(
+        self, step: PlanStep, /, outputs: dict, *, index: int
+    ) -> dict:
+        node = step.node
+        checks = step.output_checks[self._validation]
+        converters = step.output_converters
+        if converters:
+            # only for parameters declared as lists or arrays
+            outputs = {
+                k: converters[k](v) if k in converters else v
+                for k, v in outputs.items()
+            }
+
+        checked = outputs
         for k, v in outputs.items():
-            param = params.get(k, None)
-            if param is None:
+            check = checks.get(k, None)
+            if check is None:
                 raise Exception(f"unknown output {node.name}.{k}")
 
-            if not typing.isinstance(v, param.type):
+            param = step.outputs[k]
+            if not check(v):
                 raise Exception(
                     f"invalid output for {node.name}.{k}: expected {param.type}, got {type(v)}"
                 )
 
+            if isinstance(param.type, typing.StreamType):
+                # items are checked while the next steps read them
+                checked = dict(checked) if checked is outputs else checked
+                checked[k] = Stream(
+                    param.type.check_items(
+                        v, name=f"{node.name}.{k}", policy=self._validation
+                    ),
+                    readers=self._count_readers(index, k),
+                )
+
+        return checked
+
+    def _count_readers(self, index: int, /, name: str) -> int:
+        """Count the next steps reading an output of a step.
+
+        :param index: index of the step
+        :param name: name of the output
+        :return: number of readers
+        """
+        if self._readers is None:
+            self._readers = readers(self.plan)
+
+        return self._readers[index].get(name, 0)
+
     def _store(self, node: Node, step: NodeCall, /, outputs: dict) -> None:
         """Store results of step execution.
 
@@ -262,7 +641,7 @@ class Context(object):
         :param step: run step
         :param outputs: step results
         """
-        self._vars.update(outputs)
+        self._scope.update(outputs)
 
         if step.id is not None:
             self._node_instances[step.id] = NodeInstance(node, step, outputs)
@@ -277,7 +656,16 @@ class Program(object):
     :param outputs: unique id of a node from the program
     """
 
-    __slot__ = ("_name", "_file", "_steps", "_inputs", "_outputs")
+    __slot__ = (
+        "_name",
+        "_file",
+        "_steps",
+        "_inputs",
+        "_outputs",
+        "_plan",
+        "_release",
+        "_readers",
+    )
 
     def __init__(
         self,
@@ -293,6 +681,45 @@ class Program(object):
         self._steps: list[NodeCall] = list(steps) if steps is not None else []
         self._inputs: list[Param] = list(inputs) if inputs is not None else []
         self._outputs = outputs
+        self._plan: Optional[ExecutionPlan] = None
+        # computed once for the cached plan
+        self._release: Optional[tuple[Release, ...]] = None
+        self._readers: Optional[tuple[Mapping[str, int], ...]] = None
+
+    def compile(
+        self,
+        *,
+        load_node: Optional[NodeLoader] = None,
+        load_runner: Optional[RunnerLoader] = None,
+    ) -> ExecutionPlan:
+        r"""Resolve nodes and runners of the program into an execution plan.
+
+        .. code-block:: python
+
+            >>> from gada.program import Program
+            >>>
+            >>> p = Program.from_node("max")
+            >>> plan = p.compile()
+            >>> plan[0].node.name
+            'max'
+            >>>
+
+        The plan compiled with default loaders is cached and reused by
+        **step** and **run**.
+
+        :param load_node: how to load nodes
+        :param load_runner: how to load runners
+        :return: execution plan
+        """
+        if load_node is not None or load_runner is not None:
+            return compile_plan(
+                self._steps, load_node=load_node, load_runner=load_runner
+            )
+
+        if self._plan is None:
+            self._plan = compile_plan(self._steps)
+
+        return self._plan
 
     def step(self, inputs: Optional[dict] = None) -> Context:
         r"""Run a single step of the program.
@@ -311,9 +738,20 @@ class Program(object):
         :param inputs: inputs passed to the program
         :return: a new context for running the program
         """
-        return Context(self._steps, vars=inputs)
+        return Context(self._steps, vars=inputs, plan=self.compile())
 
-    def run(self, inputs: Optional[dict] = None) -> Optional[dict]:
+    def run(
+        self,
+        inputs: Optional[dict] = None,
+        *,
+        workers: Optional[int] = None,
+        incremental: bool = False,
+        checkpoint_every: Optional[int] = None,
+        resume: bool = False,
+        release: bool = False,
+        validation: Optional[str] = None,
+        memo: Optional[MemoCache] = None,
+    ) -> Optional[dict]:
         r"""Run the program until terminated and get its outputs.
 
         .. code-block:: python
@@ -325,12 +763,236 @@ class Program(object):
             {'out': 2}
             >>>
 
+        With more than one **workers**, steps that don't depend on each
+        other are run concurrently, see :mod:`gada.scheduler`.
+
+        In **incremental** mode, steps whose node, inputs and declared
+        files didn't change since the previous run reuse their previous
+        outputs, see :mod:`gada.incremental`.
+
+        With **checkpoint_every**, the state of the program is saved to the
+        data directory every that many steps. With **resume**, a program
+        that failed continues from its last checkpoint instead of running
+        from the start with **inputs**. The checkpoint is removed once the
+        program terminates. Checkpoints can't be combined with more than
+        one **workers**, and programs with stream outputs can't be
+        checkpointed.
+
+        :param inputs: inputs passed to the program
+        :param workers: maximum number of steps running at the same time
+        :param incremental: reuse outputs of unchanged steps
+        :param checkpoint_every: number of steps between checkpoints
+        :param resume: continue from the last checkpoint if any
+        :param release: release variables and outputs of nodes once no
+            step reads them anymore, to lower the memory used by long
+            programs
+        :param validation: how inputs and outputs of nodes are checked, see
+            :func:`gada.typing.validation_policy`
+        :param memo: cache for outputs of deterministic nodes
+        :return: program outputs
+        """
+        state = (
+            IncrementalState(state_path(self._state_name())) if incremental else None
+        )
+        options = self._options(release=release, validation=validation, memo=memo)
+        options["incremental"] = state
+        checkpoint_path = None
+        if checkpoint_every is not None or resume:
+            if workers is not None and workers > 1:
+                raise Exception(
+                    "checkpoints are not supported with more than one worker"
+                )
+
+            checkpoint_path = checkpoint.path(self._state_name())
+            options["checkpoint_path"] = checkpoint_path
+            options["checkpoint_every"] = checkpoint_every or 1
+
+        if resume and checkpoint_path.is_file():
+            logger.debug(f"resume program from {checkpoint_path}...")
+            ctx = Context.resume(checkpoint_path, **options)
+        else:
+            ctx = Context(self._steps, vars=inputs, **options)
+
+        try:
+            if workers is not None and workers > 1:
+                from gada import scheduler
+
+                scheduler.run(ctx, workers=workers)
+
+            while not ctx.is_done:
+                ctx = ctx.step()
+        finally:
+            # keep outputs of steps that ran even if a later step failed
+            if state is not None:
+                state.save()
+
+        if checkpoint_path is not None:
+            checkpoint.remove(checkpoint_path)
+
+        if self._outputs:
+            return ctx.node(self._outputs).outputs
+
+    def _options(
+        self, *, release: bool, validation: Optional[str], memo: Optional[MemoCache]
+    ) -> dict[str, Any]:
+        """Get the arguments of contexts running the cached plan.
+
+        What can be released after each step and the readers of outputs
+        are computed once per plan, not for each run.
+
+        :param release: release variables and outputs of nodes
+        :param validation: how inputs and outputs of nodes are checked
+        :param memo: cache for outputs of deterministic nodes
+        :return: keyword arguments for **Context**
+        """
+        plan = self.compile()
+        if self._readers is None:
+            self._readers = readers(plan)
+
+        options: dict[str, Any] = {
+            "plan": plan,
+            "readers": self._readers,
+            "validation": validation,
+            "memo": memo,
+        }
+        if release:
+            if self._release is None:
+                self._release = liveness(
+                    plan, keep=[self._outputs] if self._outputs else []
+                )
+
+            options["release"] = self._release
+
+        return options
+
+    def _state_name(self) -> str:
+        """Unique name of the program for storing its state.
+
+        Programs without a file are identified by their name and the
+        fingerprint of their plan.
+        """
+        if self._file is not None:
+            return str(Path(self._file).absolute())
+
+        return f"{self._name}:{self.compile().fingerprint}"
+
+    def run_many(
+        self,
+        inputs: Iterable[Optional[dict]],
+        /,
+        *,
+        workers: Optional[int] = None,
+        ordered: bool = True,
+        max_in_flight: Optional[int] = None,
+        memo: Optional[MemoCache] = None,
+    ) -> Iterator[Optional[dict]]:
+        r"""Run the program for each inputs and yield its outputs.
+
+        .. code-block:: python
+
+            >>> from gada.program import Program
+            >>>
+            >>> p = Program.from_node("max")
+            >>> list(p.run_many([{"a": 1, "b": 2}, {"a": 4, "b": 3}]))
+            [{'out': 2}, {'out': 4}]
+            >>>
+
+        The program is compiled once for all the inputs. Variables and
+        outputs of nodes are released once no step reads them anymore, as
+        only the outputs of the program are returned. With more than one
+        **workers**, inputs are run concurrently and at most
+        **max_in_flight** of them are read ahead of the yielded outputs,
+        so that memory usage doesn't depend on the number of inputs.
+
+        :param inputs: iterable of inputs passed to the program
+        :param workers: number of inputs run at the same time
+        :param ordered: yield outputs in the order of inputs or as soon as
+            they are available
+        :param max_in_flight: maximum number of inputs being run, defaults
+            to twice the number of **workers**
+        :param memo: cache for outputs of deterministic nodes, shared by
+            all the inputs
+        :return: program outputs for each inputs
+        """
+        self.compile()
+        if workers is None or workers <= 1:
+            for _ in inputs:
+                yield self.run(_, release=True, memo=memo)
+
+            return
+
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        from collections import deque
+
+        max_in_flight = max(
+            max_in_flight if max_in_flight is not None else 2 * workers, 1
+        )
+
+        # futures in the order of inputs
+        pending: deque = deque()
+
+        def _drain(limit: int) -> Iterator[Optional[dict]]:
+            """Yield outputs until at most **limit** inputs are running."""
+            nonlocal pending
+            while len(pending) > limit:
+                if ordered:
+                    yield pending.popleft().result()
+                    continue
+
+                done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+                pending = deque(_ for _ in pending if _ in not_done)
+                for future in done:
+                    yield future.result()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for _ in inputs:
+                    yield from _drain(max_in_flight - 1)
+                    pending.append(
+                        executor.submit(self.run, _, release=True, memo=memo)
+                    )
+
+                yield from _drain(0)
+            finally:
+                # don't start inputs anymore if the caller stopped iterating
+                for future in pending:
+                    future.cancel()
+
+    async def arun(
+        self,
+        inputs: Optional[dict] = None,
+        *,
+        release: bool = False,
+        validation: Optional[str] = None,
+        memo: Optional[MemoCache] = None,
+    ) -> Optional[dict]:
+        r"""Run the program from an event loop and get its outputs.
+
+        .. code-block:: python
+
+            >>> import asyncio
+            >>> from gada.program import Program
+            >>>
+            >>> p = Program.from_node("max")
+            >>> asyncio.run(p.arun({"a": 1, "b": 2}))
+            {'out': 2}
+            >>>
+
+        Options are the same as for **run**.
+
         :param inputs: inputs passed to the program
+        :param release: release variables and outputs of nodes once no
+            step reads them anymore, to lower the memory used by long
+            programs
+        :param validation: how inputs and outputs of nodes are checked, see
+            :func:`gada.typing.validation_policy`
+        :param memo: cache for outputs of deterministic nodes
         :return: program outputs
         """
-        ctx = Context(self._steps, vars=inputs)
+        options = self._options(release=release, validation=validation, memo=memo)
+        ctx = Context(self._steps, vars=inputs, **options)
         while not ctx.is_done:
-            ctx = ctx.step()
+            ctx = await ctx.astep()
 
         if self._outputs:
             return ctx.node(self._outputs).outputs
@@ -363,7 +1025,10 @@ class Program(object):
         return Program(
             name=config.get("name", None),
             file=config.get("file", None),
-            steps=[NodeCall.from_config(_) for _ in config.get("steps", [])],
+            steps=[
+                NodeCall.from_config({"file": config.get("file", None), **_})
+                for _ in config.get("steps", [])
+            ],
             inputs=[Param.from_config(_) for _ in config.get("inputs", [])],
         )
 
@@ -413,14 +1078,12 @@ class Program(object):
         """
         if isinstance(file, str):
             path = Path(file)
-            with open(file, "r") as f:
-                content = f.read()
+            conf = _yaml.load_file(file)
         elif hasattr(file, "read"):
             path = None
-            content = file.read()
+            conf = _yaml.load(file.read())
         else:
             raise Exception("argument must be a str or filelike object")
 
-        conf = yaml.safe_load(content)
         conf["file"] = path
         return Program.from_config(conf)
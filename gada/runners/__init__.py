@@ -2,13 +2,24 @@
 """Package where runners can be installed as plugins."""
 from __future__ import annotations
 
-__all__ = ["run", "load"]
+__all__ = ["run", "arun", "load", "refresh"]
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from typing import Any, Callable, Optional
+
     from gada.nodeutil import NodeInfo
 
 
+ENTRY_POINTS_GROUP = "gada.runners"
+"""Entry-point group where plugins register runners"""
+
+# runner name -> loader, None until runners are searched
+_RUNNERS: Optional[dict[str, Callable[[], Any]]] = None
+# runner name -> loaded runner
+_LOADED: dict[str, Any] = {}
+
+
 def run(
     node: NodeInfo,
     *,
@@ -31,34 +42,100 @@ def run(
     raise NotImplementedError()
 
 
+async def arun(runner: Any, /, *, node: Any, inputs: dict, **kwargs) -> dict:
+    """Run a node from an event loop.
+
+    Runners can implement ``async def arun(node, inputs)`` to run
+    natively in the event loop. Other runners are called with
+    **run** in the default executor of the loop so they don't block it.
+
+    :param runner: loaded runner
+    :param node: node definition
+    :param inputs: node inputs
+    :param kwargs: additional arguments for the runner
+    :return: node outputs
+    """
+    native = getattr(runner, "arun", None)
+    if native is not None:
+        return await native(node=node, inputs=inputs, **kwargs)
+
+    import asyncio
+    import functools
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, functools.partial(runner.run, node=node, inputs=inputs, **kwargs)
+    )
+
+
+def _scan() -> dict[str, Callable[[], Any]]:
+    """Find runners without importing them.
+
+    Runners are modules of the **gada.runners** namespace or plugins
+    registered in the **gada.runners** entry-point group.
+
+    :return: dict of runner name to loader
+    """
+    import pkgutil
+    import importlib
+    import functools
+    from importlib.metadata import entry_points
+
+    found = {}
+    for mod in pkgutil.iter_modules(__path__, __name__ + "."):
+        found[_normalize(mod.name)] = functools.partial(
+            importlib.import_module, mod.name
+        )
+
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        eps = eps.select(group=ENTRY_POINTS_GROUP)
+    else:
+        eps = eps.get(ENTRY_POINTS_GROUP, [])
+    for ep in eps:
+        found.setdefault(ep.name, ep.load)
+
+    return found
+
+
+def _normalize(name: str, /) -> str:
+    return name[name.rfind(".") + 1 :]
+
+
+def refresh() -> None:
+    """Forget found and loaded runners.
+
+    Runners are searched again on next call to **load**, for example
+    after installing a plugin.
+    """
+    global _RUNNERS
+    _RUNNERS = None
+    _LOADED.clear()
+
+
 def load(name: str):
     """Load a runner registered in **gada.runners**.
 
+    Runners are searched once per process and imported on first use.
+
     This will raise an exception if no runner is found.
 
     :param name: runner name
     :return: runner
     """
-    import sys
-    import pkgutil
-    import importlib
-    import pkg_resources
-    import functools
+    global _RUNNERS
 
-    def iter_namespace(ns_pkg):
-        for finder, _, ispkg in pkgutil.iter_modules(
-            ns_pkg.__path__, ns_pkg.__name__ + "."
-        ):
-            yield _, functools.partial(importlib.import_module, _)
-        for _ in pkg_resources.iter_entry_points("gada.runners"):
-            yield "gada.runners.{}".format(_.name), _.load
+    runner = _LOADED.get(name, None)
+    if runner is not None:
+        return runner
 
-    def normalize(name):
-        return name[name.rfind(".") + 1 :]
+    if _RUNNERS is None:
+        _RUNNERS = _scan()
 
-    # sys.modules[__name__] == this module
-    for _, load in iter_namespace(sys.modules[__name__]):
-        if normalize(_) == name:
-            return load()
+    loader = _RUNNERS.get(name, None)
+    if loader is None:
+        raise Exception("runner {} not found".format(name))
 
-    raise Exception("runner {} not found".format(name))
+    runner = loader()
+    _LOADED[name] = runner
+    return runner
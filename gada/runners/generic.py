@@ -3,12 +3,46 @@
 """
 from __future__ import annotations
 
-__all__ = ["get_bin_path", "get_command_format", "run"]
+__all__ = ["CHUNK_SIZE", "get_bin_path", "get_command_format", "run", "arun"]
 import os
 import sys
-import asyncio
-import importlib
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from asyncio import StreamReader, StreamWriter
+    from typing import Any, IO, Iterable, Iterator
+
+    from gada.node import Node
+
+
+CHUNK_SIZE = 1 << 16
+"""Size of the chunks of binary inputs written to stdin"""
+
+
+def _is_iterable(o: Any, /) -> bool:
+    try:
+        iter(o)
+    except TypeError:
+        return False
+
+    return not isinstance(o, (str, bytes))
+
+
+def _is_buffer(o: Any, /) -> bool:
+    return isinstance(o, (bytes, bytearray, memoryview)) or (
+        type(o).__module__ == "array" and type(o).__name__ == "array"
+    )
+
+
+def _chunks(buffer: Any, /) -> Iterator[memoryview]:
+    """Split a binary input in chunks without copying it.
+
+    :param buffer: bytes-like object
+    :return: views of the chunks
+    """
+    view = memoryview(buffer).cast("B")
+    for i in range(0, view.nbytes, CHUNK_SIZE):
+        yield view[i : i + CHUNK_SIZE]
 
 
 def get_bin_path(bin: str, *, gada_config: dict) -> str:
@@ -60,29 +94,126 @@ def get_command_format() -> str:
 
 
 def run(
-    comp,
+    node: Node,
     *,
-    gada_config: dict,
-    node_config: dict,
+    inputs: Optional[dict] = None,
+    gada_config: Optional[dict] = None,
     argv: Optional[list[str]] = None,
-    stdin=None,
-    stdout=None,
-    stderr=None,
-):
+    stdin: Any = None,
+    stdout: Optional[IO[bytes]] = None,
+    stderr: Optional[IO[bytes]] = None,
+) -> dict:
     """Run a generic command:
 
-    :param comp: loaded component
-    :param gada_config: gada configuration
-    :param node_config: node configuration
+    This blocks until the command terminates, the command itself is run
+    with asyncio so that its input and output streams are piped
+    concurrently.
+
+    The input **stdin** of the node, such as a stream or binary data, is
+    written to the stdin of the command. The input **argv** is a list of
+    additional CLI arguments. An exception is raised if the command exits
+    with a non-zero code.
+
+    :param node: node definition
+    :param inputs: node inputs
+    :param gada_config: gada configuration, loaded from the data directory
+        by default
+    :param argv: additional CLI arguments
+    :param stdin: input stream
+    :param stdout: output stream
+    :param stderr: error stream
+    :return: node outputs
+    """
+    import asyncio
+
+    return asyncio.run(
+        _arun_command(
+            node,
+            inputs=inputs,
+            gada_config=gada_config,
+            argv=argv,
+            stdin=stdin,
+            stdout=stdout,
+            stderr=stderr,
+        )
+    )
+
+
+async def arun(
+    node: Node,
+    *,
+    inputs: Optional[dict] = None,
+    gada_config: Optional[dict] = None,
+    argv: Optional[list[str]] = None,
+    stdin: Any = None,
+    stdout: Optional[IO[bytes]] = None,
+    stderr: Optional[IO[bytes]] = None,
+) -> dict:
+    """Run a generic command from an event loop.
+
+    Same as **run**, but the command runs in the running event loop
+    instead of a new one.
+
+    :param node: node definition
+    :param inputs: node inputs
+    :param gada_config: gada configuration, loaded from the data directory
+        by default
     :param argv: additional CLI arguments
     :param stdin: input stream
     :param stdout: output stream
     :param stderr: error stream
+    :return: node outputs
     """
-    argv = " ".join(argv) if argv is not None else ""
+    return await _arun_command(
+        node,
+        inputs=inputs,
+        gada_config=gada_config,
+        argv=argv,
+        stdin=stdin,
+        stdout=stdout,
+        stderr=stderr,
+    )
+
+
+async def _arun_command(
+    node: Node,
+    *,
+    inputs: Optional[dict] = None,
+    gada_config: Optional[dict] = None,
+    argv: Optional[list[str]] = None,
+    stdin: Any = None,
+    stdout: Optional[IO[bytes]] = None,
+    stderr: Optional[IO[bytes]] = None,
+) -> dict:
+    """Run a generic command from an event loop:
+
+    :param node: node definition
+    :param inputs: node inputs
+    :param gada_config: gada configuration, loaded from the data directory
+        by default
+    :param argv: additional CLI arguments
+    :param stdin: input stream, a bytes-like object, or an iterable of bytes
+        or lines fed to the command
+    :param stdout: output stream
+    :param stderr: error stream
+    :return: node outputs
+    """
+    import asyncio
+
+    inputs = inputs if inputs is not None else {}
+    args = list(argv) if argv is not None else []
+    args.extend(str(_) for _ in inputs.get("argv", None) or [])
+    argv_str = " ".join(args)
+    stdin = inputs.get("stdin", stdin)
     stdin = stdin if stdin is not None else sys.stdin
-    stdout = stdout if stdout is not None else sys.stdout.buffer
-    stderr = stderr if stderr is not None else sys.stderr.buffer
+    out: IO[bytes] = stdout if stdout is not None else sys.stdout.buffer
+    err: IO[bytes] = stderr if stderr is not None else sys.stderr.buffer
+
+    node_config: dict[str, Any] = dict(node.config)
+    if gada_config is None:
+        from gada import datadir
+
+        gada_config = datadir.load_config()
 
     if "bin" not in node_config:
         raise Exception("missing bin in configuration")
@@ -97,19 +228,23 @@ def run(
     command = command.replace(r"${bin}", bin_path)
     command = command.replace(
         r"${argv}",
-        node_config["argv"].replace(r"${argv}", argv)
+        node_config["argv"].replace(r"${argv}", argv_str)
         if "argv" in node_config
-        else argv,
+        else argv_str,
     )
-    command = command.replace(r"${comp_dir}", component.get_dir(comp))
+    package_info = getattr(node, "package_info", None)
+    if package_info is not None:
+        command = command.replace(
+            r"${comp_dir}", str(package_info.gada_yml_path.parent)
+        )
 
-    async def _pipe(_stdin, _stdout):
+    async def _pipe(_stdin: Optional[StreamReader], _stdout: IO[bytes]) -> None:
         """Pipe content of stdin to stdout until EOF.
 
         :param stdin: input stream
         :param stdout: output stream
         """
-        while True:
+        while _stdin is not None:
             line = await _stdin.readline()
             if not line:
                 return
@@ -117,8 +252,61 @@ def run(
             _stdout.write(line)
             _stdout.flush()
 
-    async def _run_subprocess():
-        """Run a subprocess."""
+    async def _feed(
+        _items: Iterable[Any], _stdin: Optional[StreamWriter], *, _blocking: bool
+    ) -> None:
+        """Write items of an iterable to stdin until exhausted.
+
+        Items are pulled in the default executor, as producing them may
+        block the event loop. Errors raised while producing items are
+        propagated, as the command would otherwise run on truncated inputs.
+
+        :param items: bytes, or values written as lines
+        :param stdin: input stream
+        :param blocking: if producing items may block
+        """
+        if _stdin is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        it = iter(_items)
+        done = object()
+        try:
+            while True:
+                item = (
+                    await loop.run_in_executor(None, next, it, done)
+                    if _blocking
+                    else next(it, done)
+                )
+                if item is done:
+                    break
+
+                _stdin.write(
+                    item
+                    if isinstance(item, (bytes, memoryview))
+                    else f"{item}\n".encode()
+                )
+                await _stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            _stdin.close()
+
+    # iterables such as streams are fed to stdin while the command runs,
+    # binary inputs are written by chunks without copying them
+    items: Optional[Iterable[Any]] = None
+    blocking = True
+    if _is_buffer(stdin):
+        items, stdin = _chunks(stdin), asyncio.subprocess.PIPE
+        blocking = False
+    elif not hasattr(stdin, "fileno") and _is_iterable(stdin):
+        items, stdin = stdin, asyncio.subprocess.PIPE
+
+    async def _run_subprocess() -> int:
+        """Run a subprocess.
+
+        :return: exit code of the command
+        """
         proc = await asyncio.create_subprocess_shell(
             command,
             env=env,
@@ -128,13 +316,26 @@ def run(
             stderr=asyncio.subprocess.PIPE,
         )
 
-        await asyncio.wait(
-            [
-                asyncio.create_task(_pipe(proc.stdout, stdout)),
-                asyncio.create_task(_pipe(proc.stderr, stderr)),
-                asyncio.create_task(proc.wait()),
-            ],
-            return_when=asyncio.ALL_COMPLETED,
-        )
+        tasks: list[asyncio.Task[Any]] = [
+            asyncio.create_task(_pipe(proc.stdout, out)),
+            asyncio.create_task(_pipe(proc.stderr, err)),
+            asyncio.create_task(proc.wait()),
+        ]
+        if items is not None:
+            tasks.append(
+                asyncio.create_task(_feed(items, proc.stdin, _blocking=blocking))
+            )
+
+        # wait for the command to terminate before raising the first error,
+        # closing stdin on errors lets it terminate
+        await asyncio.wait(tasks, return_when=asyncio.ALL_COMPLETED)
+        for task in tasks:
+            task.result()
+
+        return await proc.wait()
+
+    code = await _run_subprocess()
+    if code != 0:
+        raise Exception(f"command {command} exited with code {code}")
 
-    asyncio.run(_run_subprocess())
+    return {}
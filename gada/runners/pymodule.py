@@ -1,19 +1,59 @@
 """Run nodes from Python modules.
+
+Entrypoints are called in the current process by default. CPU-bound nodes
+can instead be run in a pool of worker processes, so that several nodes
+don't serialize on the GIL:
+
+.. code-block:: yaml
+
+    nodes:
+    - name: heavy
+      runner: pymodule
+      entrypoint: mypackage.heavy
+      executor: process
+
+The executor can also be selected for all the nodes run by a
+:class:`gada.program.Context`. Workers import each module once and are
+replaced after running **MAX_TASKS_PER_CHILD** nodes.
+
+Large binary inputs and outputs, such as ``bytes`` or ``array.array``, are
+exchanged with workers through shared memory instead of being pickled,
+see :mod:`gada.shm`. They are received as read-only ``memoryview`` of the
+shared memory, both by workers and by the process collecting outputs.
 """
 from __future__ import annotations
 
-__all__ = ["run"]
+__all__ = ["EXECUTORS", "run", "configure", "shutdown"]
 from typing import TYPE_CHECKING
 from pathlib import Path
-import yaml
-import jsonschema
+import threading
+from gada import _schema, shm
 
 if TYPE_CHECKING:
-    from typing import Any
+    from types import ModuleType
+    from typing import Any, Callable, Mapping, Optional
+    from concurrent.futures import Executor, Future
     from gada.nodeutil import NodeInfo
 
 
-def _load_module(name: str):
+EXECUTORS = ("inline", "process")
+"""Supported executors"""
+
+MAX_TASKS_PER_CHILD = 100
+"""Default number of nodes run by a worker process before it is replaced"""
+
+_POOL_LOCK = threading.Lock()
+# pool of worker processes, created on first use
+_POOL: Optional[Executor] = None
+# nodes submitted to the current pool
+_POOL_TASKS: int = 0
+_POOL_WORKERS: Optional[int] = None
+_POOL_MAX_TASKS_PER_CHILD: int = MAX_TASKS_PER_CHILD
+# entrypoint -> function, per worker process
+_ENTRYPOINTS: dict[str, Callable[..., Any]] = {}
+
+
+def _load_module(name: str) -> ModuleType:
     try:
         import importlib
 
@@ -22,29 +62,194 @@ def _load_module(name: str):
         raise Exception(f"failed to import module {name}") from e
 
 
-def _load_schema() -> dict[str, Any]:
-    """Load the JSON schema for gada.yml files."""
-    with open(Path(__file__).parent / "pymodule.schema") as f:
-        return yaml.safe_load(f)
+_SCHEMA_PATH = Path(__file__).parent / "pymodule.schema"
 
 
-def run(node: NodeInfo, *, inputs: dict) -> dict:
-    r"""Run a node contained in a Python module.
+def _load_entrypoint(entrypoint: str, /) -> Callable[..., Any]:
+    """Import the function called by a node.
 
-    :param node: node definition
-    :param inputs: node inputs
-    :return: node outputs
+    :param entrypoint: full name of the function
+    :return: function
     """
-    jsonschema.validate(node.config, _load_schema())
-    entrypoint = node.config.get("entrypoint", "").split(".")
+    fun = _ENTRYPOINTS.get(entrypoint, None)
+    if fun is not None:
+        return fun
+
+    path = entrypoint.split(".")
 
     # Load module if explicitely configured
-    mod = _load_module(".".join(entrypoint[:-1]))
+    mod = _load_module(".".join(path[:-1]))
 
     # Check the entrypoint exists
-    fun = getattr(mod, entrypoint[-1], None)
+    fun = getattr(mod, path[-1], None)
     if not fun:
-        raise Exception(f"module {mod.__name__} has no entrypoint {entrypoint}")
+        raise Exception(f"module {mod.__name__} has no entrypoint {path}")
+
+    _ENTRYPOINTS[entrypoint] = fun
+    return fun
+
+
+def _call_in_worker(entrypoint: str, payload: bytes, /) -> bytes:
+    """Call an entrypoint from a worker process.
+
+    Inputs and outputs are pickled explicitly to report which of them
+    can't be exchanged with the worker.
+
+    :param entrypoint: full name of the function
+    :param payload: pickled inputs
+    :return: pickled outputs
+    """
+    import pickle
+
+    inputs = pickle.loads(payload)
+    # map inputs placed in shared memory
+    mapped = []
+    for k, v in inputs.items():
+        if isinstance(v, shm.SharedHandle):
+            mapped.append(shm.attach(v))
+            inputs[k] = mapped[-1].view
+
+    try:
+        outputs = _load_entrypoint(entrypoint)(**inputs)
+        if isinstance(outputs, dict):
+            outputs = {
+                k: shm.share(v) if shm.is_shareable(v) else v
+                for k, v in outputs.items()
+            }
+
+        try:
+            return pickle.dumps(outputs)
+        except Exception as e:
+            raise Exception(
+                f"outputs of entrypoint {entrypoint} can't be sent back from a "
+                f"worker process: {e}"
+            ) from None
+    finally:
+        del inputs
+        for _ in mapped:
+            _.close()
+
+
+def configure(
+    *, workers: Optional[int] = None, max_tasks_per_child: Optional[int] = None
+) -> None:
+    """Configure the pool of worker processes.
+
+    The current pool is shut down and a new one is created on next use.
+
+    :param workers: number of worker processes, defaults to the number of CPUs
+    :param max_tasks_per_child: nodes run by a worker before it is replaced
+    """
+    global _POOL_WORKERS, _POOL_MAX_TASKS_PER_CHILD
+    shutdown()
+    _POOL_WORKERS = workers
+    _POOL_MAX_TASKS_PER_CHILD = (
+        max_tasks_per_child if max_tasks_per_child is not None else MAX_TASKS_PER_CHILD
+    )
+
+
+def shutdown() -> None:
+    """Stop the worker processes.
+
+    A new pool is created on next use.
+    """
+    global _POOL, _POOL_TASKS
+    with _POOL_LOCK:
+        pool, _POOL, _POOL_TASKS = _POOL, None, 0
+
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _submit(entrypoint: str, payload: bytes, /) -> Future[bytes]:
+    """Submit a node to the pool of worker processes.
+
+    :param entrypoint: full name of the function
+    :param payload: pickled inputs
+    :return: future of pickled outputs
+    """
+    import sys
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _POOL, _POOL_TASKS
+    with _POOL_LOCK:
+        workers = _POOL_WORKERS if _POOL_WORKERS is not None else os.cpu_count() or 1
+        if sys.version_info >= (3, 11):
+            # workers are replaced one by one
+            if _POOL is None:
+                _POOL = ProcessPoolExecutor(
+                    max_workers=workers,
+                    max_tasks_per_child=_POOL_MAX_TASKS_PER_CHILD,
+                )
+        elif _POOL is None or _POOL_TASKS >= _POOL_MAX_TASKS_PER_CHILD * workers:
+            # replace the whole pool once workers ran enough nodes on average
+            if _POOL is not None:
+                _POOL.shutdown(wait=False)
+            _POOL = ProcessPoolExecutor(max_workers=workers)
+            _POOL_TASKS = 0
+
+        _POOL_TASKS += 1
+        return _POOL.submit(_call_in_worker, entrypoint, payload)
+
+
+def _run_in_process(node: NodeInfo, entrypoint: str, inputs: dict, /) -> dict:
+    """Run a node in a worker process.
+
+    :param node: node definition
+    :param entrypoint: full name of the function
+    :param inputs: node inputs
+    :return: node outputs
+    """
+    import pickle
+
+    # large buffers are sent as handles to shared memory
+    handles = {k: shm.export(v) for k, v in inputs.items() if shm.is_shareable(v)}
+    try:
+        try:
+            payload = pickle.dumps({**inputs, **handles})
+        except Exception as e:
+            name = node.config["name"]
+            raise Exception(
+                f"inputs of node {name} can't be sent to a worker process: {e}"
+            ) from None
+
+        outputs = pickle.loads(_submit(entrypoint, payload).result())
+    finally:
+        for _ in handles.values():
+            shm.release(_)
+
+    if not isinstance(outputs, dict):
+        return outputs
+
+    return {
+        k: shm.take(v) if isinstance(v, shm.SharedHandle) else v
+        for k, v in outputs.items()
+    }
+
+
+def run(node: NodeInfo, *, inputs: dict, executor: Optional[str] = None) -> dict:
+    r"""Run a node contained in a Python module.
+
+    The **executor** configured for the node takes precedence over the
+    one passed to this function.
+
+    :param node: node definition
+    :param inputs: node inputs
+    :param executor: **inline** or **process**, defaults to **inline**
+    :return: node outputs
+    """
+    # options of this runner are not part of the common node configuration
+    config: Mapping[str, Any] = node.config
+    _schema.validate(config, _SCHEMA_PATH)
+    entrypoint: str = config.get("entrypoint", "")
+    executor = config.get("executor", executor if executor is not None else "inline")
+    if executor not in EXECUTORS:
+        name = config["name"]
+        raise Exception(f"unknown executor {executor} for node {name}")
+
+    if executor == "process":
+        return _run_in_process(node, entrypoint, inputs)
 
     # Call entrypoint
-    return fun(**inputs)
+    return _load_entrypoint(entrypoint)(**inputs)
@@ -0,0 +1,175 @@
+"""Run independent steps of a program concurrently.
+
+Steps of a program communicate through variables and node outputs. A step
+reading ``{{ var }}`` or ``{{ id.name }}`` depends on the last step before
+it writing that variable or having that id. To keep results identical to
+sequential execution, a step writing a variable or an id also waits for
+the previous writers and readers of it.
+
+Steps whose dependencies have run are dispatched to a thread pool, so the
+wall-clock time of a program approaches the time of its critical path.
+"""
+from __future__ import annotations
+
+__all__ = ["dependencies", "run"]
+from typing import TYPE_CHECKING
+from gada.plan import Binding
+from gada._log import logger
+
+if TYPE_CHECKING:
+    from typing import Optional
+
+    from gada.plan import ExecutionPlan
+    from gada.program import Context
+
+
+def dependencies(plan: ExecutionPlan, /, start: int = 0) -> list[set[int]]:
+    r"""Get the steps each step of a plan depends on.
+
+    .. code-block:: python
+
+        >> from gada import program, scheduler
+        >> from gada.nodeutil import NodeCall
+        >>
+        >> # "a" outputs "x", "b" reads "{{ a.x }}", "c" outputs "y"
+        >> plan = program.Program(
+        ..     [
+        ..         NodeCall.from_config({"name": "A", "id": "a"}),
+        ..         NodeCall.from_config(
+        ..             {"name": "B", "id": "b", "inputs": {"in": "{{ a.x }}"}}
+        ..         ),
+        ..         NodeCall.from_config({"name": "C", "id": "c"}),
+        ..     ]
+        .. ).compile()
+        >> scheduler.dependencies(plan)
+        [set(), {0}, set()]
+        >>
+
+    Variables written by a step are the declared outputs of its node.
+
+    :param plan: compiled program
+    :param start: index of the first step to schedule
+    :return: for each step, indices of the steps it must wait for
+    """
+    # last step writing a variable or an id
+    var_writers: dict[str, int] = {}
+    id_writers: dict[str, int] = {}
+    # steps reading a variable or an id since its last write
+    var_readers: dict[str, list[int]] = {}
+    id_readers: dict[str, list[int]] = {}
+
+    deps: list[set[int]] = []
+    for i in range(start, len(plan)):
+        step = plan[i]
+        reads_vars = {_.id for _ in step.bindings if _.kind == Binding.VARIABLE}
+        reads_ids = {_.id for _ in step.bindings if _.kind == Binding.OUTPUT}
+        writes_vars = set() if step.node.is_pure else set(step.outputs)
+        writes_id = step.call.id
+
+        after: set[int] = set()
+        # read after write
+        after.update(var_writers[_] for _ in reads_vars if _ in var_writers)
+        after.update(id_writers[_] for _ in reads_ids if _ in id_writers)
+        # write after write and write after read
+        for name in writes_vars:
+            if name in var_writers:
+                after.add(var_writers[name])
+            after.update(var_readers.get(name, []))
+        if writes_id is not None:
+            if writes_id in id_writers:
+                after.add(id_writers[writes_id])
+            after.update(id_readers.get(writes_id, []))
+
+        after.discard(i)
+        deps.append({_ - start for _ in after})
+
+        for name in reads_vars:
+            var_readers.setdefault(name, []).append(i)
+        for name in reads_ids:
+            id_readers.setdefault(name, []).append(i)
+        for name in writes_vars:
+            var_writers[name] = i
+            var_readers[name] = []
+        if writes_id is not None:
+            id_writers[writes_id] = i
+            id_readers[writes_id] = []
+
+    return deps
+
+
+def run(ctx: Context, /, *, workers: Optional[int] = None) -> Context:
+    """Run the remaining steps of a context concurrently.
+
+    Runners are called from a thread pool while outputs are stored from
+    the calling thread, in an order compatible with sequential execution.
+    If a step fails, no new step is started and the error is raised once
+    running steps are done.
+
+    Contexts saving checkpoints are not supported, as completed steps
+    don't form a prefix of the program while others are running.
+
+    :param ctx: context to run
+    :param workers: maximum number of steps running at the same time
+    :return: the context once done
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    if ctx._checkpoint_path is not None:
+        raise Exception("checkpoints are not supported with concurrent steps")
+
+    if ctx.is_done:
+        return ctx
+
+    plan = ctx.plan
+    start = ctx._sp
+    deps = dependencies(plan, start)
+    dependents: list[list[int]] = [[] for _ in deps]
+    for i, after in enumerate(deps):
+        for j in after:
+            dependents[j].append(i)
+
+    waiting = [len(_) for _ in deps]
+    ready = [i for i, count in enumerate(waiting) if count == 0]
+    running = {}
+    # results are released once all the previous steps are done, as steps
+    # reading the same results can complete out of order
+    done_steps = [False] * len(deps)
+    released = 0
+    error: Optional[BaseException] = None
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while ready or running:
+            while ready and error is None:
+                i = ready.pop(0)
+                step = plan[start + i]
+                logger.debug(f"run node {step.call.name} at line {step.call.lineno}...")
+                running[executor.submit(ctx._execute, step, start + i)] = i
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=running.get):
+                i = running.pop(future)
+                if future.exception() is not None:
+                    error = error if error is not None else future.exception()
+                    continue
+
+                step = plan[start + i]
+                ctx._store(step.node, step.call, future.result())
+                done_steps[i] = True
+                while released < len(done_steps) and done_steps[released]:
+                    ctx._free(start + released)
+                    released += 1
+
+                for j in dependents[i]:
+                    waiting[j] -= 1
+                    if waiting[j] == 0:
+                        ready.append(j)
+
+            ready.sort()
+
+    if error is not None:
+        raise error
+
+    ctx._sp = len(plan)
+    return ctx
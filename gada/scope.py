@@ -0,0 +1,205 @@
+"""Chained scopes storing the variables of running programs.
+
+Branches and loops run in child scopes that see the variables of their
+parents. Instead of walking the chain of parents on each lookup, a scope
+caches a merged view of itself and its ancestors:
+
+* Looking up a variable is a lookup in the local variables and in the
+  cached view of the parent, O(1) amortized.
+* Creating a child scope doesn't copy anything.
+* Writing to a scope invalidates its own view. Views of descendants are
+  only invalidated when writing to a scope that has children, so loop
+  bodies writing to their own scope stay cheap.
+
+**snapshot** returns a read-only view of all the variables that is never
+modified afterward: the next write to the scope builds a new view instead
+of modifying the snapshotted one.
+"""
+from __future__ import annotations
+
+__all__ = ["Scope"]
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Iterator, Optional
+
+
+class Scope(Mapping):
+    r"""Variables of a scope chained to the variables of its parents.
+
+    .. code-block:: python
+
+        >>> from gada.scope import Scope
+        >>>
+        >>> root = Scope({"a": 1, "b": 2})
+        >>> child = root.child({"b": 3})
+        >>> child["a"], child["b"]
+        (1, 3)
+        >>> child.snapshot() == {"a": 1, "b": 3}
+        True
+        >>>
+
+    :param vars: initial local variables, copied
+    :param parent: parent scope
+    """
+
+    __slots__ = (
+        "_parent",
+        "_locals",
+        "_frozen",
+        "_epoch",
+        "_has_children",
+        "_view_cache",
+        "_view_epoch",
+    )
+
+    def __init__(
+        self, vars: Optional[Mapping] = None, /, *, parent: Optional[Scope] = None
+    ) -> None:
+        self._parent: Optional[Scope] = parent
+        self._locals: dict = dict(vars) if vars else {}
+        # if locals are shared with a snapshot and must be copied on write
+        self._frozen: bool = False
+        # counter shared by the whole chain, incremented when a scope with
+        # children is modified
+        self._epoch: list[int] = parent._epoch if parent is not None else [0]
+        self._has_children: bool = False
+        # merged variables of this scope and its ancestors
+        self._view_cache: Optional[dict] = None
+        self._view_epoch: int = -1
+
+    @property
+    def parent(self) -> Optional[Scope]:
+        """Parent scope or **None**"""
+        return self._parent
+
+    def child(self, vars: Optional[Mapping] = None, /) -> Scope:
+        """Create a child scope.
+
+        :param vars: initial local variables of the child
+        :return: child scope
+        """
+        self._has_children = True
+        return Scope(vars, parent=self)
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self._locals:
+            return self._locals[name]
+
+        if self._parent is None:
+            raise KeyError(name)
+
+        return self._parent._view()[name]
+
+    def __contains__(self, name: object) -> bool:
+        if name in self._locals:
+            return True
+
+        return self._parent is not None and name in self._parent._view()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._view())
+
+    def __len__(self) -> int:
+        return len(self._view())
+
+    def __repr__(self) -> str:
+        return f"Scope({self._view()!r})"
+
+    def get(self, name: str, default: Any = None, /) -> Any:
+        """Get a variable from this scope or its parents.
+
+        :param name: name of the variable
+        :param default: value if the variable doesn't exist
+        :return: its value or **default**
+        """
+        if name in self._locals:
+            return self._locals[name]
+
+        if self._parent is None:
+            return default
+
+        return self._parent._view().get(name, default)
+
+    def local(self, name: str, default: Any = None, /) -> Any:
+        """Get a variable from this scope only.
+
+        :param name: name of the variable
+        :param default: value if the variable doesn't exist
+        :return: its value or **default**
+        """
+        return self._locals.get(name, default)
+
+    def locals(self) -> dict:
+        """Get a copy of the variables of this scope only.
+
+        :return: local variables
+        """
+        return dict(self._locals)
+
+    def snapshot(self) -> Mapping:
+        """Get a read-only view of the variables of this scope and its parents.
+
+        The view is not affected by later modifications of the scopes.
+
+        :return: all variables
+        """
+        view = self._view()
+        if view is self._locals:
+            self._frozen = True
+
+        return MappingProxyType(view)
+
+    def set(self, name: str, value: Any, /) -> None:
+        """Set a variable of this scope.
+
+        :param name: name of the variable
+        :param value: its value
+        """
+        self._writable()[name] = value
+
+    def update(self, vars: Mapping, /) -> None:
+        """Set several variables of this scope.
+
+        :param vars: variables to set
+        """
+        if vars:
+            self._writable().update(vars)
+
+    def discard(self, name: str, /) -> None:
+        """Remove a variable of this scope if it exists.
+
+        :param name: name of the variable
+        """
+        if name in self._locals:
+            del self._writable()[name]
+
+    def _writable(self) -> dict:
+        """Get local variables for modifying them."""
+        if self._frozen:
+            self._locals = dict(self._locals)
+            self._frozen = False
+
+        self._view_cache = None
+        if self._has_children:
+            self._epoch[0] += 1
+
+        return self._locals
+
+    def _view(self) -> dict:
+        """Get merged variables of this scope and its ancestors.
+
+        The returned dict must not be modified.
+        """
+        if self._parent is None:
+            return self._locals
+
+        if self._view_cache is None or self._view_epoch != self._epoch[0]:
+            view = dict(self._parent._view())
+            view.update(self._locals)
+            self._view_cache = view
+            self._view_epoch = self._epoch[0]
+
+        return self._view_cache
@@ -0,0 +1,266 @@
+"""Shared-memory transfer of large binary values between processes.
+
+Values such as ``bytes``, ``bytearray``, ``memoryview`` or ``array.array``
+larger than **THRESHOLD** bytes are copied once into a named shared-memory
+segment and replaced by a small **SharedHandle** before being sent to a
+worker process. The worker maps the segment and gets a read-only
+``memoryview`` of the value without copying it.
+
+Segments are reference counted in the process that created them: the
+same object sent to several workers is placed in a single segment, which
+is removed when the last of them is done.
+
+Values sent back by a worker are placed in a segment with **share**, and
+the receiver maps it with **take**. The segment is removed once the views
+of the value are garbage collected, so outputs are not copied either.
+"""
+from __future__ import annotations
+
+__all__ = [
+    "THRESHOLD",
+    "SharedHandle",
+    "is_shareable",
+    "export",
+    "release",
+    "attach",
+    "share",
+    "take",
+]
+from typing import TYPE_CHECKING
+import os
+import sys
+import threading
+from dataclasses import dataclass
+
+if TYPE_CHECKING:
+    from typing import Any, Optional
+
+
+THRESHOLD = int(os.environ.get("GADA_SHM_THRESHOLD", 1 << 20))
+"""Size in bytes from which values are transferred through shared memory"""
+
+# formats that can be restored with memoryview.cast
+_FORMATS = set("bBhHiIlLqQnNfd?")
+
+_LOCK = threading.Lock()
+# id of exported object -> [object, segment, handle, references]
+_EXPORTED: dict[int, list] = {}
+
+
+@dataclass(frozen=True)
+class SharedHandle(object):
+    """Reference to a value placed in a shared-memory segment.
+
+    :param name: name of the segment
+    :param nbytes: size of the value
+    :param format: struct format of the items, as for ``memoryview.cast``
+    """
+
+    name: str
+    nbytes: int
+    format: str = "B"
+
+
+def _is_array(value: Any, /) -> bool:
+    return type(value).__module__ == "array" and type(value).__name__ == "array"
+
+
+def is_shareable(value: Any, /, *, threshold: Optional[int] = None) -> bool:
+    """Check if a value should be transferred through shared memory.
+
+    :param value: value to check
+    :param threshold: minimum size in bytes, defaults to **THRESHOLD**
+    :return: if **value** is a large enough contiguous buffer
+    """
+    if not isinstance(value, (bytes, bytearray, memoryview)) and not _is_array(value):
+        return False
+
+    view = memoryview(value)
+    threshold = threshold if threshold is not None else THRESHOLD
+    return view.c_contiguous and view.nbytes >= threshold
+
+
+def _create(value: Any, /) -> tuple[Any, SharedHandle]:
+    """Copy a value to a new segment.
+
+    :param value: contiguous buffer
+    :return: segment and its handle
+    """
+    from multiprocessing.shared_memory import SharedMemory
+
+    view = memoryview(value)
+    format = view.format.lstrip("@")
+    data = view.cast("B") if view.format != "B" or view.ndim != 1 else view
+    segment: Any = SharedMemory(create=True, size=max(data.nbytes, 1))
+    segment.buf[: data.nbytes] = data
+    return segment, SharedHandle(
+        segment.name, data.nbytes, format=format if format in _FORMATS else "B"
+    )
+
+
+def export(value: Any, /) -> SharedHandle:
+    r"""Place a value in shared memory.
+
+    .. code-block:: python
+
+        >>> from gada import shm
+        >>>
+        >>> data = b"x" * 2_000_000
+        >>> handle = shm.export(data)
+        >>> with shm.attach(handle) as view:
+        ...     bytes(view[:3])
+        ...
+        b'xxx'
+        >>> shm.release(handle)
+        >>>
+
+    Exporting the same object again reuses its segment. Each export
+    must be paired with a **release**.
+
+    :param value: contiguous buffer
+    :return: handle to send to other processes
+    """
+    with _LOCK:
+        entry = _EXPORTED.get(id(value), None)
+        if entry is not None and entry[0] is value:
+            entry[3] += 1
+            return entry[2]
+
+        segment, handle = _create(value)
+        # keep the value alive so that its id is not reused
+        _EXPORTED[id(value)] = [value, segment, handle, 1]
+        return handle
+
+
+def release(handle: SharedHandle, /) -> None:
+    """Release a reference to an exported value.
+
+    The segment is removed when its last reference is released.
+
+    :param handle: handle returned by **export**
+    """
+    with _LOCK:
+        for key, entry in _EXPORTED.items():
+            if entry[2] == handle:
+                entry[3] -= 1
+                if entry[3] > 0:
+                    return
+
+                del _EXPORTED[key]
+                segment = entry[1]
+                break
+        else:
+            return
+
+    segment.close()
+    segment.unlink()
+
+
+def _open(name: str, /) -> Any:
+    """Open an existing segment without taking ownership of it."""
+    from multiprocessing.shared_memory import SharedMemory
+
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)
+
+    # worker processes share the resource tracker of their parent, which
+    # already tracks the segment
+    return SharedMemory(name)
+
+
+class attach(object):
+    r"""Map a value placed in shared memory by another process.
+
+    .. code-block:: python
+
+        >>> with shm.attach(handle) as view:
+        ...     total = sum(view)
+        ...
+        >>>
+
+    The view is only valid inside the **with** block. Call **close** to
+    use it without a **with** block.
+
+    :param handle: handle returned by **export**
+    """
+
+    __slots__ = ("_segment", "_view")
+
+    def __init__(self, handle: SharedHandle, /) -> None:
+        self._segment: Any = _open(handle.name)
+        view = self._segment.buf[: handle.nbytes].toreadonly()
+        self._view: memoryview = (
+            view.cast(handle.format) if handle.format != "B" else view
+        )
+
+    @property
+    def view(self) -> memoryview:
+        """Read-only view of the value"""
+        return self._view
+
+    def __enter__(self) -> memoryview:
+        return self._view
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> bool:
+        """Unmap the segment.
+
+        The segment stays mapped if buffers exported from the view, such
+        as NumPy arrays, are still alive.
+
+        :return: **False** if the segment is still mapped
+        """
+        try:
+            self._view.release()
+            self._segment.close()
+        except BufferError:
+            return False
+
+        return True
+
+
+def share(value: Any, /) -> SharedHandle:
+    """Place a value in a segment owned by the process receiving its handle.
+
+    :param value: contiguous buffer
+    :return: handle to pass to **take**
+    """
+    segment, handle = _create(value)
+    segment.close()
+    return handle
+
+
+def take(handle: SharedHandle, /) -> memoryview:
+    r"""Map a value placed in shared memory by **share** and own its segment.
+
+    .. code-block:: python
+
+        >>> handle = shm.share(b"abc")
+        >>> view = shm.take(handle)
+        >>> bytes(view)
+        b'abc'
+        >>>
+
+    The value is not copied: the returned view, and the views derived from
+    it, keep the segment mapped. The segment is removed once all of them
+    are garbage collected.
+
+    :param handle: handle returned by **share**
+    :return: read-only view of the value
+    """
+    import ctypes
+    from multiprocessing.shared_memory import SharedMemory
+
+    segment: Any = SharedMemory(handle.name)
+    # the name is removed now, the memory is freed once the segment is unmapped
+    segment.unlink()
+    # an array at the address of the segment owns it, unlike views of
+    # segment.buf which would prevent closing it
+    probe = ctypes.c_ubyte.from_buffer(segment.buf)
+    data: Any = (ctypes.c_ubyte * handle.nbytes).from_address(ctypes.addressof(probe))
+    del probe
+    data.segment = segment
+    view: Any = memoryview(data).cast("B").toreadonly()
+    return view.cast(handle.format) if handle.format != "B" else view
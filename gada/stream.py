@@ -0,0 +1,212 @@
+"""Streams shared between the steps of a program.
+
+A node can return a generator for an output typed as a stream. The next
+steps consume it lazily, so they start before the producer has finished
+and the whole stream is never materialized.
+
+When several steps read the same stream, each one gets its own
+**Reader** and items are buffered until every reader has read them:
+
+* When readers run concurrently, for example with the scheduler, a reader
+  more than **maxsize** items ahead of the others waits for them, so
+  memory stays bounded.
+* When readers run one after the other, the buffer must keep the items
+  not read yet by the next readers.
+"""
+from __future__ import annotations
+
+__all__ = ["DEFAULT_MAXSIZE", "Stream", "Reader"]
+from typing import TYPE_CHECKING
+import weakref
+import threading
+from collections import deque
+
+if TYPE_CHECKING:
+    from typing import Any, Iterable, Optional
+
+
+DEFAULT_MAXSIZE = 1024
+"""Default number of buffered items before fast readers wait"""
+
+_END = object()
+
+
+class Stream(object):
+    r"""Stream read by multiple readers with bounded buffering.
+
+    .. code-block:: python
+
+        >>> from gada.stream import Stream
+        >>>
+        >>> s = Stream(iter(range(3)), readers=2)
+        >>> list(s.reader()), list(s.reader())
+        ([0, 1, 2], [0, 1, 2])
+        >>>
+
+    :param source: iterable producing the items
+    :param readers: number of readers expected, items are kept until they
+        have all been created and have read them
+    :param maxsize: number of buffered items before fast readers wait
+    """
+
+    __slots__ = (
+        "_source",
+        "_expected",
+        "_maxsize",
+        "_buffer",
+        "_offset",
+        "_readers",
+        "_cond",
+        "_pulling",
+        "_error",
+    )
+
+    def __init__(
+        self,
+        source: Iterable,
+        /,
+        *,
+        readers: int = 1,
+        maxsize: Optional[int] = None,
+    ) -> None:
+        self._source = iter(source)
+        self._expected: int = readers
+        self._maxsize: int = maxsize if maxsize is not None else DEFAULT_MAXSIZE
+        # items not read by all readers yet, the first one at index _offset
+        self._buffer: deque = deque()
+        self._offset: int = 0
+        # created readers, not kept alive so unused readers get closed
+        self._readers: list[weakref.ref[Reader]] = []
+        self._cond = threading.Condition()
+        # if a reader is pulling the next item from the source
+        self._pulling: bool = False
+        self._error: Optional[BaseException] = None
+
+    def __iter__(self) -> Reader:
+        return self.reader()
+
+    def reader(self) -> Reader:
+        """Create a new reader.
+
+        Readers beyond the expected number start at the oldest buffered
+        item.
+
+        :return: iterator over the items
+        """
+        with self._cond:
+            reader = Reader(self, self._offset)
+            self._readers.append(weakref.ref(reader))
+            return reader
+
+    def _open_readers(self) -> list[Reader]:
+        readers = [_() for _ in self._readers]
+        return [_ for _ in readers if _ is not None and not _._closed]
+
+    def _next(self, reader: Reader, /) -> Any:
+        with self._cond:
+            while True:
+                index = reader._position - self._offset
+                if index < len(self._buffer):
+                    item = self._buffer[index]
+                    if item is _END:
+                        raise StopIteration
+
+                    reader._position += 1
+                    self._trim()
+                    return item
+
+                if self._error is not None:
+                    raise self._error
+
+                if self._pulling or self._is_full(reader):
+                    self._cond.wait()
+                    continue
+
+                self._pulling = True
+                break
+
+        # pull outside the lock as the producer may be slow
+        try:
+            item = next(self._source)
+        except StopIteration:
+            item = _END
+        except BaseException as e:
+            with self._cond:
+                self._error = e
+                self._pulling = False
+                self._cond.notify_all()
+            raise
+
+        with self._cond:
+            self._buffer.append(item)
+            self._pulling = False
+            self._cond.notify_all()
+
+        return self._next(reader)
+
+    def _is_full(self, reader: Reader, /) -> bool:
+        """Check if a reader must wait for slower readers."""
+        if len(self._buffer) < self._maxsize or len(self._readers) < self._expected:
+            return False
+
+        # only wait for the readers holding the oldest item if they are
+        # consumed from other threads, waiting for this thread would block
+        current = threading.get_ident()
+        lagging = [_ for _ in self._open_readers() if _._position == self._offset]
+        return bool(lagging) and all(_._thread != current for _ in lagging)
+
+    def _trim(self) -> None:
+        """Remove items read by all readers."""
+        if len(self._readers) < self._expected:
+            return
+
+        positions = [_._position for _ in self._open_readers()]
+        lowest = min(positions) if positions else self._offset + len(self._buffer)
+        while self._offset < lowest and self._buffer and self._buffer[0] is not _END:
+            self._buffer.popleft()
+            self._offset += 1
+            self._cond.notify_all()
+
+    def _close(self, reader: Reader, /) -> None:
+        with self._cond:
+            reader._closed = True
+            self._trim()
+            self._cond.notify_all()
+
+
+class Reader(object):
+    """Iterator over the items of a **Stream**.
+
+    :param stream: read stream
+    :param position: index of the next item
+    """
+
+    __slots__ = ("_stream", "_position", "_thread", "_closed", "__weakref__")
+
+    def __init__(self, stream: Stream, position: int, /) -> None:
+        self._stream: Stream = stream
+        self._position: int = position
+        # thread consuming this reader, for knowing if waiting for it is safe
+        self._thread: int = threading.get_ident()
+        self._closed: bool = False
+
+    def __iter__(self) -> Reader:
+        return self
+
+    def __next__(self) -> Any:
+        if self._closed:
+            raise StopIteration
+
+        self._thread = threading.get_ident()
+        return self._stream._next(self)
+
+    def close(self) -> None:
+        """Stop reading so that other readers don't wait for this one."""
+        if not self._closed:
+            self._stream._close(self)
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -1,4 +1,16 @@
-"""Package containing the builtin Gada types usable in nodes and programs."""
+"""Package containing the builtin Gada types usable in nodes and programs.
+
+Values are checked against types with a validation policy trading
+correctness for throughput on large lists: **full** checks all the items,
+**sampled** checks a few of them and **off** checks nothing. The policy
+is selected with the **GADA_VALIDATION** environment variable, for
+example **full** in CI and **off** in production, or per
+:class:`gada.program.Context`.
+
+Numeric data is best passed between nodes as arrays typed with
+**ArrayType**, whose checks don't depend on their size. Arrays are only
+converted to lists for nodes declaring list parameters.
+"""
 from __future__ import annotations
 
 __all__ = [
@@ -12,27 +24,93 @@ __all__ = [
     "VariableType",
     "TupleType",
     "UnionType",
+    "StreamType",
+    "DTYPES",
+    "ArrayType",
+    "Checker",
+    "FULL",
+    "SAMPLED",
+    "OFF",
+    "VALIDATION_POLICIES",
+    "SAMPLES",
+    "validation_policy",
+    "compile",
+    "converter",
     "isinstance",
     "typeof",
 ]
+import array
 import builtins
-from dataclasses import dataclass
-from typing import Any
+import itertools
+import os
+import random
+import sys
+from collections.abc import Iterable, Iterator
+from typing import Any, Callable, Optional
 from abc import ABC, abstractmethod
 
 
 _isinstance = builtins.isinstance
 
+# interned types by class and arguments, the number of distinct types
+# used by programs is small so they are kept alive
+_INTERNED: dict[tuple, Type] = {}
+
+
+def _intern(cls: type, args: tuple, /) -> Type:
+    """Get the unique instance of a type.
+
+    :param cls: class of the type
+    :param args: arguments of the type, hashable
+    :return: interned type
+    """
+    key = (cls, args)
+    t = _INTERNED.get(key, None)
+    if t is None:
+        t = object.__new__(cls)
+        t._init(*args)
+        t = _INTERNED.setdefault(key, t)
+
+    return t
+
 
 class Type(ABC):
-    """Base for Gada types"""
+    """Base for Gada types.
+
+    Builtin types are interned: creating a type equal to an existing one
+    returns the existing instance. As they are immutable, they are
+    compared and hashed by identity, which is structural equality, so
+    they are cheap to use as keys of dicts.
+    """
+
+    __slots__ = ("_checkers",)
+
+    def __init__(self, *args) -> None:
+        # attributes are set once when the type is interned
+        pass
+
+    def _init(self, *args) -> None:
+        """Set the attributes of a new type."""
+        pass
+
+    def _args(self) -> tuple:
+        """Arguments for creating the same type."""
+        return ()
+
+    def __reduce__(self) -> tuple:
+        return (self.__class__, self._args())
+
+    def __copy__(self) -> Type:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Type:
+        return self
 
     @abstractmethod
     def _match(self, o: Any, /) -> bool:
         raise NotImplementedError()
 
 
-@dataclass
 class AnyType(Type):
     r"""Represent any type.
 
@@ -47,6 +125,11 @@ class AnyType(Type):
 
     """
 
+    __slots__ = ()
+
+    def __new__(cls) -> AnyType:
+        return _intern(cls, ())
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
 
@@ -57,7 +140,6 @@ class AnyType(Type):
         return True
 
 
-@dataclass
 class BoolType(Type):
     r"""Wrap the Python **bool** type.
 
@@ -72,6 +154,11 @@ class BoolType(Type):
 
     """
 
+    __slots__ = ()
+
+    def __new__(cls) -> BoolType:
+        return _intern(cls, ())
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
 
@@ -82,7 +169,6 @@ class BoolType(Type):
         return _isinstance(o, bool)
 
 
-@dataclass
 class IntType(Type):
     r"""Wrap the Python **int** type.
 
@@ -97,6 +183,11 @@ class IntType(Type):
 
     """
 
+    __slots__ = ()
+
+    def __new__(cls) -> IntType:
+        return _intern(cls, ())
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
 
@@ -107,7 +198,6 @@ class IntType(Type):
         return _isinstance(o, int)
 
 
-@dataclass
 class FloatType(Type):
     r"""Wrap the Python **float** type.
 
@@ -122,6 +212,11 @@ class FloatType(Type):
 
     """
 
+    __slots__ = ()
+
+    def __new__(cls) -> FloatType:
+        return _intern(cls, ())
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
 
@@ -132,7 +227,6 @@ class FloatType(Type):
         return _isinstance(o, float)
 
 
-@dataclass
 class StringType(Type):
     r"""Wrap the Python **str** type.
 
@@ -147,6 +241,11 @@ class StringType(Type):
 
     """
 
+    __slots__ = ()
+
+    def __new__(cls) -> StringType:
+        return _intern(cls, ())
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
 
@@ -157,7 +256,6 @@ class StringType(Type):
         return _isinstance(o, str)
 
 
-@dataclass
 class ListType(Type):
     r"""Wrap the Python **list** type.
 
@@ -172,11 +270,17 @@ class ListType(Type):
 
     :param item_type: type of list items
     """
-    __slot__ = "_item_type"
+    __slots__ = ("_item_type",)
+
+    def __new__(cls, item_type: Optional[Type], /) -> ListType:
+        return _intern(cls, (item_type,))
 
-    def __init__(self, item_type: Type, /) -> None:
+    def _init(self, item_type: Optional[Type], /) -> None:
         self._item_type = item_type
 
+    def _args(self) -> tuple:
+        return (self._item_type,)
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({repr(self._item_type)})"
 
@@ -193,7 +297,6 @@ class ListType(Type):
         return self._item_type._match(o[0])
 
 
-@dataclass
 class VariableType(Type):
     r"""Represent one or multiple values of the same type.
 
@@ -208,11 +311,17 @@ class VariableType(Type):
 
     :param item_type: type of items
     """
-    __slot__ = "_item_type"
+    __slots__ = ("_item_type",)
+
+    def __new__(cls, item_type: Optional[Type], /) -> VariableType:
+        return _intern(cls, (item_type,))
 
-    def __init__(self, item_type: Type, /) -> None:
+    def _init(self, item_type: Optional[Type], /) -> None:
         self._item_type = item_type
 
+    def _args(self) -> tuple:
+        return (self._item_type,)
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({repr(self._item_type)})"
 
@@ -223,10 +332,9 @@ class VariableType(Type):
         if _isinstance(o, list):
             return self._item_type._match(o[0]) if o else True
 
-        return self._item_type._match(o[0])
+        return self._item_type._match(o)
 
 
-@dataclass
 class TupleType(Type):
     r"""Wrap the Python **tuple** type.
 
@@ -241,13 +349,19 @@ class TupleType(Type):
 
     :param items_types: types of tuple items
     """
-    __slot__ = "_items_types"
+    __slots__ = ("_items_types",)
+
+    def __new__(cls, items_types: Iterable[Type], /) -> TupleType:
+        return _intern(cls, (tuple(items_types) if items_types is not None else (),))
 
-    def __init__(self, items_types: list[Type], /) -> None:
-        self._items_types = list(items_types) if items_types is not None else []
+    def _init(self, items_types: tuple[Type, ...], /) -> None:
+        self._items_types = items_types
+
+    def _args(self) -> tuple:
+        return (self._items_types,)
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}({repr(self._items_types)})"
+        return f"{self.__class__.__name__}({list(self._items_types)!r})"
 
     def __str__(self) -> str:
         return f"({', '.join(map(str, self._items_types))})"
@@ -262,7 +376,6 @@ class TupleType(Type):
         return all((t._match(v) for t, v in zip(self._items_types, o)))
 
 
-@dataclass
 class UnionType(Type):
     r"""Represent an union of multiple types.
 
@@ -277,28 +390,614 @@ class UnionType(Type):
 
     :param items_types: possible types
     """
-    __slot__ = "_items_types"
+    __slots__ = ("_items_types",)
+
+    def __new__(cls, items_types: Iterable[Type], /) -> UnionType:
+        return _intern(cls, (tuple(items_types) if items_types is not None else (),))
 
-    def __init__(self, items_types: list[Type], /) -> None:
-        self._items_types = list(items_types) if items_types is not None else []
+    def _init(self, items_types: tuple[Type, ...], /) -> None:
+        self._items_types = items_types
+
+    def _args(self) -> tuple:
+        return (self._items_types,)
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}({repr(self._items_types)})"
+        return f"{self.__class__.__name__}({list(self._items_types)!r})"
 
     def __str__(self) -> str:
         return " | ".join(map(str, self._items_types))
 
     def _match(self, o: Any, /) -> bool:
-        if not _isinstance(o, tuple):
+        return any((t._match(o) for t in self._items_types))
+
+
+class StreamType(Type):
+    r"""Represent a stream of values of the same type.
+
+    .. code-block:: python
+
+        >>> t = StreamType(IntType())
+        >>> repr(t)
+        'StreamType(IntType())'
+        >>> str(t)
+        'stream[int]'
+        >>>
+
+    Any iterable, such as a generator, matches a stream without being
+    consumed. Items are checked one by one as they are read with
+    **check_items**.
+
+    :param item_type: type of items
+    """
+    __slots__ = ("_item_type",)
+
+    def __new__(cls, item_type: Optional[Type], /) -> StreamType:
+        return _intern(cls, (item_type,))
+
+    def _init(self, item_type: Optional[Type], /) -> None:
+        self._item_type = item_type
+
+    def _args(self) -> tuple:
+        return (self._item_type,)
+
+    @property
+    def item_type(self) -> Type:
+        """Type of items"""
+        return self._item_type
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({repr(self._item_type)})"
+
+    def __str__(self) -> str:
+        return f"stream[{self._item_type}]"
+
+    def _match(self, o: Any, /) -> bool:
+        return _isinstance(o, Iterable) and not _isinstance(o, (str, bytes, dict))
+
+    def check_items(
+        self, o: Iterable, /, *, name: str = "stream", policy: Optional[str] = None
+    ) -> Iterator:
+        r"""Check the items of a stream while they are read.
+
+        .. code-block:: python
+
+            >>> from gada import typing
+            >>>
+            >>> t = StreamType(IntType())
+            >>> list(t.check_items(iter([1, 2])))
+            [1, 2]
+            >>> list(t.check_items(iter([1, "a"])))
+            Traceback (most recent call last):
+            ...
+            Exception: invalid item for stream: expected int, got <class 'str'>
+            >>>
+
+        Each item is checked with the **full** or **sampled** policy as
+        they can't be sampled in advance.
+
+        :param o: stream
+        :param name: name of the stream in error messages
+        :param policy: validation policy, see :func:`validation_policy`
+        :return: iterator over checked items
+        """
+        item_type = self._item_type
+        policy = validation_policy(policy)
+        check = compile(item_type, policy=policy)
+        if check is _true:
+            yield from o
+            return
+
+        for item in o:
+            if not check(item):
+                raise Exception(
+                    f"invalid item for {name}: expected {item_type}, got {type(item)}"
+                )
+
+            yield item
+
+
+DTYPES = (
+    "bool",
+    "int8",
+    "uint8",
+    "int16",
+    "uint16",
+    "int32",
+    "uint32",
+    "int64",
+    "uint64",
+    "float32",
+    "float64",
+)
+"""Supported dtypes of arrays"""
+
+
+def _format_dtype(code: str, /) -> Optional[str]:
+    """Get the dtype of a struct format character."""
+    import struct
+
+    if code == "?":
+        return "bool"
+
+    size = struct.calcsize(code)
+    if code in "fd":
+        return f"float{size * 8}"
+
+    if code in "bhilqn":
+        return f"int{size * 8}"
+
+    if code in "BHILQN":
+        return f"uint{size * 8}"
+
+    return None
+
+
+# dtypes by format of memoryview and typecode of array.array
+_FORMAT_DTYPES: dict[str, str] = {
+    prefix + code: _format_dtype(code)
+    for code in "?bBhHiIlLqQnNfd"
+    for prefix in ("", "@")
+}
+
+# typecodes of array.array by dtype, for converting lists to arrays
+_DTYPE_TYPECODES: dict[str, str] = {}
+for _code in reversed("bBhHiIlLqQfd"):
+    _DTYPE_TYPECODES[_FORMAT_DTYPES[_code]] = _code
+del _code
+
+
+def _array_info(o: Any, /) -> Optional[tuple[str, tuple]]:
+    """Get the dtype and shape of an array without copying it.
+
+    :param o: **array.array**, **memoryview** or NumPy array
+    :return: dtype and shape, or **None** if **o** is not an array
+    """
+    cls = o.__class__
+    if cls is memoryview:
+        return _FORMAT_DTYPES.get(o.format, o.format), o.shape
+
+    if cls is array.array:
+        # arrays of characters are not arrays of numbers
+        dtype = _FORMAT_DTYPES.get(o.typecode, None)
+        return (dtype, (len(o),)) if dtype is not None else None
+
+    # NumPy arrays can only exist if NumPy was imported
+    numpy = sys.modules.get("numpy", None)
+    if numpy is not None and _isinstance(o, numpy.ndarray):
+        return o.dtype.name, o.shape
+
+    return None
+
+
+class ArrayType(Type):
+    r"""Represent a compact array of numbers.
+
+    .. code-block:: python
+
+        >>> t = ArrayType("float64", (None, 3))
+        >>> repr(t)
+        "ArrayType('float64', (None, 3))"
+        >>> str(t)
+        'array[float64, (None, 3)]'
+        >>>
+
+    Arrays are **array.array**, **memoryview** and NumPy arrays. Their
+    numbers are stored unboxed, and checking their dtype and shape
+    doesn't depend on their size.
+
+    :param dtype: type of numbers, one of **DTYPES**
+    :param shape: size of each dimension, **None** for any size, defaults
+        to any number of dimensions
+    """
+
+    __slots__ = ("_dtype", "_shape")
+
+    def __new__(
+        cls, dtype: str, /, shape: Optional[Iterable[Optional[int]]] = None
+    ) -> ArrayType:
+        if dtype not in DTYPES:
+            raise Exception(
+                f"unsupported dtype {dtype}, expected one of {', '.join(DTYPES)}"
+            )
+
+        return _intern(cls, (dtype, tuple(shape) if shape is not None else None))
+
+    def _init(self, dtype: str, shape: Optional[tuple], /) -> None:
+        self._dtype = dtype
+        self._shape = shape
+
+    def _args(self) -> tuple:
+        return (self._dtype, self._shape)
+
+    @property
+    def dtype(self) -> str:
+        """Type of numbers"""
+        return self._dtype
+
+    @property
+    def shape(self) -> Optional[tuple[Optional[int], ...]]:
+        """Size of each dimension"""
+        return self._shape
+
+    def __repr__(self) -> str:
+        if self._shape is None:
+            return f"{self.__class__.__name__}({self._dtype!r})"
+
+        return f"{self.__class__.__name__}({self._dtype!r}, {self._shape!r})"
+
+    def __str__(self) -> str:
+        if self._shape is None:
+            return f"array[{self._dtype}]"
+
+        return f"array[{self._dtype}, {self._shape!r}]"
+
+    def _match(self, o: Any, /) -> bool:
+        info = _array_info(o)
+        if info is None or info[0] != self._dtype:
             return False
 
-        if len(self._items_types) != len(o):
+        return _match_shape(self._shape, info[1])
+
+
+def _match_shape(expected: Optional[tuple], shape: tuple, /) -> bool:
+    if expected is None:
+        return True
+
+    if len(expected) != len(shape):
+        return False
+
+    for e, s in zip(expected, shape):
+        if e is not None and e != s:
             return False
 
-        return all((t._match(v) for t, v in zip(self._items_types, o)))
+    return True
+
+
+Checker = Callable[[Any], bool]
+"""Function checking if a Python object is an instance of a type"""
+
+FULL = "full"
+"""Check all the items of lists"""
+
+SAMPLED = "sampled"
+"""Check all the items of lists of up to ``SAMPLES + 2`` items, and the
+first, last and **SAMPLES** random items of longer lists"""
+
+OFF = "off"
+"""Don't check values, for trusted programs"""
+
+VALIDATION_POLICIES = (FULL, SAMPLED, OFF)
+"""Supported validation policies"""
+
+SAMPLES = 16
+"""Number of random items checked by the **sampled** policy"""
+
+# checkers by policy and type
+_CHECKERS: dict[tuple[str, Type], Checker] = {}
+
+_BUILTIN_TYPES = frozenset(
+    (
+        AnyType,
+        BoolType,
+        IntType,
+        FloatType,
+        StringType,
+        ListType,
+        VariableType,
+        TupleType,
+        UnionType,
+        StreamType,
+        ArrayType,
+    )
+)
 
+_SCALAR_TYPES = {BoolType: bool, IntType: int, FloatType: float, StringType: str}
 
-def isinstance(value: Any, type: Type, /) -> bool:
+_random = random.Random()
+
+
+def validation_policy(policy: Optional[str] = None, /) -> str:
+    r"""Get the validation policy to use.
+
+    .. code-block:: python
+
+        >>> from gada import typing
+        >>>
+        >>> typing.validation_policy("full")
+        'full'
+        >>>
+
+    :param policy: **full**, **sampled** or **off**, defaults to the
+        **GADA_VALIDATION** environment variable or **sampled**
+    :return: validation policy
+    """
+    if policy is None:
+        policy = os.environ.get("GADA_VALIDATION", "") or SAMPLED
+
+    if policy not in VALIDATION_POLICIES:
+        raise Exception(
+            f"unknown validation policy {policy}, expected one of "
+            f"{', '.join(VALIDATION_POLICIES)}"
+        )
+
+    return policy
+
+
+def _true(o: Any, /) -> bool:
+    return True
+
+
+def _sample(o: list, /) -> Iterable:
+    """Get the items of a list checked by the **sampled** policy."""
+    if len(o) <= SAMPLES + 2:
+        return o
+
+    return itertools.chain(
+        (o[0], o[-1]), map(o.__getitem__, _random.sample(range(len(o)), SAMPLES))
+    )
+
+
+def _all_instances(values: Iterable, cls: type, /) -> bool:
+    """Check if values are instances of a class."""
+    # the loop over items runs in C, and lists usually hold one type
+    for t in set(map(builtins.type, values)):
+        if t is not cls and not issubclass(t, cls):
+            return False
+
+    return True
+
+
+def _compile_items(item_type: Type, policy: str, /) -> Checker:
+    """Build the checker of the items of a list."""
+    item = compile(item_type, policy=policy)
+    if item is _true:
+        return _true
+
+    limit = SAMPLES + 2
+    cls = _SCALAR_TYPES.get(item_type.__class__, None)
+    if cls is None:
+        if policy == SAMPLED:
+            return lambda o, /: all(map(item, _sample(o)))
+
+        return lambda o, /: all(map(item, o))
+
+    sampled = policy == SAMPLED
+
+    def check(o: list, /) -> bool:
+        # small lists are checked entirely, which costs no more than sampling
+        if len(o) <= limit:
+            for v in o:
+                if v.__class__ is not cls and not _isinstance(v, cls):
+                    return False
+
+            return True
+
+        return _all_instances(_sample(o) if sampled else o, cls)
+
+    return check
+
+
+def _compile(type: Type, policy: str, /) -> Checker:
+    """Build the checker of a type."""
+    if policy == OFF or type is None or _isinstance(type, AnyType):
+        return _true
+
+    cls = _SCALAR_TYPES.get(type.__class__, None)
+    if cls is not None:
+
+        def check(o: Any, /) -> bool:
+            return _isinstance(o, cls)
+
+        return check
+
+    if _isinstance(type, ListType):
+        items = _compile_items(type._item_type, policy)
+        if items is _true:
+            return lambda o, /: _isinstance(o, list)
+
+        item_cls = _SCALAR_TYPES.get(type._item_type.__class__, None)
+        if item_cls is not None:
+            limit = SAMPLES + 2
+
+            # same as below with the loop over small lists inlined, as
+            # they are the most common values
+            def check(o: Any, /) -> bool:
+                if o.__class__ is not list and not _isinstance(o, list):
+                    return False
+
+                if len(o) > limit:
+                    return items(o)
+
+                for v in o:
+                    if v.__class__ is not item_cls and not _isinstance(v, item_cls):
+                        return False
+
+                return True
+
+            return check
+
+        def check(o: Any, /) -> bool:
+            return (o.__class__ is list or _isinstance(o, list)) and items(o)
+
+        return check
+
+    if _isinstance(type, VariableType):
+        item = compile(type._item_type, policy=policy)
+        items = _compile_items(type._item_type, policy)
+
+        def check(o: Any, /) -> bool:
+            if _isinstance(o, list):
+                return items(o)
+
+            return item(o)
+
+        return check
+
+    if _isinstance(type, TupleType):
+        items = tuple(compile(_, policy=policy) for _ in type._items_types)
+        size = len(items)
+
+        def check(o: Any, /) -> bool:
+            if not _isinstance(o, tuple) or len(o) != size:
+                return False
+
+            for item, v in zip(items, o):
+                if not item(v):
+                    return False
+
+            return True
+
+        return check
+
+    if _isinstance(type, UnionType):
+        items = tuple(compile(_, policy=policy) for _ in type._items_types)
+        if _true in items:
+            return _true
+
+        def check(o: Any, /) -> bool:
+            for item in items:
+                if item(o):
+                    return True
+
+            return False
+
+        return check
+
+    if _isinstance(type, StreamType):
+
+        def check(o: Any, /) -> bool:
+            return _isinstance(o, Iterable) and not _isinstance(o, (str, bytes, dict))
+
+        return check
+
+    if _isinstance(type, ArrayType):
+        dtype, shape = type._dtype, type._shape
+
+        def check(o: Any, /) -> bool:
+            info = _array_info(o)
+            return (
+                info is not None
+                and info[0] == dtype
+                and (shape is None or _match_shape(shape, info[1]))
+            )
+
+        return check
+
+    raise Exception(f"unsupported type {type!r}")
+
+
+def compile(type: Type, /, *, policy: Optional[str] = None) -> Checker:
+    r"""Get a function checking if Python objects are instances of a type.
+
+    .. code-block:: python
+
+        >>> from gada import typing
+        >>>
+        >>> check = typing.compile(ListType(UnionType([IntType(), StringType()])))
+        >>> check([1]), check(["a"]), check([1.0])
+        (True, True, False)
+        >>>
+
+    Checkers don't dispatch on the type tree for each object. They are
+    built once per type and policy and cached, so compiling the same type
+    again is cheap.
+
+    The **policy** sets how much of large lists is checked:
+
+    * **full** checks all the items, lists of ``bool``, ``int``, ``float``
+      or ``str`` are checked without a Python call per item.
+    * **sampled** checks all the items of lists of up to ``SAMPLES + 2``
+      items, and the first, last and **SAMPLES** random items of longer
+      lists.
+    * **off** checks nothing and accepts all the values.
+
+    Unlike **Type._match**, which only checks the first item of lists,
+    **full** and **sampled** check every item of small lists. They cost
+    more than **Type._match** on such lists, in proportion to their size,
+    and **off** is the policy to use when checks must cost nothing.
+
+    :param type: type to check
+    :param policy: validation policy, see :func:`validation_policy`
+    :return: checker taking an object and returning if it is an instance
+        of **type**
+    """
+    policy = validation_policy(policy)
+    if type is None:
+        return _true
+
+    checkers = getattr(type, "_checkers", None)
+    if checkers is not None and policy in checkers:
+        return checkers[policy]
+
+    if type.__class__ not in _BUILTIN_TYPES:
+        # types defined elsewhere may not be hashable
+        return _true if policy == OFF else type._match
+
+    key = (policy, type)
+    checker = _CHECKERS.get(key, None)
+    if checker is None:
+        checker = _CHECKERS.setdefault(key, _compile(type, policy))
+
+    try:
+        if checkers is None:
+            checkers = type._checkers = {}
+        checkers[policy] = checker
+    except AttributeError:
+        pass
+
+    return checker
+
+
+def _tolist(o: Any, /) -> Any:
+    return o.tolist() if o.__class__ is array.array or _array_info(o) else o
+
+
+def converter(type: Type, /) -> Optional[Callable[[Any], Any]]:
+    r"""Get a function converting values between lists and arrays for a type.
+
+    .. code-block:: python
+
+        >>> from gada import typing
+        >>>
+        >>> typing.converter(ListType(FloatType()))(array.array("d", [1.0]))
+        [1.0]
+        >>> typing.converter(ArrayType("float64"))([1.0])
+        array('d', [1.0])
+        >>>
+
+    Nodes declaring list parameters get arrays converted to lists, and
+    lists are converted to **array.array** for nodes declaring array
+    parameters. Other values are returned unchanged.
+
+    :param type: declared type of a parameter
+    :return: converter, or **None** if values never need to be converted
+    """
+    if _isinstance(type, (ListType, VariableType)):
+        return _tolist
+
+    if (
+        _isinstance(type, ArrayType)
+        and type._dtype in _DTYPE_TYPECODES
+        and (type._shape is None or len(type._shape) == 1)
+    ):
+        typecode = _DTYPE_TYPECODES[type._dtype]
+
+        def convert(o: Any, /) -> Any:
+            if not _isinstance(o, list):
+                return o
+
+            try:
+                return array.array(typecode, o)
+            except (TypeError, OverflowError):
+                # reported as an invalid value by type checks
+                return o
+
+        return convert
+
+    return None
+
+
+def isinstance(value: Any, type: Type, /, *, policy: Optional[str] = None) -> bool:
     r"""Check if a Python object is an instance of a Gada type.
 
     .. code-block:: python
@@ -313,9 +1012,27 @@ def isinstance(value: Any, type: Type, /) -> bool:
 
     :param value: Python object
     :param type: type to check
+    :param policy: validation policy, see :func:`validation_policy`
     :return: if **value** is an instance of **type**
     """
-    return type._match(value)
+    return compile(type, policy=policy)(value)
+
+
+# types of primitive values by class
+_TYPEOF: dict[type, Type] = {
+    bool: BoolType(),
+    int: IntType(),
+    float: FloatType(),
+    str: StringType(),
+}
+
+# types of tuples of primitive values by classes of items
+_TYPEOF_TUPLES: dict[tuple[type, ...], Type] = {}
+
+_TYPEOF_TUPLES_MAXSIZE = 1024
+
+# types of lists by type of items
+_TYPEOF_LISTS: dict[Optional[Type], Type] = {}
 
 
 def typeof(value: Any, /) -> Type:
@@ -335,11 +1052,41 @@ def typeof(value: Any, /) -> Type:
         ListType(ListType(IntType()))
         >>> typing.typeof((1, "hello"))
         TupleType([IntType(), StringType()])
+        >>> typing.typeof(array.array("d", [1.0]))
+        ArrayType('float64')
         >>>
 
+    Types of primitive values, lists and tuples of primitive values are
+    looked up without being created again.
+
     :param value: Python object
     :return: type of **value**
     """
+    cls = value.__class__
+    t = _TYPEOF.get(cls, None)
+    if t is not None:
+        return t
+
+    if cls is tuple:
+        classes = tuple(map(builtins.type, value))
+        t = _TYPEOF_TUPLES.get(classes, None)
+        if t is None:
+            t = TupleType(map(typeof, value))
+            if len(_TYPEOF_TUPLES) >= _TYPEOF_TUPLES_MAXSIZE:
+                _TYPEOF_TUPLES.clear()
+            if all(_ in _TYPEOF for _ in classes):
+                _TYPEOF_TUPLES[classes] = t
+
+        return t
+
+    if cls is list:
+        item = typeof(value[0]) if value else None
+        t = _TYPEOF_LISTS.get(item, None)
+        if t is None:
+            t = _TYPEOF_LISTS.setdefault(item, ListType(item))
+
+        return t
+
     if _isinstance(value, bool):
         return BoolType()
     if _isinstance(value, int):
@@ -352,5 +1099,15 @@ def typeof(value: Any, /) -> Type:
         return ListType(typeof(value[0]) if value else None)
     if _isinstance(value, tuple):
         return TupleType(map(typeof, value))
+    if _isinstance(value, Iterator):
+        return StreamType(AnyType())
+
+    info = _array_info(value)
+    if info is not None and info[0] in DTYPES:
+        # shapes of arrays usually vary between values
+        return ArrayType(info[0])
+    if _isinstance(value, array.array):
+        # arrays of characters are typed as lists
+        return ListType(typeof(value[0]) if value else None)
 
     raise Exception(f"unsupported type {type(value)}")
@@ -52,6 +52,7 @@ setup(
     zip_safe=False,
     entry_points={
         "console_scripts": ["gada = gada:main"],
+        "gada.packages": ["gada = gada"],
     },
     python_requires=">=3.7",
     classifiers=[
@@ -1,5 +1,6 @@
 """Tests on the ``gada.program.Context`` class"""
 from __future__ import annotations
+import pytest
 from gada.node import Node, NodeCall, Param
 from gada import program
 
@@ -11,7 +12,7 @@ CALL_NODE_B = NodeCall.from_config(
 )
 
 
-def MockContext(steps: list[NodeCall]) -> program.Context:
+def mock_loaders() -> tuple:
     NODE_A = Node.from_config(
         {
             "name": "A",
@@ -49,7 +50,14 @@ def MockContext(steps: list[NodeCall]) -> program.Context:
     def load_runner(name, **_):
         return MockRunner if name == "mock_runner" else None
 
-    return program.Context(steps, load_node=load_node, load_runner=load_runner)
+    return load_node, load_runner
+
+
+def MockContext(steps: list[NodeCall], **kwargs) -> program.Context:
+    load_node, load_runner = mock_loaders()
+    return program.Context(
+        steps, load_node=load_node, load_runner=load_runner, **kwargs
+    )
 
 
 def test_context():
@@ -63,6 +71,10 @@ def test_context():
 
     assert cxt.step() == cxt
     assert cxt.vars() == {"out": 1}
+    # a copy the caller is free to modify
+    assert type(cxt.vars()) is dict
+    cxt.vars()["out"] = 0
+    assert cxt.var("out") == 1
     assert cxt.node("a")
     assert cxt.node("a").outputs == {"out": 1}
     assert not cxt.node("b")
@@ -75,3 +87,655 @@ def test_context():
     assert cxt.node("b")
     assert cxt.node("b").outputs == {"out": 2}
     assert cxt.is_done
+
+
+def test_context_plan():
+    load_node, load_runner = mock_loaders()
+    loaded = []
+
+    def counting_load_node(name):
+        loaded.append(name)
+        return load_node(name)
+
+    steps = [CALL_NODE_A, CALL_NODE_B]
+    plan = program.Program(steps).compile(
+        load_node=counting_load_node, load_runner=load_runner
+    )
+    assert [_.node.name for _ in plan] == ["A", "B"]
+    assert [_.kind for _ in plan[1].bindings] == ["output"]
+
+    for _ in range(3):
+        cxt = program.Context(steps, plan=plan)
+        while not cxt.is_done:
+            cxt = cxt.step()
+
+        assert cxt.node("b").outputs == {"out": 2}
+
+    # nodes are only loaded when compiling the plan
+    assert loaded == ["A", "B"]
+
+
+def test_context_scheduler():
+    from gada import scheduler
+
+    calls = [
+        CALL_NODE_A,
+        NodeCall.from_config({"name": "A", "id": "c", "inputs": {"in": 5}}),
+        CALL_NODE_B,
+    ]
+    cxt = MockContext(calls)
+    assert scheduler.dependencies(cxt.plan) == [set(), {0}, {0, 1}]
+
+    expected = MockContext(calls)
+    while not expected.is_done:
+        expected = expected.step()
+
+    assert scheduler.run(cxt, workers=4) is cxt
+    assert cxt.is_done
+    assert cxt.vars() == expected.vars()
+    assert cxt.node("b").outputs == expected.node("b").outputs == {"out": 2}
+
+
+def test_context_astep():
+    import asyncio
+    from gada import runners
+
+    load_node, load_runner = mock_loaders()
+    MockRunner = load_runner("mock_runner")
+
+    class AsyncRunner:
+        @staticmethod
+        async def arun(node: Node, inputs: dict, **kwargs) -> dict:
+            return MockRunner.run(node=node, inputs=inputs)
+
+    async def run(runner) -> program.Context:
+        cxt = program.Context(
+            [CALL_NODE_A, CALL_NODE_B],
+            load_node=load_node,
+            load_runner=lambda _: runner,
+        )
+        while not cxt.is_done:
+            cxt = await cxt.astep()
+
+        return cxt
+
+    # sync runners are run in an executor, async runners in the loop
+    for runner in (MockRunner, AsyncRunner):
+        cxt = asyncio.run(run(runner))
+        assert cxt.vars() == {"out": 2}
+        assert cxt.node("b").outputs == {"out": 2}
+
+    assert asyncio.run(
+        runners.arun(AsyncRunner, node=load_node("B"), inputs={"in": 1})
+    ) == {"out": 2}
+
+
+def test_program_arun_options(monkeypatch):
+    import asyncio
+    from gada import plan, runners
+    from gada.memo import MemoCache
+
+    load_node, load_runner = mock_loaders()
+    monkeypatch.setattr(plan, "default_load_node", load_node)
+    monkeypatch.setattr(runners, "load", load_runner)
+    load_node("A").config["deterministic"] = True
+
+    p = program.Program([CALL_NODE_A, CALL_NODE_B], outputs="b")
+    memo = MemoCache()
+    for _ in range(2):
+        assert asyncio.run(p.arun(memo=memo)) == {"out": 2}
+
+    assert memo.stats["hits"] == 1
+
+    p = program.Program(
+        [NodeCall.from_config({"name": "A", "id": "a", "inputs": {"in": "x"}})],
+        outputs="a",
+    )
+    with pytest.raises(Exception, match="invalid input"):
+        asyncio.run(p.arun(validation="full"))
+
+    assert asyncio.run(p.arun(validation="off")) == {"out": "x"}
+
+
+def test_context_executor():
+    load_node, _ = mock_loaders()
+    received = []
+
+    class Runner:
+        EXECUTORS = ("inline", "process")
+
+        @staticmethod
+        def run(node: Node, inputs: dict, **kwargs) -> dict:
+            received.append(kwargs)
+            return {"out": 0}
+
+    for executor, expected in ((None, {}), ("process", {"executor": "process"})):
+        received.clear()
+        cxt = program.Context(
+            [CALL_NODE_A],
+            load_node=load_node,
+            load_runner=lambda _: Runner,
+            executor=executor,
+        )
+        cxt.step()
+        assert received == [expected]
+
+
+def test_program_run_many(monkeypatch):
+    from gada import plan, runners
+
+    load_node, load_runner = mock_loaders()
+    monkeypatch.setattr(plan, "default_load_node", load_node)
+    monkeypatch.setattr(runners, "load", load_runner)
+
+    p = program.Program(
+        [NodeCall.from_config({"name": "B", "id": "b", "inputs": {"in": "{{ x }}"}})],
+        outputs="b",
+    )
+    records = ({"x": _} for _ in range(20))
+    expected = [{"out": _ + 1} for _ in range(20)]
+
+    assert list(p.run_many(records)) == expected
+
+    records = ({"x": _} for _ in range(20))
+    assert list(p.run_many(records, workers=4, max_in_flight=3)) == expected
+
+    records = ({"x": _} for _ in range(20))
+    outputs = list(p.run_many(records, workers=4, ordered=False))
+    assert sorted(outputs, key=lambda _: _["out"]) == expected
+
+
+def test_program_run_many_setup(monkeypatch):
+    """Test liveness and readers are computed once for all the records"""
+    from gada import plan, runners
+
+    load_node, load_runner = mock_loaders()
+    monkeypatch.setattr(plan, "default_load_node", load_node)
+    monkeypatch.setattr(runners, "load", load_runner)
+    calls = []
+    for name in ("liveness", "readers"):
+        fun = getattr(program, name)
+        monkeypatch.setattr(
+            program,
+            name,
+            lambda *args, _name=name, _fun=fun, **kwargs: calls.append(_name)
+            or _fun(*args, **kwargs),
+        )
+
+    p = program.Program([CALL_NODE_A, CALL_NODE_B], outputs="b")
+    assert list(p.run_many([{}] * 5)) == [{"out": 2}] * 5
+    assert list(p.run_many([{}] * 5, workers=2)) == [{"out": 2}] * 5
+    assert sorted(calls) == ["liveness", "readers"]
+
+
+def test_program_run_release(monkeypatch):
+    """Test results are only released on demand"""
+    from gada import plan, runners
+
+    load_node, load_runner = mock_loaders()
+    monkeypatch.setattr(plan, "default_load_node", load_node)
+    monkeypatch.setattr(runners, "load", load_runner)
+    calls = []
+    fun = program.liveness
+    monkeypatch.setattr(
+        program,
+        "liveness",
+        lambda *args, **kwargs: calls.append(args) or fun(*args, **kwargs),
+    )
+
+    p = program.Program([CALL_NODE_A, CALL_NODE_B], outputs="b")
+    assert p.run() == {"out": 2}
+    assert not calls
+    assert p.run(release=True) == {"out": 2}
+    assert len(calls) == 1
+
+
+def test_context_memo():
+    from gada.memo import MemoCache
+
+    load_node, load_runner = mock_loaders()
+    runs = []
+
+    class Runner:
+        @staticmethod
+        def run(node: Node, inputs: dict, **kwargs) -> dict:
+            runs.append(node.name)
+            return load_runner("mock_runner").run(node=node, inputs=inputs)
+
+    def load_deterministic_node(name):
+        node = load_node(name)
+        node.config["deterministic"] = name == "A"
+        return node
+
+    memo = MemoCache()
+    for _ in range(3):
+        cxt = program.Context(
+            [CALL_NODE_A, CALL_NODE_B],
+            load_node=load_deterministic_node,
+            load_runner=lambda _: Runner,
+            memo=memo,
+        )
+        while not cxt.is_done:
+            cxt = cxt.step()
+
+        assert cxt.node("b").outputs == {"out": 2}
+
+    # only the deterministic node is memoized
+    assert runs == ["A", "B", "B", "B"]
+    assert memo.stats["hits"] == 2
+
+
+def test_context_memo_packages():
+    """Test nodes with the same name from different packages don't share outputs"""
+    from gada.memo import MemoCache
+    from gada.nodeutil import PackageInfo
+
+    load_node, _ = mock_loaders()
+
+    def package_node(package: str) -> Node:
+        node = load_node("B")
+        return Node(
+            {**node.config, "deterministic": True},
+            package_info=PackageInfo(None, package, None),
+            runner=node.runner,
+        )
+
+    class Runner:
+        @staticmethod
+        def run(node: Node, inputs: dict, **kwargs) -> dict:
+            offset = 1 if node.package_info.name == "pkga" else 10
+            return {"out": inputs["in"] + offset}
+
+    # "B" is found in a different package by each context
+    memo = MemoCache()
+    call = NodeCall.from_config({"name": "B", "id": "b", "inputs": {"in": 1}})
+    for package, expected in (("pkga", 2), ("pkgb", 11)):
+        node = package_node(package)
+        cxt = program.Context(
+            [call], load_node=lambda _: node, load_runner=lambda _: Runner, memo=memo
+        )
+        cxt = cxt.step()
+        assert cxt.node("b").outputs == {"out": expected}
+
+    assert memo.stats["hits"] == 0
+
+
+def test_program_run_memo(monkeypatch):
+    from gada import plan, runners
+    from gada.memo import MemoCache
+
+    load_node, load_runner = mock_loaders()
+    monkeypatch.setattr(plan, "default_load_node", load_node)
+    monkeypatch.setattr(runners, "load", load_runner)
+    load_node("B").config["deterministic"] = True
+
+    p = program.Program(
+        [NodeCall.from_config({"name": "B", "id": "b", "inputs": {"in": "{{ x }}"}})],
+        outputs="b",
+    )
+    memo = MemoCache()
+    records = [{"x": _ % 2} for _ in range(6)]
+    assert list(p.run_many(records, memo=memo)) == [
+        {"out": _["x"] + 1} for _ in records
+    ]
+    assert memo.stats == {"hits": 4, "misses": 2, "size": 2}
+
+    assert p.run({"x": 1}, memo=memo) == {"out": 2}
+    assert memo.stats["hits"] == 5
+
+
+def test_context_memo_incremental(tmp_path):
+    from gada.memo import MemoCache
+    from gada.incremental import IncrementalState
+
+    load_node, load_runner = mock_loaders()
+    load_node("A").config["deterministic"] = True
+
+    memo = MemoCache()
+    for i in range(2):
+        state = IncrementalState(tmp_path / f"{i}.pickle")
+        cxt = program.Context(
+            [CALL_NODE_A, CALL_NODE_B],
+            load_node=load_node,
+            load_runner=load_runner,
+            memo=memo,
+            incremental=state,
+        )
+        while not cxt.is_done:
+            cxt = cxt.step()
+
+    # outputs of "a" come from the memo cache in the second run
+    assert state.stats == {"reused": 1, "executed": 1}
+
+
+def test_program_run_incremental(tmp_path, monkeypatch):
+    from gada import plan, runners, datadir
+
+    load_node, load_runner = mock_loaders()
+    runs = []
+
+    class Runner:
+        @staticmethod
+        def run(node: Node, inputs: dict, **kwargs) -> dict:
+            runs.append(node.name)
+            return load_runner("mock_runner").run(node=node, inputs=inputs)
+
+    monkeypatch.setattr(datadir, "path", lambda: tmp_path)
+    monkeypatch.setattr(plan, "default_load_node", load_node)
+    monkeypatch.setattr(runners, "load", lambda _: Runner)
+
+    steps = [
+        NodeCall.from_config({"name": "A", "id": "a", "inputs": {"in": "{{ x }}"}}),
+        NodeCall.from_config({"name": "A", "id": "c", "inputs": {"in": 5}}),
+        CALL_NODE_B,
+    ]
+    p = program.Program(steps, name="incremental", outputs="b")
+    assert p.run({"x": 1}, incremental=True) == {"out": 2}
+    assert runs == ["A", "A", "B"]
+
+    # nothing changed
+    runs.clear()
+    assert p.run({"x": 1}, incremental=True) == {"out": 2}
+    assert runs == []
+
+    # only steps reached by the change run again
+    runs.clear()
+    assert p.run({"x": 2}, incremental=True) == {"out": 3}
+    assert runs == ["A", "B"]
+
+
+def test_context_checkpoint(tmp_path):
+    path = tmp_path / "context.ckpt"
+    cxt = MockContext([CALL_NODE_A, CALL_NODE_B], vars={"x": 1})
+    cxt = cxt.step()
+    cxt.checkpoint(path)
+
+    load_node, load_runner = mock_loaders()
+    resumed = program.Context.resume(path, load_node=load_node, load_runner=load_runner)
+    assert resumed.lineno == cxt.lineno
+    assert resumed.vars() == {"x": 1, "out": 1}
+    assert resumed.node("a").outputs == {"out": 1}
+
+    resumed = resumed.step()
+    assert resumed.is_done
+    assert resumed.node("b").outputs == {"out": 2}
+
+
+def test_program_run_resume(tmp_path, monkeypatch):
+    import pytest
+    from gada import plan, runners, datadir, checkpoint
+
+    load_node, load_runner = mock_loaders()
+    runs = []
+    fail = [True]
+
+    class Runner:
+        @staticmethod
+        def run(node: Node, inputs: dict, **kwargs) -> dict:
+            if node.name == "B" and fail[0]:
+                raise Exception("transient failure")
+
+            runs.append(node.name)
+            return load_runner("mock_runner").run(node=node, inputs=inputs)
+
+    monkeypatch.setattr(datadir, "path", lambda: tmp_path)
+    monkeypatch.setattr(plan, "default_load_node", load_node)
+    monkeypatch.setattr(runners, "load", lambda _: Runner)
+
+    p = program.Program([CALL_NODE_A, CALL_NODE_B], name="resume", outputs="b")
+    with pytest.raises(Exception):
+        p.run(checkpoint_every=1)
+
+    assert runs == ["A"]
+    assert checkpoint.path(p._state_name()).is_file()
+
+    fail[0] = False
+    assert p.run(resume=True) == {"out": 2}
+    assert runs == ["A", "B"]
+    assert not checkpoint.path(p._state_name()).is_file()
+
+    # completed steps are not a prefix of the program with concurrent steps
+    with pytest.raises(Exception, match="more than one worker"):
+        p.run(resume=True, workers=2)
+
+
+def test_program_resume_other_plan(tmp_path, monkeypatch):
+    from gada import plan, runners, datadir, checkpoint
+
+    load_node, load_runner = mock_loaders()
+    monkeypatch.setattr(datadir, "path", lambda: tmp_path)
+    monkeypatch.setattr(plan, "default_load_node", load_node)
+    monkeypatch.setattr(runners, "load", load_runner)
+
+    # same name and nodes but different inputs
+    other_a = NodeCall.from_config({"name": "A", "id": "a", "inputs": {"in": 2}})
+    p = program.Program([CALL_NODE_A, CALL_NODE_B], name="resume")
+    other = program.Program([other_a, CALL_NODE_B], name="resume")
+    assert p._state_name() != other._state_name()
+    assert p._state_name() == program.Program(p._steps, name="resume")._state_name()
+
+    path = checkpoint.path(p._state_name())
+    cxt = MockContext([CALL_NODE_A, CALL_NODE_B], plan=p.compile())
+    cxt.step().checkpoint(path)
+    with pytest.raises(Exception, match="is not from this program"):
+        program.Context.resume(path, plan=other.compile(), load_runner=load_runner)
+
+    resumed = program.Context.resume(path, plan=p.compile(), load_runner=load_runner)
+    assert resumed.step().node("b").outputs == {"out": 2}
+
+
+def test_context_checkpoint_invalid(tmp_path):
+    cxt = MockContext([CALL_NODE_A], vars={"x": iter([1])})
+    with pytest.raises(Exception, match="variable x can't be checkpointed"):
+        cxt.checkpoint(tmp_path / "context.ckpt")
+
+    assert not (tmp_path / "context.ckpt").exists()
+
+
+def test_context_child():
+    cxt = MockContext([CALL_NODE_A], vars={"x": 1})
+    cxt = cxt.step()
+
+    child = cxt.child([CALL_NODE_B], vars={"y": 2})
+    assert child.parent is cxt
+    assert child.var("x") == 1
+    assert child.local("x") is None
+    assert child.vars() == {"x": 1, "y": 2, "out": 1}
+
+    child = child.step()
+    assert child.var("out") == 2
+    assert cxt.var("out") == 1
+    assert cxt.var("y") is None
+
+
+def test_context_release():
+    from gada.plan import liveness
+
+    calls = [
+        CALL_NODE_A,
+        NodeCall.from_config({"name": "B", "id": "c", "inputs": {"in": 5}}),
+        CALL_NODE_B,
+    ]
+    load_node, load_runner = mock_loaders()
+    plan = program.Program(calls).compile(load_node=load_node, load_runner=load_runner)
+    release = liveness(plan, keep=["b"])
+    assert [sorted(_.nodes) for _ in release] == [[], ["c"], ["a"]]
+    # "out" is only read through node outputs
+    assert [sorted(_.vars) for _ in release] == [["out"], ["out"], ["out"]]
+
+    cxt = program.Context(calls, plan=plan, release=release)
+    while not cxt.is_done:
+        cxt = cxt.step()
+
+    assert cxt.node("a") is None
+    assert cxt.node("c") is None
+    assert cxt.node("b").outputs == {"out": 2}
+    assert "out" not in cxt.vars()
+
+    # results are kept without release
+    cxt = program.Context(calls, plan=plan)
+    while not cxt.is_done:
+        cxt = cxt.step()
+
+    assert cxt.node("a").outputs == {"out": 1}
+
+
+def test_scheduler_release():
+    from gada import scheduler
+    from gada.plan import liveness
+
+    calls = [
+        CALL_NODE_A,
+        NodeCall.from_config({"name": "B", "id": "c", "inputs": {"in": "{{ a.out }}"}}),
+        CALL_NODE_B,
+    ]
+    cxt = MockContext(calls)
+    cxt = MockContext(calls, plan=cxt.plan, release=liveness(cxt.plan, keep=["b"]))
+    scheduler.run(cxt, workers=4)
+    assert cxt.node("a") is None
+    assert cxt.node("b").outputs == {"out": 2}
+
+
+def test_context_stream(tmp_path):
+    from gada import typing
+
+    stream_of_int = typing.StreamType(typing.IntType())
+    NODES = {
+        "produce": Node.from_config(
+            {
+                "name": "produce",
+                "runner": "stream_runner",
+                "inputs": [{"name": "n", "type": "int"}],
+                "outputs": [{"name": "items", "type": stream_of_int}],
+            }
+        ),
+        "total": Node.from_config(
+            {
+                "name": "total",
+                "runner": "stream_runner",
+                "inputs": [{"name": "items", "type": stream_of_int}],
+                "outputs": [{"name": "total", "type": "int"}],
+            }
+        ),
+    }
+    produced = []
+
+    def produce(n: int):
+        for i in range(n):
+            produced.append(i)
+            yield i
+
+    class Runner:
+        @staticmethod
+        def run(node: Node, inputs: dict, **kwargs) -> dict:
+            if node.name == "produce":
+                return {"items": produce(inputs["n"])}
+
+            return {"total": sum(inputs["items"])}
+
+    calls = [
+        NodeCall.from_config({"name": "produce", "id": "p", "inputs": {"n": 4}}),
+        NodeCall.from_config(
+            {"name": "total", "id": "t1", "inputs": {"items": "{{ p.items }}"}}
+        ),
+        NodeCall.from_config(
+            {"name": "total", "id": "t2", "inputs": {"items": "{{ p.items }}"}}
+        ),
+    ]
+    cxt = program.Context(
+        calls, load_node=NODES.__getitem__, load_runner=lambda _: Runner
+    )
+    cxt = cxt.step()
+    assert produced == [], "the stream should be consumed lazily"
+    with pytest.raises(Exception, match="items can.t be checkpointed, Stream"):
+        cxt.checkpoint(tmp_path / "context.ckpt")
+
+    while not cxt.is_done:
+        cxt = cxt.step()
+
+    # each consumer reads the whole stream, produced once
+    assert cxt.node("t1").outputs == {"total": 6}
+    assert cxt.node("t2").outputs == {"total": 6}
+    assert produced == [0, 1, 2, 3]
+
+
+def test_context_validation(monkeypatch):
+    """Test node inputs are checked according to the validation policy"""
+    calls = [NodeCall.from_config({"name": "A", "id": "a", "inputs": {"in": "x"}})]
+    with pytest.raises(Exception, match="invalid input"):
+        MockContext(calls, validation="full").step()
+
+    monkeypatch.setenv("GADA_VALIDATION", "off")
+    assert MockContext(calls).step().node("a").outputs == {"out": "x"}
+
+    with pytest.raises(Exception, match="unknown validation policy"):
+        MockContext(calls, validation="partial")
+
+
+def test_context_arrays():
+    """Test arrays are converted only for nodes declaring lists"""
+    import array
+    from gada import typing
+
+    float64 = typing.ArrayType("float64")
+    NODES = {
+        # returns a list for an array output
+        "produce": Node.from_config(
+            {
+                "name": "produce",
+                "runner": "array_runner",
+                "inputs": [{"name": "n", "type": "int"}],
+                "outputs": [{"name": "values", "type": float64}],
+            }
+        ),
+        "scale": Node.from_config(
+            {
+                "name": "scale",
+                "runner": "array_runner",
+                "inputs": [{"name": "values", "type": float64}],
+                "outputs": [{"name": "values", "type": float64}],
+            }
+        ),
+        "total": Node.from_config(
+            {
+                "name": "total",
+                "runner": "array_runner",
+                "inputs": [
+                    {"name": "values", "type": typing.ListType(typing.FloatType())}
+                ],
+                "outputs": [{"name": "total", "type": "float"}],
+            }
+        ),
+    }
+    received = {}
+
+    class Runner:
+        @staticmethod
+        def run(node: Node, inputs: dict, **kwargs) -> dict:
+            received[node.name] = inputs.get("values", None)
+            if node.name == "produce":
+                return {"values": [float(_) for _ in range(inputs["n"])]}
+            if node.name == "scale":
+                return {"values": array.array("d", (2 * _ for _ in inputs["values"]))}
+
+            return {"total": sum(inputs["values"])}
+
+    calls = [
+        NodeCall.from_config({"name": "produce", "id": "p", "inputs": {"n": 3}}),
+        NodeCall.from_config(
+            {"name": "scale", "id": "s", "inputs": {"values": "{{ p.values }}"}}
+        ),
+        NodeCall.from_config(
+            {"name": "total", "id": "t", "inputs": {"values": "{{ s.values }}"}}
+        ),
+    ]
+    cxt = program.Context(
+        calls, load_node=NODES.__getitem__, load_runner=lambda _: Runner
+    )
+    while not cxt.is_done:
+        cxt = cxt.step()
+
+    assert cxt.node("p").outputs == {"values": array.array("d", [0.0, 1.0, 2.0])}
+    assert isinstance(received["scale"], array.array)
+    assert received["total"] == [0.0, 2.0, 4.0]
+    assert cxt.node("t").outputs == {"total": 6.0}
@@ -0,0 +1,167 @@
+"""Tests on the ``gada.runners.generic`` runner"""
+from __future__ import annotations
+import io
+import sys
+from gada.node import Node
+from gada.runners import generic
+
+
+def _node(code: str, **config) -> Node:
+    # the command runs "python -c code"
+    return Node.from_config(
+        {
+            "name": "python",
+            "runner": "generic",
+            "bin": sys.executable,
+            "argv": f'-c "{code}"',
+            **config,
+        }
+    )
+
+
+UPPER = "import sys; sys.stdout.write(sys.stdin.read().upper())"
+
+
+def test_run_stream():
+    """Test a stream is written to stdin line by line"""
+    from gada.stream import Stream
+
+    stdout = io.BytesIO()
+    outputs = generic.run(
+        node=_node(UPPER),
+        inputs={"stdin": Stream(iter(["a", "b", 1])).reader()},
+        gada_config={},
+        stdout=stdout,
+    )
+
+    assert outputs == {}
+    assert stdout.getvalue() == b"A\nB\n1\n"
+
+
+def test_run_stream_error():
+    """Test errors raised by the producer of a stream are propagated"""
+    import pytest
+
+    def produce():
+        yield "a"
+        raise ValueError("producer failed")
+
+    stdout = io.BytesIO()
+    with pytest.raises(ValueError, match="producer failed"):
+        generic.run(
+            node=_node(UPPER),
+            inputs={"stdin": produce()},
+            gada_config={},
+            stdout=stdout,
+        )
+
+    # stdin is closed on errors so the command terminates
+    assert stdout.getvalue() == b"A\n"
+
+
+def test_run_exit_code():
+    """Test an error is raised when the command fails"""
+    import pytest
+
+    with pytest.raises(Exception, match="exited with code 3"):
+        generic.run(
+            node=_node("import sys; sys.exit(3)"),
+            gada_config={},
+            stdin=b"",
+            stdout=io.BytesIO(),
+        )
+
+
+def test_run_buffer(monkeypatch):
+    """Test binary inputs are written to stdin without being copied"""
+    import array
+    import hashlib
+
+    chunks = []
+    split = generic._chunks
+
+    def _chunks(buffer):
+        for _ in split(buffer):
+            chunks.append(_)
+            yield _
+
+    monkeypatch.setattr(generic, "_chunks", _chunks)
+    node = _node(
+        "import sys, hashlib; "
+        "sys.stdout.write(hashlib.sha256(sys.stdin.buffer.read()).hexdigest())"
+    )
+    data = bytes(range(256)) * (generic.CHUNK_SIZE // 128 + 1)
+    values = array.array("d", range(generic.CHUNK_SIZE // 4))
+    for value in (data, memoryview(data), values):
+        chunks.clear()
+        stdout = io.BytesIO()
+        generic.run(node=node, inputs={"stdin": value}, gada_config={}, stdout=stdout)
+
+        expected = hashlib.sha256(memoryview(value).cast("B")).hexdigest()
+        assert stdout.getvalue().decode() == expected
+        assert len(chunks) > 1
+        # chunks are views of the input itself
+        base = value.obj if isinstance(value, memoryview) else value
+        assert all(isinstance(_, memoryview) and _.obj is base for _ in chunks)
+
+
+def test_arun(monkeypatch):
+    """Test the command runs in the running event loop"""
+    import asyncio
+    from gada import runners
+
+    def run(*args, **kwargs):
+        raise Exception("run should not be called")
+
+    monkeypatch.setattr(generic, "run", run)
+    stdout = io.BytesIO()
+    outputs = asyncio.run(
+        runners.arun(
+            generic,
+            node=_node(UPPER),
+            inputs={"stdin": b"abc"},
+            gada_config={},
+            stdout=stdout,
+        )
+    )
+
+    assert outputs == {}
+    assert stdout.getvalue() == b"ABC"
+
+
+def test_context_stream(capsys):
+    """Test a stream output is fed to a generic node from a program"""
+    from gada import typing, runners
+    from gada.node import NodeCall
+    from gada.program import Context
+
+    stream_of_str = typing.StreamType(typing.StringType())
+    produce = Node.from_config(
+        {
+            "name": "produce",
+            "runner": "stream_runner",
+            "outputs": [{"name": "items", "type": stream_of_str}],
+        }
+    )
+    upper = _node(UPPER, inputs=[{"name": "stdin", "type": stream_of_str}])
+
+    class Runner:
+        @staticmethod
+        def run(node: Node, inputs: dict, **kwargs) -> dict:
+            return {"items": (_ for _ in "abc")}
+
+    calls = [
+        NodeCall.from_config({"name": "produce", "id": "p"}),
+        NodeCall.from_config(
+            {"name": "python", "id": "u", "inputs": {"stdin": "{{ p.items }}"}}
+        ),
+    ]
+    cxt = Context(
+        calls,
+        load_node={"produce": produce, "python": upper}.__getitem__,
+        load_runner=lambda _: Runner if _ == "stream_runner" else runners.load(_),
+    )
+    while not cxt.is_done:
+        cxt = cxt.step()
+
+    assert capsys.readouterr().out == "A\nB\nC\n"
@@ -0,0 +1,32 @@
+"""Tests on the import time of ``gada``"""
+from __future__ import annotations
+import os
+import sys
+import subprocess
+import pytest
+
+HEAVY_MODULES = ["yaml", "jsonschema", "argparse", "asyncio", "gada.typing"]
+
+
+def _imported_modules(code: str) -> set[str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.join(os.path.dirname(__file__), "..")
+    proc = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys\nprint(' '.join(sys.modules))"],
+        env=env,
+        stdout=subprocess.PIPE,
+        check=True,
+        text=True,
+    )
+    return set(proc.stdout.split())
+
+
+@pytest.mark.parametrize("module", HEAVY_MODULES)
+def test_import_gada_is_lazy(module):
+    """Test ``import gada`` doesn't load heavy dependencies"""
+    assert module not in _imported_modules("import gada")
+
+
+def test_lazy_submodule():
+    """Test submodules are imported on first access"""
+    assert "gada.datadir" in _imported_modules("import gada\ngada.datadir.path()")
@@ -0,0 +1,103 @@
+"""Tests on the ``gada.incremental`` module"""
+from __future__ import annotations
+import os
+from types import SimpleNamespace
+from gada import incremental
+from gada.nodeutil import NodeCall, PackageInfo
+
+
+def _step(*, package_info=None, call=None, **config) -> SimpleNamespace:
+    return SimpleNamespace(
+        node=SimpleNamespace(config={"name": "a", **config}, package_info=package_info),
+        call=call if call is not None else NodeCall("a", id="a"),
+    )
+
+
+def test_fingerprint():
+    """Test fingerprints depend on node, inputs and files"""
+    assert incremental.fingerprint(_step(), {"a": 1}) == incremental.fingerprint(
+        _step(), {"a": 1}
+    )
+    assert incremental.fingerprint(_step(), {"a": 1}) != incremental.fingerprint(
+        _step(), {"a": 2}
+    )
+    assert incremental.fingerprint(_step(), {}) != incremental.fingerprint(
+        _step(version="2"), {}
+    )
+
+
+def test_fingerprint_depends(tmp_path):
+    """Test fingerprints change when a declared file changes"""
+    file = tmp_path / "data.csv"
+    file.write_text("a\n")
+    step = _step(depends=[str(file)])
+    before = incremental.fingerprint(step, {})
+    assert incremental.fingerprint(step, {}) == before
+
+    file.write_text("a\nb\n")
+    assert incremental.fingerprint(step, {}) != before
+
+    os.remove(file)
+    assert incremental.fingerprint(step, {}) != before
+
+
+def test_fingerprint_depends_relative(tmp_path, monkeypatch):
+    """Test relative files are found next to the node or the program"""
+    package = tmp_path / "mypackage"
+    package.mkdir()
+    (package / "gada.yml").write_text("nodes: []\n")
+    (package / "data.csv").write_text("a\n")
+    (tmp_path / "prog.yml").write_text("steps: []\n")
+    (tmp_path / "input.csv").write_text("a\n")
+    # relative paths don't depend on the current directory
+    monkeypatch.chdir(package)
+
+    info = PackageInfo(tmp_path, "mypackage", package / "gada.yml")
+    step = _step(package_info=info, depends=["data.csv"])
+    before = incremental.fingerprint(step, {})
+    (package / "data.csv").write_text("a\nb\n")
+    assert incremental.fingerprint(step, {}) != before
+
+    # steps of a program know its file
+    from gada.program import Program
+
+    p = Program.from_config(
+        {
+            "file": tmp_path / "prog.yml",
+            "steps": [{"name": "a", "id": "a", "depends": ["input.csv"]}],
+        }
+    )
+    step = _step(call=p._steps[0])
+    before = incremental.fingerprint(step, {})
+    monkeypatch.chdir(tmp_path.parent)
+    assert incremental.fingerprint(step, {}) == before
+
+    (tmp_path / "input.csv").write_text("a\nb\n")
+    assert incremental.fingerprint(step, {}) != before
+
+
+def test_state(tmp_path):
+    """Test outputs of seen steps are stored"""
+    path = tmp_path / "state.pickle"
+    state = incremental.IncrementalState(path)
+    assert state.get("a") == (False, None)
+    state.set("a", {"out": 1})
+    state.set("b", {"out": 2})
+    state.save()
+
+    state = incremental.IncrementalState(path)
+    assert state.get("a") == (True, {"out": 1})
+    state.save()
+    assert state.stats == {"reused": 1, "executed": 0}
+
+    # only steps seen during the last run are kept
+    state = incremental.IncrementalState(path)
+    assert state.get("b") == (False, None)
+
+
+def test_state_not_executed(tmp_path):
+    """Test outputs found elsewhere are recorded as reused"""
+    state = incremental.IncrementalState(tmp_path / "state.pickle")
+    state.set("a", {"out": 1}, executed=False)
+    assert state.stats == {"reused": 1, "executed": 0}
+    assert state.get("a") == (True, {"out": 1})
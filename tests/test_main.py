@@ -0,0 +1,77 @@
+"""Tests on the ``gada`` command-line interface"""
+from __future__ import annotations
+import pytest
+import yaml
+import gada
+from gada.node import Node
+
+
+def mock_loaders(fail: list) -> tuple:
+    NODES = {
+        name: Node.from_config(
+            {
+                "name": name,
+                "runner": "mock_runner",
+                "inputs": [{"name": "in"}],
+                "outputs": [{"name": "out", "type": "int"}],
+            }
+        )
+        for name in ("A", "B")
+    }
+    runs = []
+
+    class Runner:
+        @staticmethod
+        def run(node: Node, inputs: dict, **kwargs) -> dict:
+            if node.name == "B" and fail[0]:
+                raise Exception("transient failure")
+
+            runs.append(node.name)
+            return {"out": int(inputs["in"]) + 1}
+
+    return NODES.__getitem__, lambda _: Runner, runs
+
+
+def test_run_program_resume(tmp_path, monkeypatch):
+    """Test a program is resumed from the command line"""
+    from gada import plan, runners, datadir, checkpoint
+    from gada.program import Program
+
+    fail = [True]
+    load_node, load_runner, runs = mock_loaders(fail)
+    monkeypatch.setattr(datadir, "path", lambda: tmp_path)
+    monkeypatch.setattr(plan, "default_load_node", load_node)
+    monkeypatch.setattr(runners, "load", load_runner)
+
+    path = tmp_path / "prog.yml"
+    path.write_text(
+        yaml.safe_dump(
+            {
+                "name": "resume",
+                "steps": [
+                    {"name": "A", "id": "a", "inputs": {"in": "{{ x }}"}},
+                    {"name": "B", "id": "b", "inputs": {"in": "{{ a.out }}"}},
+                ],
+            }
+        )
+    )
+    with pytest.raises(Exception, match="transient failure"):
+        gada.main(["gada", "run", "--checkpoint-every", "1", str(path), "x=1"])
+
+    assert runs == ["A"]
+    ckpt = checkpoint.path(Program.load(str(path))._state_name())
+    assert ckpt.is_file()
+
+    # the program continues after "a" without reading inputs again
+    fail[0] = False
+    gada.main(["gada", "run", "--resume", str(path)])
+    assert runs == ["A", "B"]
+    assert not ckpt.is_file()
+
+
+def test_index_requires_command(capsys):
+    """Test ``gada index`` without sub-command prints the usage"""
+    with pytest.raises(SystemExit):
+        gada.main(["gada", "index"])
+
+    assert "usage" in capsys.readouterr().err
@@ -0,0 +1,128 @@
+"""Tests on the ``gada.memo`` module"""
+from __future__ import annotations
+from types import SimpleNamespace
+from gada import memo
+
+
+def _node(**config) -> SimpleNamespace:
+    return SimpleNamespace(config={"name": "a", "deterministic": True, **config})
+
+
+def test_stable_hash():
+    """Test values with the same content have the same hash"""
+    assert memo.stable_hash({"a": [1, 2], "b": None}) == memo.stable_hash(
+        {"b": None, "a": [1, 2]}
+    )
+    assert memo.stable_hash([1, 2]) != memo.stable_hash((1, 2))
+    assert memo.stable_hash(1) != memo.stable_hash("1")
+    assert memo.stable_hash(1) != memo.stable_hash(True)
+
+
+def test_key():
+    """Test keys depend on node version and inputs"""
+    assert memo.key(_node(), {"a": 1}) == memo.key(_node(), {"a": 1})
+    assert memo.key(_node(), {"a": 1}) != memo.key(_node(), {"a": 2})
+    assert memo.key(_node(), {"a": 1}) != memo.key(_node(version="2"), {"a": 1})
+
+
+def test_is_deterministic():
+    """Test nodes are only deterministic when declared so"""
+    assert memo.is_deterministic(_node())
+    assert not memo.is_deterministic(SimpleNamespace(config={"name": "a"}))
+
+
+def test_key_package():
+    """Test nodes with the same name from different packages have different keys"""
+    a = SimpleNamespace(package_info=SimpleNamespace(name="pkga"), **vars(_node()))
+    b = SimpleNamespace(package_info=SimpleNamespace(name="pkgb"), **vars(_node()))
+    assert memo.key(a, {"a": 1}) != memo.key(b, {"a": 1})
+
+
+def test_copy():
+    """Test stored and returned outputs are copies"""
+    cache = memo.MemoCache()
+    outputs = {"out": [1]}
+    cache.set("a", outputs)
+    outputs["out"].append(2)
+    found, outputs = cache.get("a")
+    assert outputs == {"out": [1]}
+
+    outputs["out"].append(3)
+    assert cache.get("a") == (True, {"out": [1]})
+
+
+def test_lru():
+    """Test least recently used outputs are evicted"""
+    cache = memo.MemoCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)
+
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.stats == {"hits": 2, "misses": 1, "size": 2}
+
+
+def test_ttl(monkeypatch):
+    """Test outputs expire"""
+    now = [1000.0]
+    monkeypatch.setattr(memo.time, "time", lambda: now[0])
+    cache = memo.MemoCache(ttl=10)
+    cache.set("a", 1)
+    assert cache.get("a") == (True, 1)
+
+    now[0] += 11
+    assert cache.get("a") == (False, None)
+
+
+def test_disk(tmp_path):
+    """Test outputs are shared through the disk"""
+    memo.MemoCache(path=tmp_path).set("ab", {"out": 1})
+
+    cache = memo.MemoCache(path=tmp_path)
+    assert cache.get("ab") == (True, {"out": 1})
+    assert cache.get("cd") == (False, None)
+
+
+def test_disk_max_bytes(tmp_path):
+    """Test oldest stored outputs are removed"""
+    cache = memo.MemoCache(maxsize=0, path=tmp_path, max_bytes=100)
+    for i in range(10):
+        cache.set(f"k{i}", b"x" * 40)
+
+    assert sum(_.stat().st_size for _ in tmp_path.glob("*/*.pickle")) <= 100
+    assert cache.get("k9")[0]
+    assert not cache.get("k0")[0]
+
+
+def test_disk_threads(tmp_path, monkeypatch):
+    """Test threads storing the same outputs don't share a temporary file"""
+    import threading
+
+    tmp_files = []
+    _open = open
+
+    def record_open(file, *args, **kwargs):
+        if str(file).endswith(".tmp"):
+            tmp_files.append(str(file))
+        return _open(file, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", record_open)
+    cache = memo.MemoCache(path=tmp_path)
+    # threads are kept alive so that they have distinct ids
+    barrier = threading.Barrier(4)
+
+    def store(i: int) -> None:
+        cache.set("ab", {"out": i})
+        barrier.wait()
+
+    threads = [threading.Thread(target=store, args=(i,)) for i in range(4)]
+    for _ in threads:
+        _.start()
+    for _ in threads:
+        _.join()
+
+    assert len(set(tmp_files)) == 4
+    assert not list(tmp_path.glob("*/*.tmp"))
+    assert memo.MemoCache(path=tmp_path).get("ab")[0]
@@ -0,0 +1,111 @@
+"""Tests on the ``gada.nodeindex`` module"""
+from __future__ import annotations
+import os
+from pathlib import Path
+import yaml
+from gada import nodeindex
+
+
+def _write_package(root: Path, name: str, config: dict) -> Path:
+    package = root / name
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    gada_yml_path = package / "gada.yml"
+    gada_yml_path.write_text(yaml.safe_dump(config))
+    return gada_yml_path
+
+
+def test_build(tmp_path):
+    """Test indexing a package with nodes"""
+    _write_package(tmp_path, "pkga", {"nodes": [{"name": "a"}, {"name": "b"}]})
+
+    index = nodeindex.build([str(tmp_path)])
+    assert [_["name"] for _ in index["packages"]] == ["pkga"]
+    assert [(_["name"], _["package"]) for _ in index["nodes"]] == [
+        ("a", "pkga"),
+        ("b", "pkga"),
+    ]
+    assert nodeindex.is_fresh(index, [str(tmp_path)])
+
+
+def test_dump_load(tmp_path):
+    """Test writing the index to disk and loading it back"""
+    site = tmp_path / "site"
+    site.mkdir()
+    _write_package(site, "pkga", {"nodes": [{"name": "a"}]})
+    file = tmp_path / "index.json"
+
+    index = nodeindex.build([str(site)])
+    nodeindex.dump(index, file)
+    loaded = nodeindex.load(file)
+    assert loaded["nodes"] == index["nodes"]
+    assert nodeindex.is_fresh(loaded, [str(site)])
+
+
+def test_load_missing(tmp_path):
+    """Test loading an index that doesn't exist"""
+    assert nodeindex.load(tmp_path / "index.json") is None
+
+
+def test_stale_on_gada_yml_change(tmp_path):
+    """Test the index is stale when a ``gada.yml`` is modified"""
+    gada_yml_path = _write_package(tmp_path, "pkga", {"nodes": [{"name": "a"}]})
+
+    index = nodeindex.build([str(tmp_path)])
+    gada_yml_path.write_text(yaml.safe_dump({"nodes": [{"name": "abc"}]}))
+    assert not nodeindex.is_fresh(index, [str(tmp_path)])
+
+
+def test_stale_on_new_package(tmp_path):
+    """Test the index is stale when a package is installed"""
+    _write_package(tmp_path, "pkga", {"nodes": [{"name": "a"}]})
+
+    index = nodeindex.build([str(tmp_path)])
+    st = os.stat(tmp_path)
+    _write_package(tmp_path, "pkgb", {"nodes": [{"name": "b"}]})
+    # Make sure the mtime changed on filesystems with a coarse resolution
+    os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert not nodeindex.is_fresh(index, [str(tmp_path)])
+
+
+def test_stale_on_sys_path_change(tmp_path):
+    """Test the index is stale when **sys.path** is different"""
+    index = nodeindex.build([str(tmp_path)])
+    assert not nodeindex.is_fresh(index, [str(tmp_path), str(tmp_path / "other")])
+
+
+def test_stale_on_gada_yml_added(tmp_path):
+    """Test the index is stale when a ``gada.yml`` is added to a package"""
+    package = tmp_path / "pkga"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+
+    index = nodeindex.build([str(tmp_path)])
+    assert not index["packages"]
+    st = os.stat(package)
+    (package / "gada.yml").write_text(yaml.safe_dump({"nodes": [{"name": "a"}]}))
+    os.utime(package, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert not nodeindex.is_fresh(index, [str(tmp_path)])
+
+
+def test_current_directory_not_indexed(tmp_path, monkeypatch):
+    """Test the empty **sys.path** entry doesn't depend on the current directory"""
+    monkeypatch.chdir(tmp_path)
+    _write_package(tmp_path, "pkga", {"nodes": [{"name": "a"}]})
+
+    index = nodeindex.build(["", str(tmp_path / "site")])
+    assert not index["packages"]
+    monkeypatch.chdir(tmp_path.parent)
+    assert nodeindex.is_fresh(index, ["", str(tmp_path / "site")])
+
+
+def test_status_strategy(tmp_path, monkeypatch):
+    """Test the status of an index built with another strategy"""
+    file = tmp_path / "index.json"
+    site = tmp_path / "site"
+    site.mkdir()
+    monkeypatch.setattr("sys.path", [str(site)])
+    nodeindex.dump(nodeindex.build(strategy="filesystem"), file)
+
+    assert nodeindex.status(file, strategy="filesystem")["fresh"]
+    assert not nodeindex.status(file, strategy="auto")["fresh"]
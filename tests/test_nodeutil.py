@@ -0,0 +1,214 @@
+"""Tests on the ``gada.nodeutil`` module"""
+from __future__ import annotations
+from pathlib import Path
+import pytest
+from gada import nodeutil
+
+
+def _nodes(package: str, *names: str) -> list[nodeutil.NodeInfo]:
+    info = nodeutil.PackageInfo(
+        path=Path("site"), name=package, gada_yml_path=Path("site", package, "gada.yml")
+    )
+    return [nodeutil.NodeInfo(package_info=info, config={"name": _}) for _ in names]
+
+
+def test_registry_get():
+    """Test finding nodes by name and qualified name"""
+    registry = nodeutil.NodeRegistry(_nodes("pkga", "a", "b"))
+
+    assert len(registry) == 2
+    assert registry.get("a").config["name"] == "a"
+    assert registry.get("pkga/b").config["name"] == "b"
+    assert "pkga/a" in registry
+    assert not registry.duplicates
+
+
+def test_registry_get_not_found():
+    """Test **None** is returned for unknown nodes"""
+    registry = nodeutil.NodeRegistry(_nodes("pkga", "a"))
+
+    assert registry.get("b") is None
+    assert registry.get("pkgb/a") is None
+
+
+def test_registry_duplicates():
+    """Test nodes with the same name in multiple packages"""
+    registry = nodeutil.NodeRegistry(_nodes("pkga", "a") + _nodes("pkgb", "a"))
+
+    # First package wins
+    assert registry.get("a").package_info.name == "pkga"
+    assert registry.get("pkgb/a").package_info.name == "pkgb"
+    assert [_.package_info.name for _ in registry.duplicates["a"]] == [
+        "pkga",
+        "pkgb",
+    ]
+
+
+def test_registry_same_package():
+    """Test the first package in sys.path order wins for qualified names"""
+    first = _nodes("pkga", "a")
+    registry = nodeutil.NodeRegistry(first + _nodes("pkga", "a"))
+
+    assert registry.get("pkga/a") is first[0]
+    assert registry.get("a") is first[0]
+
+
+def _write_packages(root: Path, count: int) -> None:
+    for i in range(count):
+        package = root / f"pkg{i:02}"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "gada.yml").write_text(f"nodes:\n- name: node{i}\n")
+    # Module without gada.yml
+    (root / "plain.py").write_text("")
+
+
+@pytest.mark.parametrize("mode", ["serial", "thread", "process"])
+def test_discover(tmp_path, mode):
+    """Test discovering packages in each mode gives the same ordered results"""
+    _write_packages(tmp_path, 8)
+
+    results = nodeutil.discover([str(tmp_path)], mode=mode, workers=2)
+    assert [p.name for p, _ in results] == [f"pkg{i:02}" for i in range(8)]
+    assert [c["nodes"][0]["name"] for _, c in results] == [f"node{i}" for i in range(8)]
+
+
+def test_discover_invalid_mode(tmp_path):
+    """Test an error is raised for unknown discovery modes"""
+    _write_packages(tmp_path, 2)
+
+    with pytest.raises(Exception):
+        nodeutil.discover([str(tmp_path)], mode="invalid")
+
+
+def _write_site(root: Path) -> None:
+    """Write a site directory where only **pkga** is advertised."""
+    for name in ("pkga", "pkgb"):
+        package = root / name
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "gada.yml").write_text(f"nodes:\n- name: {name}node\n")
+
+    dist_info = root / "pkga-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Name: pkga\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text("[gada.packages]\npkga = pkga\n")
+
+
+def test_iter_packages_filesystem(tmp_path):
+    """Test finding packages by probing modules"""
+    _write_site(tmp_path)
+
+    packages = nodeutil.iter_packages([str(tmp_path)], strategy="filesystem")
+    assert [_.name for _ in packages] == ["pkga", "pkgb"]
+
+
+def test_iter_packages_entry_points(tmp_path):
+    """Test finding packages advertised with entry points"""
+    _write_site(tmp_path)
+
+    packages = list(nodeutil.iter_packages([str(tmp_path)], strategy="entry_points"))
+    assert [_.name for _ in packages] == ["pkga"]
+    assert packages[0].gada_yml_path == tmp_path / "pkga" / "gada.yml"
+
+
+def _write_dev(root: Path, *names: str) -> None:
+    """Write a development tree with some packages."""
+    root.mkdir()
+    for name in names:
+        (root / name).mkdir()
+        (root / name / "__init__.py").write_text("")
+        (root / name / "gada.yml").write_text(f"nodes:\n- name: {name}node\n")
+
+
+def test_iter_packages_auto(tmp_path):
+    """Test development trees are scanned in addition to entry points"""
+    site = tmp_path / "site-packages"
+    site.mkdir()
+    _write_site(site)
+    dev = tmp_path / "dev"
+    _write_dev(dev, "pkgc")
+
+    packages = nodeutil.iter_packages([str(site), str(dev)], strategy="auto")
+    assert [_.name for _ in packages] == ["pkga", "pkgc"]
+
+
+def test_iter_packages_auto_shadowing(tmp_path):
+    """Test the first package on the path wins like when importing it"""
+    site = tmp_path / "site-packages"
+    site.mkdir()
+    _write_site(site)
+    dev = tmp_path / "dev"
+    _write_dev(dev, "pkga")
+    # metadata of a project installed with "pip install -e"
+    (dev / "pkga.egg-info").mkdir()
+
+    packages = list(nodeutil.iter_packages([str(dev), str(site)], strategy="auto"))
+    assert [_.name for _ in packages] == ["pkga"]
+    assert packages[0].gada_yml_path == dev / "pkga" / "gada.yml"
+
+    packages = list(nodeutil.iter_packages([str(site), str(dev)], strategy="auto"))
+    assert packages[0].gada_yml_path == site / "pkga" / "gada.yml"
+
+
+CLI_INPUTS = [
+    [{"name": "a"}],
+    [{"name": "a"}, {"name": "b"}],
+    [{"name": "a", "nargs": "?"}],
+    [{"name": "a", "nargs": "*"}],
+    [{"name": "a", "nargs": "+"}],
+    [{"name": "a", "nargs": 2}],
+    [{"name": "a"}, {"name": "b", "nargs": "*"}],
+    [{"name": "a", "nargs": "*"}, {"name": "b"}],
+    [{"name": "a", "nargs": "+"}, {"name": "b", "nargs": "?"}],
+    [{"name": "a", "nargs": "?"}, {"name": "b", "nargs": "+"}, {"name": "c"}],
+]
+
+
+def _cli_node(inputs: list[dict]) -> nodeutil.NodeInfo:
+    node = _nodes("pkga", "cli")[0]
+    node.config["input"] = inputs
+    return node
+
+
+@pytest.mark.parametrize("inputs", CLI_INPUTS)
+@pytest.mark.parametrize("count", range(5))
+def test_cli_spec_parse(inputs, count):
+    """Test the fast path parses like argparse"""
+    node = _cli_node(inputs)
+    argv = [f"v{i}" for i in range(count)]
+
+    try:
+        expected = vars(nodeutil.create_parser(node).parse_args(args=argv))
+    except SystemExit:
+        expected = None
+
+    assert nodeutil.CliSpec.from_node(node).parse(argv) == expected
+
+
+def test_cli_spec_fallback():
+    """Test options and actions are left to argparse"""
+    spec = nodeutil.CliSpec("cli", [{"name": "a"}])
+    assert spec.is_simple
+    assert spec.parse(["-h"]) is None
+
+    spec = nodeutil.CliSpec("cli", [{"name": "a", "action": "store"}])
+    assert not spec.is_simple
+    assert spec.parse(["x"]) is None
+
+
+def test_cli_spec_config():
+    """Test serializing a spec for the node index"""
+    spec = nodeutil.CliSpec("cli", [{"name": "a", "nargs": "*"}])
+    loaded = nodeutil.CliSpec.from_config(spec.to_config())
+    assert loaded.parse(["x", "y"]) == {"a": ["x", "y"]}
+
+
+def test_parse_args():
+    """Test parsing arguments for a node with a cached spec"""
+    node = _cli_node([{"name": "a"}, {"name": "b", "nargs": "*"}])
+
+    assert nodeutil.parse_args(node, ["x", "y"]) == {"a": "x", "b": ["y"]}
+    assert nodeutil.get_cli_spec(node) is node.cli_spec
+    with pytest.raises(SystemExit):
+        nodeutil.parse_args(node, [])
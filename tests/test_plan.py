@@ -0,0 +1,51 @@
+"""Tests on the ``gada.plan`` module"""
+from __future__ import annotations
+from types import SimpleNamespace
+import pytest
+from gada.plan import Binding, parse_binding, readers
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (1, Binding("in", Binding.LITERAL, value=1)),
+        ("hello", Binding("in", Binding.LITERAL, value="hello")),
+        ("{{ a }}", Binding("in", Binding.VARIABLE, id="a")),
+        ("{{a.out}}", Binding("in", Binding.OUTPUT, id="a", output="out")),
+        (
+            " { { a . out } } ",
+            Binding("in", Binding.LITERAL, value=" { { a . out } } "),
+        ),
+    ],
+)
+def test_parse_binding(value, expected):
+    assert parse_binding("in", value) == expected
+
+
+def _step(id, outputs=(), pure=False, **inputs) -> SimpleNamespace:
+    return SimpleNamespace(
+        call=SimpleNamespace(id=id),
+        node=SimpleNamespace(is_pure=pure),
+        bindings=tuple(parse_binding(k, v) for k, v in inputs.items()),
+        outputs=dict.fromkeys(outputs),
+    )
+
+
+def test_readers():
+    plan = [
+        _step("a", ["x"]),
+        _step("b", ["y"], i="{{ a.x }}", j="{{ x }}"),
+        _step("c", ["x"], i="{{ x }}"),
+        # reads "x" written by "c" and the output of "a"
+        _step("d", i="{{ x }}", j="{{ a.x }}", k=1),
+        _step("e", ["z"], pure=True),
+        _step("f", i="{{ z }}", j="{{ e.z }}"),
+    ]
+    assert [dict(_) for _ in readers(plan)] == [
+        {"x": 4},
+        {"y": 0},
+        {"x": 1},
+        {},
+        {"z": 1},
+        {},
+    ]
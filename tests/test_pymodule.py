@@ -0,0 +1,65 @@
+"""Tests on the ``gada.runners.pymodule`` runner"""
+from __future__ import annotations
+from types import SimpleNamespace
+import pytest
+from gada.runners import pymodule
+
+
+def _node(**config) -> SimpleNamespace:
+    # ``dict(**inputs)`` returns the inputs as outputs, the name is only
+    # in the configuration as for **NodeInfo**
+    return SimpleNamespace(
+        config={"name": "echo", "entrypoint": "builtins.dict", **config}
+    )
+
+
+@pytest.fixture
+def pool():
+    pymodule.configure(workers=1, max_tasks_per_child=2)
+    yield
+    pymodule.shutdown()
+    pymodule.configure()
+
+
+def test_run_inline():
+    """Test running an entrypoint in the current process"""
+    assert pymodule.run(_node(), inputs={"a": 1}) == {"a": 1}
+
+
+def test_run_unknown_executor():
+    """Test an unknown executor is reported"""
+    with pytest.raises(Exception, match="unknown executor gpu for node echo"):
+        pymodule.run(_node(), inputs={}, executor="gpu")
+
+
+def test_run_process(pool):
+    """Test running an entrypoint in worker processes"""
+    node = _node(executor="process")
+    # more runs than a worker can do before being replaced
+    for i in range(5):
+        assert pymodule.run(node, inputs={"a": i}) == {"a": i}
+
+    # executor selected by the caller
+    assert pymodule.run(_node(), inputs={"a": 1}, executor="process") == {"a": 1}
+
+
+def test_run_process_not_picklable(pool):
+    """Test inputs that can't be sent to a worker are reported"""
+    with pytest.raises(Exception, match="node echo can't be sent to a worker"):
+        pymodule.run(_node(executor="process"), inputs={"a": lambda: None})
+
+
+def test_run_process_shared_memory(pool):
+    """Test large buffers are exchanged with workers through shared memory"""
+    import array
+    from gada import shm
+
+    data = b"x" * (shm.THRESHOLD + 1)
+    values = array.array("d", range(shm.THRESHOLD // 8 + 1))
+    outputs = pymodule.run(
+        _node(executor="process"), inputs={"data": data, "values": values, "a": 1}
+    )
+
+    assert outputs == {"data": data, "values": values, "a": 1}
+    # segments are removed once the node is done
+    assert not shm._EXPORTED
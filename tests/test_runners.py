@@ -13,3 +13,30 @@ def test_load_not_found():
     """Test loading invalid runner."""
     with pytest.raises(Exception):
         runners.load("invalid")
+
+
+def test_load_cached():
+    """Test loading the same runner twice returns the cached runner."""
+    assert runners.load("generic") is runners.load("generic")
+
+
+def test_refresh(monkeypatch):
+    """Test runners are searched again after refresh."""
+    runners.load("generic")
+
+    calls = []
+    scan = runners._scan
+    monkeypatch.setattr(runners, "_scan", lambda: calls.append(1) or scan())
+    runners.load("generic")
+    assert not calls, "runners should not be searched again"
+
+    runners.refresh()
+    assert hasattr(runners.load("generic"), "run"), "invalid module"
+    assert calls, "runners should be searched again"
+
+
+def test_generic_native_async():
+    """Test the generic runner has a native arun used by runners.arun."""
+    import inspect
+
+    assert inspect.iscoroutinefunction(runners.load("generic").arun)
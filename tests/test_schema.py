@@ -0,0 +1,93 @@
+"""Tests on the ``gada._schema`` module"""
+from __future__ import annotations
+from pathlib import Path
+import pytest
+import jsonschema
+import gada
+from gada import _schema
+
+SCHEMA_PATH = Path(gada.__file__).parent / "gada.yml.schema"
+
+VALID_CONFIG = {"nodes": [{"name": "a"}]}
+
+INVALID_CONFIG = {"nodes": [{"runner": "pymodule"}]}
+
+
+@pytest.fixture(autouse=True)
+def clear_schema():
+    _schema.clear()
+    yield
+    _schema.clear()
+    _schema.set_production(False)
+
+
+def test_validator_compiled_once():
+    """Test the same validator is returned for a schema"""
+    assert _schema.validator(SCHEMA_PATH) is _schema.validator(SCHEMA_PATH)
+
+
+def test_validate():
+    """Test validating a valid configuration"""
+    _schema.validate(VALID_CONFIG, SCHEMA_PATH)
+
+
+def test_validate_fail():
+    """Test an error is raised for an invalid configuration"""
+    with pytest.raises(jsonschema.ValidationError):
+        _schema.validate(INVALID_CONFIG, SCHEMA_PATH)
+
+    # Invalid results are not cached
+    with pytest.raises(jsonschema.ValidationError):
+        _schema.validate(INVALID_CONFIG, SCHEMA_PATH)
+
+
+def test_validate_cached(monkeypatch):
+    """Test a configuration with the same content is not validated again"""
+    _schema.validate(VALID_CONFIG, SCHEMA_PATH)
+
+    monkeypatch.setattr(_schema, "validator", None)
+    _schema.validate({"nodes": [{"name": "a"}]}, SCHEMA_PATH)
+
+
+def test_validate_modified():
+    """Test a configuration modified in place is validated again"""
+    config = {"nodes": [{"name": "a"}]}
+    _schema.validate(config, SCHEMA_PATH)
+
+    del config["nodes"][0]["name"]
+    with pytest.raises(jsonschema.ValidationError):
+        _schema.validate(config, SCHEMA_PATH)
+
+
+def test_validate_production(monkeypatch):
+    """Test the same object is not hashed again in production mode"""
+    _schema.set_production(True)
+    config = {"nodes": [{"name": "a"}]}
+    _schema.validate(config, SCHEMA_PATH)
+
+    monkeypatch.setattr(_schema, "_digest", None)
+    _schema.validate(config, SCHEMA_PATH)
+
+
+def test_validate_bounded(monkeypatch):
+    """Test only the most recently used results are kept"""
+    monkeypatch.setattr(_schema, "MAX_CACHED", 2)
+    _schema.set_production(True)
+    configs = [{"nodes": [{"name": str(i)}]} for i in range(3)]
+    for _ in configs:
+        _schema.validate(_, SCHEMA_PATH)
+    # the first configuration is the least recently used
+    _schema.validate(configs[1], SCHEMA_PATH)
+
+    key = str(SCHEMA_PATH)
+    assert list(_schema._VALID_OBJECTS[key].values()) == [configs[2], configs[1]]
+    assert len(_schema._VALID_DIGESTS[key]) == 2
+
+
+def test_validate_file_digest(monkeypatch):
+    """Test a configuration parsed from a file is not hashed"""
+    _schema.validate(VALID_CONFIG, SCHEMA_PATH, digest="abc")
+
+    monkeypatch.setattr(_schema, "_digest", None)
+    monkeypatch.setattr(_schema, "validator", None)
+    _schema.validate({"nodes": [{"name": "a"}]}, SCHEMA_PATH, digest="abc")
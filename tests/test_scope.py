@@ -0,0 +1,61 @@
+"""Tests on the ``gada.scope`` module"""
+from __future__ import annotations
+import pytest
+from gada.scope import Scope
+
+
+def test_lookup():
+    """Test variables are looked up in parents"""
+    root = Scope({"a": 1, "b": 2})
+    child = root.child({"b": 3}).child({"c": 4})
+
+    assert child["a"] == 1
+    assert child["b"] == 3
+    assert child.get("d") is None
+    assert child.local("a") is None
+    assert child.locals() == {"c": 4}
+    assert "a" in child and "d" not in child
+    assert dict(child) == {"a": 1, "b": 3, "c": 4}
+    with pytest.raises(KeyError):
+        child["d"]
+
+
+def test_parent_modified():
+    """Test children see modifications of their parents"""
+    root = Scope({"a": 1})
+    middle = root.child()
+    child = middle.child()
+    assert child["a"] == 1
+
+    root.set("a", 2)
+    assert child["a"] == 2
+
+    middle.update({"a": 3})
+    assert child["a"] == 3
+
+    middle.discard("a")
+    assert child["a"] == 2
+
+
+def test_snapshot():
+    """Test snapshots are not modified by later writes"""
+    root = Scope({"a": 1})
+    child = root.child({"b": 2})
+    root_snapshot = root.snapshot()
+    child_snapshot = child.snapshot()
+
+    root.set("a", 3)
+    child.set("b", 4)
+    assert root_snapshot == {"a": 1}
+    assert child_snapshot == {"a": 1, "b": 2}
+    assert child.snapshot() == {"a": 3, "b": 4}
+
+    with pytest.raises(TypeError):
+        child_snapshot["a"] = 5
+
+
+def test_vars_copied():
+    """Test initial variables are not modified"""
+    vars = {"a": 1}
+    Scope(vars).set("a", 2)
+    assert vars == {"a": 1}
@@ -0,0 +1,89 @@
+"""Tests on the ``gada.shm`` module"""
+from __future__ import annotations
+import array
+import pytest
+from gada import shm
+
+
+def test_is_shareable():
+    """Test only large enough buffers are shared"""
+    assert shm.is_shareable(b"xx", threshold=2)
+    assert shm.is_shareable(bytearray(2), threshold=2)
+    assert shm.is_shareable(array.array("i", [1]), threshold=4)
+    assert not shm.is_shareable(b"x", threshold=2)
+    assert not shm.is_shareable("xx", threshold=2)
+    assert not shm.is_shareable([1, 2], threshold=0)
+
+
+def test_export():
+    """Test exporting a value and mapping it"""
+    data = array.array("d", [1.5, 2.5])
+    handle = shm.export(data)
+    assert handle.nbytes == 16 and handle.format == "d"
+
+    with shm.attach(handle) as view:
+        assert view.readonly
+        assert view.tolist() == [1.5, 2.5]
+
+    shm.release(handle)
+    assert not shm._EXPORTED
+
+
+def test_export_refcount():
+    """Test the same value is placed once and released by its last reference"""
+    data = b"abc"
+    handle = shm.export(data)
+    assert shm.export(data) is handle
+
+    shm.release(handle)
+    with shm.attach(handle) as view:
+        assert bytes(view) == data
+
+    shm.release(handle)
+    with pytest.raises(FileNotFoundError):
+        shm.attach(handle)
+
+
+def test_attach_exported_view():
+    """Test a segment stays mapped while buffers of its view are in use"""
+    handle = shm.export(b"abc")
+    mapped = shm.attach(handle)
+    exported = memoryview(mapped.view)
+
+    assert not mapped.close()
+    assert bytes(exported) == b"abc"
+    exported.release()
+    assert mapped.close()
+    shm.release(handle)
+
+
+def test_share_take():
+    """Test passing the ownership of a segment"""
+    handle = shm.share(array.array("i", [1, 2]))
+    view = shm.take(handle)
+    assert isinstance(view, memoryview) and view.readonly
+    assert view == array.array("i", [1, 2])
+
+    handle = shm.share(bytearray(b"abc"))
+    assert shm.take(handle) == b"abc"
+    with pytest.raises(FileNotFoundError):
+        shm.take(handle)
+
+
+def test_take_lifetime():
+    """Test views of a taken value keep the segment mapped"""
+    import gc
+    import weakref
+
+    view = shm.take(shm.share(b"abcd"))
+    # the array owning the segment
+    owner = weakref.ref(view.obj)
+    part = view[1:3]
+    del view
+    gc.collect()
+    assert owner() is not None
+    assert part == b"bc"
+
+    del part
+    gc.collect()
+    assert owner() is None
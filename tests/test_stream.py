@@ -0,0 +1,67 @@
+"""Tests on the ``gada.stream`` module"""
+from __future__ import annotations
+import threading
+import pytest
+from gada.stream import Stream
+
+
+def test_single_reader():
+    """Test items are not buffered with a single reader"""
+    s = Stream(iter(range(100)))
+    assert list(s.reader()) == list(range(100))
+    assert len(s._buffer) == 1, "only the end of stream should be buffered"
+
+
+def test_sequential_readers():
+    """Test items are kept for readers created later"""
+    s = Stream(iter(range(10)), readers=3)
+    assert [list(s.reader()) for _ in range(3)] == [list(range(10))] * 3
+
+
+def test_closed_reader():
+    """Test closed readers don't retain items"""
+    s = Stream(iter(range(10)), readers=2, maxsize=2)
+    first = s.reader()
+    second = s.reader()
+    second.close()
+    assert list(first) == list(range(10))
+    assert len(s._buffer) == 1
+
+
+def test_concurrent_readers_bounded():
+    """Test concurrent readers don't buffer more than maxsize items"""
+    s = Stream(iter(range(10000)), readers=2, maxsize=8)
+    readers = [s.reader(), s.reader()]
+    results = [[], []]
+    peak = [0]
+
+    def consume(i: int) -> None:
+        for item in readers[i]:
+            peak[0] = max(peak[0], len(s._buffer))
+            results[i].append(item)
+
+    threads = [threading.Thread(target=consume, args=(_,)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [list(range(10000))] * 2
+    assert peak[0] <= 8
+
+
+def test_source_error():
+    """Test errors of the source are raised to all readers"""
+
+    def source():
+        yield 1
+        raise ValueError("source failed")
+
+    s = Stream(source(), readers=2)
+    first, second = s.reader(), s.reader()
+    assert next(first) == 1
+    with pytest.raises(ValueError):
+        next(first)
+    assert next(second) == 1
+    with pytest.raises(ValueError):
+        next(second)
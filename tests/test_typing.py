@@ -79,3 +79,229 @@ def test_isinstance_list():
 @pytest.mark.typing
 def test_isinstance_tuple():
     assert typing.isinstance(TUPLE_INT_STRING_VALUE, TUPLE_INT_STRING_TYPE)
+
+
+@pytest.mark.typing
+def test_isinstance_stream():
+    t = typing.StreamType(INT_TYPE)
+    assert typing.isinstance(iter([1, "a"]), t), "items are not checked eagerly"
+    assert typing.isinstance([1], t)
+    assert not typing.isinstance(1, t)
+    assert not typing.isinstance("hello", t)
+
+
+@pytest.mark.typing
+def test_stream_check_items():
+    t = typing.StreamType(INT_TYPE)
+    items = t.check_items(iter([1, 2, "a"]))
+    assert next(items) == 1
+    assert next(items) == 2
+    with pytest.raises(Exception):
+        next(items)
+
+
+@pytest.mark.typing
+def test_isinstance_union():
+    t = typing.UnionType([INT_TYPE, STRING_TYPE])
+    assert typing.isinstance(1, t)
+    assert typing.isinstance("hello", t)
+    assert not typing.isinstance(1.0, t)
+    assert not typing.isinstance((1, "hello"), t)
+
+
+@pytest.mark.typing
+def test_isinstance_variable():
+    t = typing.VariableType(INT_TYPE)
+    assert typing.isinstance(1, t)
+    assert typing.isinstance([1, 2], t)
+    assert typing.isinstance([], t)
+    assert not typing.isinstance("hello", t)
+
+
+@pytest.mark.typing
+def test_compile():
+    t = typing.TupleType(
+        [
+            LIST_INT_TYPE,
+            typing.UnionType([STRING_TYPE, typing.VariableType(FLOAT_TYPE)]),
+        ]
+    )
+    check = typing.compile(t)
+    assert typing.compile(t) is check, "checkers are cached"
+    for value in (([1], "a"), ([1], 1.0), ([], [1.0]), ([1], 1), ("a", "a"), ([1],)):
+        assert check(value) == t._match(value)
+
+
+@pytest.mark.typing
+def test_compile_structural_cache():
+    assert typing.compile(typing.ListType(INT_TYPE)) is typing.compile(
+        typing.ListType(typing.IntType())
+    )
+    assert typing.compile(LIST_INT_TYPE) is not typing.compile(
+        typing.ListType(FLOAT_TYPE)
+    )
+
+
+@pytest.mark.typing
+def test_validation_policy(monkeypatch):
+    monkeypatch.delenv("GADA_VALIDATION", raising=False)
+    assert typing.validation_policy() == typing.SAMPLED
+    monkeypatch.setenv("GADA_VALIDATION", "full")
+    assert typing.validation_policy() == typing.FULL
+    assert typing.validation_policy("off") == typing.OFF
+    with pytest.raises(Exception):
+        typing.validation_policy("partial")
+
+
+@pytest.mark.typing
+def test_isinstance_policy():
+    t = typing.ListType(typing.ListType(FLOAT_TYPE))
+    value = [[1.0]] * 1000
+    for policy in typing.VALIDATION_POLICIES:
+        assert typing.isinstance(value, t, policy=policy)
+
+    # only a full check is guaranteed to find a bad item in the middle
+    value = [[1.0]] * 500 + [[1]] + [[1.0]] * 500
+    assert not typing.isinstance(value, t, policy="full")
+    assert typing.isinstance(value, t, policy="off")
+    assert typing.isinstance(1, INT_TYPE, policy="off")
+
+    # first and last items of long lists are always sampled
+    assert not typing.isinstance([1] + [1.0] * 1000, t, policy="sampled")
+    assert not typing.isinstance([1.0] * 1000 + ["a"], typing.ListType(FLOAT_TYPE))
+
+    # all the items of small lists are checked
+    assert not typing.isinstance([[1]], t, policy="sampled")
+    assert not typing.isinstance([[1.0], [1]], t, policy="sampled")
+    assert not typing.isinstance([[1.0], [1]], t, policy="full")
+    assert not typing.isinstance(
+        [1, "a"], typing.VariableType(INT_TYPE), policy="sampled"
+    )
+
+
+@pytest.mark.typing
+def test_isinstance_sampled_small_lists():
+    t = typing.ListType(INT_TYPE)
+    assert not typing.isinstance([1, "a"], t, policy="sampled")
+    assert not typing.isinstance([1] * 17 + ["a"], t, policy="sampled")
+    assert typing.isinstance([1] * 18, t, policy="sampled")
+
+    t = typing.ListType(typing.ListType(INT_TYPE))
+    assert not typing.isinstance([[1]] * 30 + [[1, "x"]], t, policy="sampled")
+    assert typing.isinstance([[1]] * 30 + [[1, 2]], t, policy="sampled")
+
+
+@pytest.mark.typing
+def test_isinstance_full_scalars():
+    t = typing.ListType(INT_TYPE)
+    assert typing.isinstance([1, True, 2], t, policy="full")
+    assert not typing.isinstance([1, 2.0, 3], t, policy="full")
+    assert typing.isinstance([], t, policy="full")
+    assert typing.isinstance([1, [2.0]], typing.VariableType(INT_TYPE), policy="off")
+    assert not typing.isinstance([1, "a"], typing.VariableType(INT_TYPE), policy="full")
+
+
+@pytest.mark.typing
+def test_stream_check_items_off():
+    t = typing.StreamType(INT_TYPE)
+    assert list(t.check_items(iter(["a"]), policy="off")) == ["a"]
+
+
+@pytest.mark.typing
+def test_interning():
+    assert typing.IntType() is INT_TYPE
+    assert typing.ListType(typing.IntType()) is LIST_INT_TYPE
+    assert typing.TupleType((INT_TYPE, STRING_TYPE)) is TUPLE_INT_STRING_TYPE
+    assert typing.ListType(INT_TYPE) != typing.ListType(FLOAT_TYPE)
+    assert typing.UnionType([INT_TYPE]) != typing.TupleType([INT_TYPE])
+
+
+@pytest.mark.typing
+def test_hash():
+    types = {LIST_INT_TYPE: 1, TUPLE_INT_STRING_TYPE: 2}
+    assert types[typing.ListType(typing.IntType())] == 1
+    assert types[typing.typeof((2, "a"))] == 2
+    assert hash(typing.StreamType(INT_TYPE)) == hash(typing.StreamType(INT_TYPE))
+
+
+@pytest.mark.typing
+def test_pickle():
+    import copy
+    import pickle
+
+    t = typing.UnionType([LIST_INT_TYPE, TUPLE_INT_STRING_TYPE])
+    assert pickle.loads(pickle.dumps(t)) is t
+    assert copy.deepcopy(t) is t
+
+
+@pytest.mark.typing
+def test_typeof_memoized():
+    assert typing.typeof(1) is INT_TYPE
+    assert typing.typeof((1, "a")) is typing.typeof((2, "b"))
+    assert typing.typeof([(1, "a")]) is typing.ListType(TUPLE_INT_STRING_TYPE)
+
+
+@pytest.mark.typing
+def test_isinstance_array():
+    import array
+
+    values = array.array("d", [1.0, 2.0])
+    assert typing.isinstance(values, typing.ArrayType("float64"))
+    assert typing.isinstance(memoryview(values), typing.ArrayType("float64", (2,)))
+    assert typing.isinstance(memoryview(b"ab"), typing.ArrayType("uint8"))
+    assert not typing.isinstance(values, typing.ArrayType("float32"))
+    assert not typing.isinstance(values, typing.ArrayType("float64", (3,)))
+    assert not typing.isinstance(values, typing.ArrayType("float64", (2, None)))
+    assert not typing.isinstance([1.0, 2.0], typing.ArrayType("float64"))
+    assert typing.ArrayType("float64", [None]) is typing.ArrayType("float64", (None,))
+    with pytest.raises(Exception):
+        typing.ArrayType("complex128")
+
+
+@pytest.mark.typing
+def test_isinstance_array_numpy():
+    np = pytest.importorskip("numpy")
+
+    t = typing.ArrayType("float64", (None, 3))
+    assert typing.isinstance(np.zeros((2, 3)), t)
+    assert not typing.isinstance(np.zeros((2, 4)), t)
+    assert not typing.isinstance(np.zeros((2, 3), dtype="int32"), t)
+    assert typing.typeof(np.zeros(2, dtype="int32")) is typing.ArrayType("int32")
+
+
+@pytest.mark.typing
+def test_typeof_array():
+    import array
+
+    assert typing.typeof(array.array("i", [1])) is typing.ArrayType("int32")
+    assert typing.typeof(memoryview(b"a")) is typing.ArrayType("uint8")
+
+
+@pytest.mark.typing
+def test_array_of_characters():
+    import array
+
+    values = array.array("u", "ab")
+    assert not typing.isinstance(values, typing.ArrayType("uint32"))
+    assert not typing.compile(typing.ArrayType("uint32"))(values)
+    assert typing.typeof(values) is typing.ListType(typing.StringType())
+    assert typing.converter(typing.ListType(typing.StringType()))(values) == ["a", "b"]
+
+
+@pytest.mark.typing
+def test_converter():
+    import array
+
+    values = array.array("d", [1.0, 2.0])
+    to_list = typing.converter(typing.ListType(FLOAT_TYPE))
+    assert to_list(values) == [1.0, 2.0]
+    assert to_list(memoryview(values)) == [1.0, 2.0]
+    assert to_list([1.0]) == [1.0]
+
+    to_array = typing.converter(typing.ArrayType("int64"))
+    assert to_array([1, 2]) == array.array("q", [1, 2])
+    assert to_array(["a"]) == ["a"], "left for type checks to report"
+    assert to_array(values) is values
+
+    assert typing.converter(INT_TYPE) is None
+    assert typing.converter(typing.ArrayType("bool")) is None
@@ -0,0 +1,79 @@
+"""Tests on the ``gada._yaml`` module"""
+from __future__ import annotations
+import os
+import pytest
+from gada import _yaml
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path / "cache"
+
+
+def _age(path, seconds: int) -> None:
+    """Move mtime of a file in the past so it is not racily clean."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def _no_parse(*args, **kwargs):
+    raise AssertionError("document should be loaded from cache")
+
+
+def test_dump_load():
+    """Test dumping and loading a document"""
+    assert _yaml.load(_yaml.dump({"a": [1, "b"]})) == {"a": [1, "b"]}
+
+
+def test_load_file(tmp_path, cache_dir):
+    """Test loading a file is cached"""
+    file = tmp_path / "doc.yml"
+    file.write_text("a: 1\n")
+    _age(file, 10)
+
+    assert _yaml.load_file(file, cache_dir=cache_dir) == {"a": 1}
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_load_file_cache_hit(tmp_path, cache_dir, monkeypatch):
+    """Test an unchanged file is not parsed again"""
+    file = tmp_path / "doc.yml"
+    file.write_text("a: 1\n")
+    _age(file, 10)
+    _yaml.load_file(file, cache_dir=cache_dir)
+
+    monkeypatch.setattr(_yaml, "load", _no_parse)
+    assert _yaml.load_file(file, cache_dir=cache_dir) == {"a": 1}
+
+
+def test_load_file_same_content(tmp_path, cache_dir, monkeypatch):
+    """Test a touched file with the same content is not parsed again"""
+    file = tmp_path / "doc.yml"
+    file.write_text("a: 1\n")
+    _yaml.load_file(file, cache_dir=cache_dir)
+
+    file.write_text("a: 1\n")
+    monkeypatch.setattr(_yaml, "load", _no_parse)
+    assert _yaml.load_file(file, cache_dir=cache_dir) == {"a": 1}
+
+
+def test_load_file_modified(tmp_path, cache_dir):
+    """Test a modified file is parsed again even with the same mtime and size"""
+    file = tmp_path / "doc.yml"
+    file.write_text("a: 1\n")
+    st = os.stat(file)
+    _yaml.load_file(file, cache_dir=cache_dir)
+
+    file.write_text("a: 2\n")
+    os.utime(file, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert _yaml.load_file(file, cache_dir=cache_dir) == {"a": 2}
+
+
+def test_dump_file(tmp_path, cache_dir):
+    """Test writing a file invalidates the cache"""
+    file = tmp_path / "doc.yml"
+    _yaml.dump_file(file, {"a": 1}, cache_dir=cache_dir)
+    assert _yaml.load_file(file, cache_dir=cache_dir) == {"a": 1}
+
+    _yaml.dump_file(file, {"a": 2}, cache_dir=cache_dir)
+    assert _yaml.load_file(file, cache_dir=cache_dir) == {"a": 2}